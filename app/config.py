@@ -1,4 +1,44 @@
 import os
 
 USER_DATA = os.path.join(os.path.dirname(__file__), ".." ,"database", "users.json")
-PORT = 8000
\ No newline at end of file
+PORT = 8000
+
+# 유저 API (/api/user): true면 비동기 엔진(aiomysql)으로, false면 동기 세션을 스레드풀에서 사용
+USER_DB_ASYNC = os.getenv("USER_DB_ASYNC", "true").lower() == "true"
+# 이메일 → 유저 조회 캐시 (쓰기 시 무효화). REDIS_URL을 설정하면 워커들이 Redis 캐시를 공유
+# 워커별 LRU는 무효화가 그 워커에만 전달되므로, 워커가 여러 개면 다른 워커에서 한 비밀번호 변경/삭제가
+# 최대 USER_CACHE_TTL_SEC 동안 반영되지 않음 (이전 비밀번호로 로그인 가능). 그래서 기본은 사용 안 함이고,
+# WEB_CONCURRENCY(uvicorn 워커 수)가 1보다 크면 USER_CACHE_SIZE를 설정해도 Redis 없이는 켜지 않음
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "0"))  # 워커별 LRU 최대 유저 수 (0이면 사용 안 함)
+USER_CACHE_TTL_SEC = int(os.getenv("USER_CACHE_TTL_SEC", "60"))  # 캐시 항목 최대 수명 = 다른 워커의 쓰기가 보이기까지 최대 지연
+USER_CACHE_REDIS_URL = os.getenv("USER_CACHE_REDIS_URL") or None  # 예: redis://localhost:6379/0
+USER_CACHE_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+# 대량 가입(POST /api/user/bulk): 배치마다 여러 행 INSERT 한 번 + 트랜잭션 하나
+USER_BULK_BATCH_SIZE = int(os.getenv("USER_BULK_BATCH_SIZE", "500"))
+USER_BULK_MAX_ROWS = int(os.getenv("USER_BULK_MAX_ROWS", "10000"))  # 요청 하나에 받을 최대 행 수 (본문 전체를 메모리에 읽음)
+# 유저 내보내기(GET /api/user/export): 서버 커서에서 한 번에 가져와 응답으로 보내는 행 수
+USER_EXPORT_BATCH_SIZE = int(os.getenv("USER_EXPORT_BATCH_SIZE", "1000"))
+# 내부 모니터링 API (/internal): X-Internal-Token 헤더가 같아야 응답 (설정하지 않으면 항상 403)
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN") or None
+
+# 리뷰 전처리 (POST /review/preprocess/{site_name})
+PROCESSED_DIR = os.getenv("REVIEW_PROCESSED_DIR", "data/processed")
+REVIEW_BATCH_SIZE = int(os.getenv("REVIEW_BATCH_SIZE", "5000"))  # 한 번에 처리할 문서 수
+REVIEW_MIN_BATCH_SIZE = 100  # 메모리 예산 초과 시 줄일 수 있는 최소 배치
+REVIEW_MEMORY_BUDGET_MB = int(os.getenv("REVIEW_MEMORY_BUDGET_MB", "0")) or None  # 0이면 제한 없음
+REVIEW_JOB_WORKERS = int(os.getenv("REVIEW_JOB_WORKERS", "2"))  # 전처리 프로세스 풀 크기
+REVIEW_JOB_HISTORY = 100  # 보관할 완료 작업 수
+REVIEW_WRITE_BATCH_SIZE = int(os.getenv("REVIEW_WRITE_BATCH_SIZE", "1000"))  # bulk_write 한 번에 보낼 문서 수
+REVIEW_WRITE_CONCERN = os.getenv("REVIEW_WRITE_CONCERN", "1")  # "0", "1", "majority" 등
+REVIEW_WRITE_JOURNAL = os.getenv("REVIEW_WRITE_JOURNAL", "false").lower() == "true"
+REVIEW_STAGE_CACHE_DIR = os.getenv("REVIEW_STAGE_CACHE_DIR") or None  # 전처리 단계별 결과 캐시 (비우면 사용 안 함)
+REVIEW_STATS_DIR = os.getenv("REVIEW_STATS_DIR", os.path.join(PROCESSED_DIR, "stats"))  # 실행별 단계 통계 (jsonl)
+REVIEW_TRACE_MEMORY = os.getenv("REVIEW_TRACE_MEMORY", "false").lower() == "true"  # 단계별 tracemalloc 측정 (느려짐)
+# 원본 컬렉션이 바뀌지 않았으면 이전 결과를 그대로 반환 (비우면 사용 안 함)
+REVIEW_RESULT_CACHE_DIR = os.getenv("REVIEW_RESULT_CACHE_DIR", os.path.join(PROCESSED_DIR, "result_cache")) or None
+REVIEW_RESULT_CACHE_TTL_SEC = int(os.getenv("REVIEW_RESULT_CACHE_TTL_SEC", "86400"))  # 0이면 만료 없음
+# EDA 리포트 (/static/reports/{site}/ 아래에 그림과 manifest.json 저장)
+REVIEW_REPORTS_DIR = os.getenv("REVIEW_REPORTS_DIR", os.path.join(os.path.dirname(__file__), "static", "reports"))
+REVIEW_REPORTS_URL = "/static/reports"
+REVIEW_EDA_WORKERS = int(os.getenv("REVIEW_EDA_WORKERS", "0")) or None  # 0이면 CPU 수 기준
+REVIEW_EDA_DPI = int(os.getenv("REVIEW_EDA_DPI", "100"))
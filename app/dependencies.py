@@ -1,8 +1,16 @@
-from fastapi import Depends
+import secrets
+from typing import Any, Dict, Optional
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database.mysql_connection import SessionLocal
-from app.user.user_repository import UserRepository
-from app.user.user_service import UserService
+from database.mysql_connection import AsyncSessionLocal, SessionLocal, get_pool_status
+from app.user.user_cache import AsyncCachedUserRepository, CachedUserRepository, UserCache, user_cache
+from app.user.user_repository import AsyncUserRepository, UserRepository
+from app.user.user_service import AnyUserService, AsyncUserService, UserService
+from app.config import INTERNAL_API_TOKEN, REVIEW_STATS_DIR, USER_DB_ASYNC
+from app.review.review_jobs import PreprocessJobManager, job_manager
+from app.review.review_report import EdaReportService, eda_report_service
+from review_analysis.preprocessing.profiling import RunStatsStore
 
 # 1. DB 세션을 생성하고 안전하게 닫아주는 함수를 정의합니다. 
 def get_db():
@@ -13,10 +21,72 @@ def get_db():
         db.close() # 작업이 끝나면 DB 연결을 자동으로 닫습니다.
 
 # 2. UserRepository를 생성할 때 DB 세션을 주입하도록 수정합니다.
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
-    return UserRepository(db)
+#    유저 캐시를 켜면(USER_CACHE_SIZE / USER_CACHE_REDIS_URL) 캐시 Repository로 감쌉니다.
+def get_user_cache() -> Optional[UserCache]:
+    return user_cache
+
+
+def get_user_repository(db: Session = Depends(get_db),
+                        cache: Optional[UserCache] = Depends(get_user_cache)) -> UserRepository:
+    repo = UserRepository(db)
+    return CachedUserRepository(repo, cache) if cache else repo
 
 
 # 3. UserService는 그대로 Repository를 주입받아 사용합니다.
-def get_user_service(repo: UserRepository = Depends(get_user_repository)) -> UserService:
+def get_sync_user_service(repo: UserRepository = Depends(get_user_repository)) -> UserService:
     return UserService(repo)
+
+
+# 3-1. 비동기 세션/Repository/Service (요청이 끝나면 세션을 닫습니다.)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_user_repository(db: AsyncSession = Depends(get_async_db),
+                              cache: Optional[UserCache] = Depends(get_user_cache)) -> AsyncUserRepository:
+    repo = AsyncUserRepository(db)
+    return AsyncCachedUserRepository(repo, cache) if cache else repo
+
+
+def get_async_user_service(repo: AsyncUserRepository = Depends(get_async_user_repository)) -> AsyncUserService:
+    return AsyncUserService(repo)
+
+
+# 3-2. 라우터가 쓰는 UserService: USER_DB_ASYNC 설정에 따라 비동기/동기 구현 중 하나를 사용합니다.
+get_user_service = get_async_user_service if USER_DB_ASYNC else get_sync_user_service
+
+
+# 4. 리뷰 전처리 작업 큐는 프로세스 전체에서 하나를 공유합니다.
+def get_preprocess_job_manager() -> PreprocessJobManager:
+    return job_manager
+
+
+# 5. 전처리 실행별 단계 통계 저장소
+def get_preprocess_stats_store() -> RunStatsStore:
+    return RunStatsStore(REVIEW_STATS_DIR)
+
+
+# 6. EDA 리포트 (그림 프로세스 풀을 공유하도록 프로세스 전체에서 하나)
+def get_eda_report_service() -> EdaReportService:
+    return eda_report_service
+
+
+# 7. MySQL 커넥션 풀 상태 (내부 모니터링용)
+def get_db_pool_status() -> Dict[str, Dict[str, Any]]:
+    return get_pool_status()
+
+
+# 8. 내부 API 접근 확인 (INTERNAL_API_TOKEN을 설정하지 않으면 모든 요청을 거부합니다.)
+def verify_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    if not INTERNAL_API_TOKEN or not secrets.compare_digest(x_internal_token or "", INTERNAL_API_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden.")
+
+
+# 9. 유저 내보내기(스트리밍)용 UserService
+#    응답 본문은 요청 의존성이 정리된 뒤에 전송되므로 get_db 세션 대신 새 세션을 열고,
+#    export_users 스트림이 끝날 때 닫습니다. (캐시는 쓰지 않습니다.)
+def get_user_export_service() -> AnyUserService:
+    if USER_DB_ASYNC:
+        return AsyncUserService(AsyncUserRepository(AsyncSessionLocal()))
+    return UserService(UserRepository(SessionLocal()))
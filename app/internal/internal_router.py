@@ -0,0 +1,31 @@
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends
+from app.dependencies import get_db_pool_status, get_user_cache, verify_internal_token
+from app.internal.internal_schema import PoolStats, UserCacheStats
+from app.user.user_cache import UserCache
+from app.responses.base_response import BaseResponse
+
+# 운영 모니터링용 (API 문서에 노출하지 않음, INTERNAL_API_TOKEN과 같은 X-Internal-Token 헤더 필요)
+router = APIRouter(prefix="/internal", include_in_schema=False, dependencies=[Depends(verify_internal_token)])
+
+
+@router.get("/db/pool", response_model=BaseResponse[Dict[str, PoolStats]])
+def get_db_pool(status: Dict[str, Dict[str, Any]] = Depends(get_db_pool_status)) -> BaseResponse[Dict[str, PoolStats]]:
+    """
+    MySQL connection pool status for the sync and async engines.
+    1) Pool settings and current checked-out / idle / overflow connections
+    2) Checkout wait time (avg, p50, p95, max in ms), timeouts and overflow events since startup
+    """
+    return BaseResponse(status="success", data=status)
+
+
+@router.get("/cache/users", response_model=BaseResponse[UserCacheStats])
+def get_user_cache_stats(cache: Optional[UserCache] = Depends(get_user_cache)) -> BaseResponse[UserCacheStats]:
+    """
+    User lookup cache counters for this worker.
+    1) If the cache is disabled (the default: USER_CACHE_SIZE=0 and no USER_CACHE_REDIS_URL), return no data
+    2) Otherwise return hits, misses, hit rate, invalidations and size
+    """
+    if cache is None:
+        return BaseResponse(status="success", data=None, message="User cache disabled.")
+    return BaseResponse(status="success", data=cache.stats())
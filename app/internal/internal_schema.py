@@ -0,0 +1,40 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class PoolWait(BaseModel):
+    avg: float
+    p50: float = Field(..., description="최근 checkout 대기 시간 중앙값 (ms)")
+    p95: float
+    max: float = Field(..., description="프로세스 시작 이후 최대 대기 시간 (ms)")
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    size: int
+    checkedout: int = Field(..., description="현재 사용 중인 연결 수")
+    checkedin: int = Field(..., description="풀에서 대기 중인 유휴 연결 수")
+    overflow: int = Field(..., description="pool_size를 넘어 만든 연결 수 (음수면 아직 만들지 않은 연결 수)")
+    checkouts: int
+    timeouts: int = Field(..., description="pool_timeout 안에 연결을 받지 못한 횟수")
+    overflow_events: int = Field(..., description="overflow 연결을 새로 만든 횟수")
+    connections_created: int
+    wait_ms: PoolWait
+
+
+class UserCacheStats(BaseModel):
+    backend: str = Field(..., description="local (워커별 LRU) / redis (워커 공유)")
+    ttl_sec: float
+    size: Optional[int] = Field(None, description="현재 캐시된 유저 수 (local만)")
+    maxsize: Optional[int] = None
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int = Field(..., description="쓰기(가입/수정/삭제)로 무효화한 횟수")
+    evictions: Optional[int] = Field(None, description="LRU 크기 제한으로 밀려난 수 (local만)")
+    errors: int = Field(..., description="Redis 오류로 DB에서 바로 읽은 횟수")
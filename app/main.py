@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 import uvicorn
@@ -5,14 +6,30 @@ import os
 
 from app.review.review_router import router as review_router  # MongoDB 기반 전처리 로직
 from app.user.user_router import user  # MySQL 기반 유저 CRUD 로직
+from app.internal.internal_router import router as internal_router  # 커넥션 풀 등 내부 모니터링
+from app.review.review_jobs import job_manager
+from app.review.review_report import eda_report_service
 from app.config import PORT
+from app.middleware import QueryCountMiddleware
+from database.mysql_connection import async_engine
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    job_manager.shutdown()  # 종료 시 전처리 프로세스 풀 정리
+    eda_report_service.shutdown()  # EDA 그림 프로세스 풀 정리
+    await async_engine.dispose()  # 비동기 MySQL 연결 풀 정리
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(QueryCountMiddleware)  # 요청별 SQL 문 수 (X-DB-Query-Count)
 static_path = os.path.join(os.path.dirname(__file__), "static")
 app.mount("/static", StaticFiles(directory=static_path), name="static")
 
 app.include_router(review_router)  # 전처리 자동화 API
 app.include_router(user)  # 유저 관리 API
+app.include_router(internal_router)  # 내부 모니터링 API
 
 if __name__=="__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=PORT, reload=True)
@@ -0,0 +1,31 @@
+from typing import Any, Callable, Dict
+
+from database.query_counter import count_queries
+
+Scope = Dict[str, Any]
+QUERY_COUNT_HEADER = b"x-db-query-count"
+
+
+class QueryCountMiddleware:
+    """
+    요청마다 실행한 SQL 문 수를 세어 X-DB-Query-Count 응답 헤더로 반환
+    (응답 헤더를 보내기 전까지 실행한 문장만 셈, 스트리밍 응답의 본문 중 쿼리는 포함하지 않음)
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as queries:
+            async def send_with_count(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((QUERY_COUNT_HEADER, str(queries.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
@@ -0,0 +1,50 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.config import REVIEW_RESULT_CACHE_TTL_SEC
+
+
+class PreprocessResultCache:
+    """
+    사이트별 마지막 전처리 요약을 {cache_dir}/{site}.json 에 저장
+    - 출력 디렉터리는 사이트마다 하나라서 유효한 결과도 사이트마다 마지막 실행 하나뿐
+      → 새 실행이 시작되면 이전 항목을 지우고, 끝나면 새 항목으로 교체
+    - ttl_sec이 지난 항목은 fingerprint가 같아도 만료 (문서 수/_id로 못 잡는 수정 대비)
+    """
+
+    def __init__(self, cache_dir: str, ttl_sec: int = REVIEW_RESULT_CACHE_TTL_SEC):
+        self.cache_dir = cache_dir
+        self.ttl_sec = ttl_sec
+
+    def _path(self, site_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{site_name}.json")
+
+    def get(self, site_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """key가 같고 만료되지 않은 요약 (없으면 None)"""
+        try:
+            with open(self._path(site_name), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        if self.ttl_sec and time.time() - entry["stored_at"] > self.ttl_sec:
+            self.invalidate(site_name)
+            return None
+        return entry["result"]
+
+    def put(self, site_name: str, key: str, result: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 쓰는 도중 중단돼도 깨진 항목이 남지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = self._path(site_name) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "stored_at": time.time(), "result": result}, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self._path(site_name))
+
+    def invalidate(self, site_name: str) -> None:
+        try:
+            os.remove(self._path(site_name))
+        except FileNotFoundError:
+            pass
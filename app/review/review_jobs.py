@@ -0,0 +1,159 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import REVIEW_JOB_HISTORY, REVIEW_JOB_WORKERS
+from app.review.review_schema import PreprocessJob
+
+
+def run_preprocess_job(site_name: str, **options) -> Dict:
+    """
+    프로세스 풀에서 실행되는 전처리 작업.
+    MongoClient는 fork 안전하지 않으므로 자식 프로세스에서 직접 연결합니다.
+    """
+    from database.mongodb_connection import mongo_db
+    from app.review.review_repository import ReviewRepository
+    from app.review.review_service import ReviewService
+
+    started_at = time.time()
+    result = ReviewService(ReviewRepository(mongo_db)).preprocess(site_name, **options)
+    result["started_at"] = started_at
+    result["finished_at"] = time.time()
+    return result
+
+
+class PreprocessJobConflict(RuntimeError):
+    """같은 사이트에 다른 옵션의 작업이 진행 중일 때 발생"""
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class PreprocessJobManager:
+    """
+    전처리 작업 큐.
+    - 작업은 프로세스 풀에서 실행되어 API 이벤트 루프를 막지 않음
+    - 같은 사이트의 작업이 같은 옵션으로 진행 중이면 새 작업 대신 기존 작업에 연결,
+      옵션이 다르면 PreprocessJobConflict (요청한 옵션을 무시하는 작업에 연결하지 않음)
+    - 작업 상태는 이 프로세스 메모리에만 있으므로 API 워커(프로세스)마다 따로 관리됨:
+      여러 워커로 띄우면 다른 워커의 작업은 조회되지 않고 같은 사이트 작업이 워커마다 실행될 수 있음
+    """
+
+    def __init__(self, executor: Optional[Executor] = None,
+                 runner: Callable[..., Dict] = run_preprocess_job,
+                 max_workers: int = REVIEW_JOB_WORKERS,
+                 history: int = REVIEW_JOB_HISTORY) -> None:
+        self._executor = executor
+        self._runner = runner
+        self._max_workers = max_workers
+        self._history = history
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, PreprocessJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._active_by_site: Dict[str, str] = {}
+        self._options: Dict[str, Dict] = {}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, site_name: str, **options) -> Tuple[PreprocessJob, bool]:
+        """작업을 등록하고 (작업, 기존 작업 연결 여부)를 반환"""
+        site = site_name.lower()
+        with self._lock:
+            active_id = self._active_by_site.get(site)
+            if active_id is not None:
+                if self._options.get(active_id) != options:
+                    raise PreprocessJobConflict(
+                        f"A preprocessing job with different options is already running ({active_id})."
+                    )
+                return self._snapshot(active_id), True
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = PreprocessJob(
+                job_id=job_id, site_name=site, submitted_at=datetime.now(timezone.utc)
+            )
+            self._active_by_site[site] = job_id
+            self._options[job_id] = options
+            self._evict_finished()
+
+            try:
+                future = self._get_executor().submit(self._runner, site_name, **options)
+            except Exception:
+                del self._jobs[job_id], self._active_by_site[site], self._options[job_id]
+                raise
+            self._futures[job_id] = future
+            job = self._snapshot(job_id)
+
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job, False
+
+    def get(self, job_id: str) -> Optional[PreprocessJob]:
+        with self._lock:
+            if job_id not in self._jobs:
+                return None
+            return self._snapshot(job_id)
+
+    def list(self) -> List[PreprocessJob]:
+        with self._lock:
+            return [self._snapshot(job_id) for job_id in self._jobs]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            self._futures.pop(job_id, None)
+            self._options.pop(job_id, None)
+            if self._active_by_site.get(job.site_name) == job_id:
+                del self._active_by_site[job.site_name]
+
+            error = future.exception() if not future.cancelled() else RuntimeError("cancelled")
+            if error is not None:
+                job.state = "failed"
+                job.error = str(error)
+                job.finished_at = datetime.now(timezone.utc)
+                return
+
+            result = future.result()
+            started_at = result.pop("started_at", None)
+            finished_at = result.pop("finished_at", None)
+            job.state = "succeeded"
+            job.result = result
+            job.rows_in = result.get("rows_in")
+            job.rows_out = result.get("count")
+            if started_at is not None and finished_at is not None:
+                job.started_at = _utc(started_at)
+                job.finished_at = _utc(finished_at)
+                job.duration_sec = round(finished_at - started_at, 3)
+            else:
+                job.finished_at = datetime.now(timezone.utc)
+
+    def _snapshot(self, job_id: str) -> PreprocessJob:
+        job = self._jobs[job_id].model_copy()
+        future = self._futures.get(job_id)
+        if future is not None and future.running():
+            job.state = "running"
+        return job
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id in self._jobs if job_id not in self._futures
+                    and job_id not in self._active_by_site.values()]
+        for job_id in finished[:max(0, len(finished) - self._history)]:
+            del self._jobs[job_id]
+
+
+job_manager = PreprocessJobManager()
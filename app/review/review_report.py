@@ -0,0 +1,95 @@
+import os
+import threading
+from concurrent.futures import Executor
+from typing import Any, Dict, Optional
+
+from app.config import PROCESSED_DIR, REVIEW_EDA_DPI, REVIEW_EDA_WORKERS, REVIEW_REPORTS_DIR, REVIEW_REPORTS_URL
+from review_analysis.preprocessing.registry import has_processor
+
+# 그림에 필요한 컬럼만 읽음 (사이트마다 있는 컬럼이 다름)
+EDA_COLUMNS = ("date", "rating", "rating_numeric", "content_length", "sentence_count")
+
+
+class EdaReportService:
+    """
+    전처리 결과로 EDA 그림을 그려 /static 아래에 저장
+    - 데이터가 바뀌지 않은 그림은 다시 그리지 않음 (eda_report.build_report)
+    - 그림 프로세스 풀은 첫 요청 때 만들어 이후 요청에서 재사용 (프로세스 시작/matplotlib import 비용 한 번)
+    """
+
+    def __init__(self, output_dir: str = PROCESSED_DIR, reports_dir: str = REVIEW_REPORTS_DIR,
+                 workers: Optional[int] = REVIEW_EDA_WORKERS, dpi: int = REVIEW_EDA_DPI) -> None:
+        self.output_dir = output_dir
+        self.reports_dir = reports_dir
+        self.workers = workers
+        self.dpi = dpi
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[Executor]:
+        # pandas/matplotlib 관련 모듈은 앱 시작이 아니라 첫 EDA 요청 때 import
+        from review_analysis.preprocessing.eda_report import DEFAULT_WORKERS, make_render_pool
+
+        workers = self.workers or DEFAULT_WORKERS
+        if workers <= 1:
+            return None
+        if self._executor is None:
+            self._executor = make_render_pool(workers)
+        return self._executor
+
+    def _with_urls(self, site: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        figures = [
+            {"name": name, **figure,
+             # 그림이 바뀌면 URL도 바뀌어 브라우저 캐시를 우회
+             "url": f"{REVIEW_REPORTS_URL}/{site}/{figure['file']}?v={figure['fingerprint'][:12]}"}
+            for name, figure in manifest["figures"].items()
+        ]
+        return {**manifest, "figures": figures}
+
+    def generate(self, site_name: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Renders the EDA figures of a site from its latest preprocessing output.
+        1) If the site has no processor, raise error
+        2) If the site has not been preprocessed yet, raise FileNotFoundError
+        3) Figures whose aggregated data did not change are reused unless force is set
+        """
+        from review_analysis.preprocessing.corpus import find_site_output
+        from review_analysis.preprocessing.eda_report import build_report
+        from review_analysis.preprocessing.features import add_text_features
+        from review_analysis.preprocessing.output_format import read_columns, read_frame
+
+        site = site_name.lower()
+        if not has_processor(site):
+            raise ValueError("Invalid site name")
+        path = find_site_output(self.output_dir, site)
+        if path is None:
+            raise FileNotFoundError(f"No preprocessed output for {site}")
+
+        available = read_columns(path)
+        columns = [column for column in available if column in EDA_COLUMNS]
+        # 텍스트 특징이 없는 예전 결과는 본문으로 다시 계산
+        missing_features = not {"content_length", "sentence_count"} <= set(columns)
+        frame = read_frame(path, columns + ["content"] if missing_features else columns)
+        if missing_features:
+            frame = add_text_features(frame)
+        with self._lock:
+            manifest = build_report(frame, site, os.path.join(self.reports_dir, site),
+                                    dpi=self.dpi, force=force, executor=self._get_executor())
+        return self._with_urls(site, manifest)
+
+    def get(self, site_name: str) -> Optional[Dict[str, Any]]:
+        """저장된 리포트 (다시 그리지 않음, 없으면 None)"""
+        from review_analysis.preprocessing.eda_report import load_manifest
+
+        site = site_name.lower()
+        if not has_processor(site):
+            raise ValueError("Invalid site name")
+        manifest = load_manifest(os.path.join(self.reports_dir, site))
+        return self._with_urls(site, manifest) if manifest else None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+eda_report_service = EdaReportService()
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from pymongo import ReplaceOne
+from pymongo.write_concern import WriteConcern
+
+# 전처리에 필요한 필드만 가져오도록 projection 지정 (_id는 original_id로 보존)
+REVIEW_PROJECTION = {"_id": 1, "date": 1, "rating": 1, "content": 1}
+
+# 전처리 결과를 저장하는 컬렉션 이름 ({site}_processed)
+PROCESSED_COLLECTION = "{site}_processed"
+
+# 사이트별로 마지막으로 처리한 _id를 저장하는 컬렉션
+WATERMARK_COLLECTION = "preprocess_watermarks"
+
+
+class ReviewRepository:
+    # 1. 초기화 시 MongoDB 데이터베이스를 외부에서 주입받음.
+    def __init__(self, db) -> None:
+        self.db = db
+
+    # 2. 원본 리뷰를 커서로 스트리밍 (컬렉션 전체를 메모리에 올리지 않음)
+    #    _id 오름차순으로 읽어 배치마다 워터마크를 올릴 수 있게 함
+    def iter_reviews(self, site_name: str, batch_size: int, after_id: Any = None) -> Iterator[Dict[str, Any]]:
+        query = {"_id": {"$gt": after_id}} if after_id is not None else {}
+        return self.db[site_name].find(query, REVIEW_PROJECTION, batch_size=batch_size, sort=[("_id", 1)])
+
+    # 3. 워터마크 조회 (없으면 None → 전체 처리)
+    def get_watermark(self, site_name: str) -> Optional[Any]:
+        doc = self.db[WATERMARK_COLLECTION].find_one({"_id": site_name})
+        return doc["last_id"] if doc else None
+
+    # 4. 워터마크 저장
+    def set_watermark(self, site_name: str, last_id: Any) -> None:
+        self.db[WATERMARK_COLLECTION].update_one(
+            {"_id": site_name},
+            {"$set": {"last_id": last_id, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+
+    # 5. 전처리 결과 bulk upsert (original_id 기준, unordered)
+    def upsert_processed(self, site_name: str, docs: List[Dict[str, Any]],
+                         write_concern: WriteConcern) -> Dict[str, int]:
+        collection = self.db[PROCESSED_COLLECTION.format(site=site_name)].with_options(write_concern=write_concern)
+        requests = [ReplaceOne({"original_id": doc["original_id"]}, doc, upsert=True) for doc in docs]
+        result = collection.bulk_write(requests, ordered=False)
+        if not result.acknowledged:  # w=0 이면 결과를 알 수 없음
+            return {"upserted": 0, "modified": 0}
+        return {"upserted": result.upserted_count, "modified": result.modified_count}
+
+    # 6. original_id 유니크 인덱스 보장 (upsert 조회 성능)
+    def ensure_processed_index(self, site_name: str) -> None:
+        self.db[PROCESSED_COLLECTION.format(site=site_name)].create_index("original_id", unique=True)
+
+    # 7. 전체 재처리 후 이번 실행(run_id)에서 쓰지 않은 전처리 문서 삭제
+    def delete_stale_processed(self, site_name: str, run_id: str, write_concern: WriteConcern) -> int:
+        collection = self.db[PROCESSED_COLLECTION.format(site=site_name)].with_options(write_concern=write_concern)
+        result = collection.delete_many({"run_id": {"$ne": run_id}})
+        return result.deleted_count if result.acknowledged else 0
+
+    # 8. 원본 컬렉션 fingerprint (문서 수 + 최대 _id): 문서를 읽지 않고 변경 여부만 확인
+    #    estimated_document_count는 컬렉션 메타데이터, 최대 _id는 _id 인덱스 한 번 조회
+    def collection_fingerprint(self, site_name: str) -> Dict[str, Any]:
+        collection = self.db[site_name]
+        last = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        return {"count": collection.estimated_document_count(), "max_id": str(last["_id"]) if last else None}
@@ -1,79 +1,112 @@
-from fastapi import APIRouter, HTTPException
-from database.mongodb_connection import mongo_db # 이전에 만든 연결 파일
-from review_analysis.preprocessing.imdb_processor import ImdbDataProcessor
-from review_analysis.preprocessing.letterboxd_processor import LetterboxdProcessor
-from review_analysis.preprocessing.rotten_processor import RottenProcessor
+from typing import List, Optional
 
-import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.config import REVIEW_BATCH_SIZE, REVIEW_MEMORY_BUDGET_MB, REVIEW_WRITE_BATCH_SIZE, REVIEW_WRITE_CONCERN
+from app.dependencies import get_eda_report_service, get_preprocess_job_manager, get_preprocess_stats_store
+from app.responses.base_response import BaseResponse
+from app.review.review_jobs import PreprocessJobConflict, PreprocessJobManager
+from app.review.review_report import EdaReportService
+from app.review.review_schema import EdaReport, PreprocessJob, PreprocessRunStats
+from review_analysis.preprocessing.formats import DEFAULT_OUTPUT_FORMAT
+from review_analysis.preprocessing.profiling import RunStatsStore
+from review_analysis.preprocessing.registry import has_processor
 
 router = APIRouter()
 
-PROCESSORS = {
-    "imdb": ImdbDataProcessor,
-    "letterboxd": LetterboxdProcessor,
-    "rotten": RottenProcessor
-}
 
 # 명세서 요구사항: POST /review/preprocess/{site_name}
-@router.post("/review/preprocess/{site_name}")
-async def preprocess_reviews(site_name: str):
-    # processor 선택
-    processor_class = PROCESSORS.get(site_name.lower())
-    if not processor_class:
+# 전처리는 프로세스 풀에서 실행되고, 요청은 작업 id를 바로 돌려받습니다.
+# 같은 사이트에 옵션이 다른 작업이 진행 중이면 409 (작업 상태는 API 워커 프로세스마다 따로 관리)
+@router.post("/review/preprocess/{site_name}", response_model=BaseResponse[PreprocessJob],
+             status_code=status.HTTP_202_ACCEPTED)
+def preprocess_reviews(
+    site_name: str,
+    batch_size: int = Query(REVIEW_BATCH_SIZE, gt=0, description="한 번에 처리할 리뷰 수"),
+    memory_budget_mb: Optional[int] = Query(REVIEW_MEMORY_BUDGET_MB, gt=0, description="최대 RSS(MB)"),
+    incremental: bool = Query(False, description="마지막 실행 이후 새로 들어온 리뷰만 처리"),
+    write_batch_size: int = Query(REVIEW_WRITE_BATCH_SIZE, gt=0, description="bulk_write 한 번에 보낼 문서 수"),
+    write_concern: str = Query(REVIEW_WRITE_CONCERN, pattern=r"^(\d+|majority)$", description="MongoDB write concern (w)"),
+    refit_tfidf: bool = Query(False, description="저장된 TF-IDF 벡터라이저를 무시하고 다시 학습"),
+    output_format: str = Query(DEFAULT_OUTPUT_FORMAT, pattern="^(parquet|arrow|csv)$", description="결과 저장 형식"),
+    force: bool = Query(False, description="원본이 바뀌지 않았어도 캐시된 결과 대신 다시 전처리"),
+    jobs: PreprocessJobManager = Depends(get_preprocess_job_manager),
+) -> BaseResponse[PreprocessJob]:
+    if not has_processor(site_name):
         raise HTTPException(status_code=400, detail="Invalid site name")
 
-    # 1. 몽고DB에서 원본 데이터 컬렉션 선택
-    raw_data = list(mongo_db[site_name].find())
-    df_from_mongo = pd.DataFrame(raw_data)
-    processor = processor_class.__new__(processor_class)
-    
-    processor.input_path = f"database/reviews_{site_name}.csv"
-    processor.output_dir = "data/processed"
-    
-    # 2.'데이터프레임'으로 변환
-    processor.df = df_from_mongo
-    if site_name.lower() == "letterboxd":
-        processor.stopwords = []
+    try:
+        job, attached = jobs.submit(site_name, batch_size=batch_size, memory_budget_mb=memory_budget_mb,
+                                    incremental=incremental, write_batch_size=write_batch_size,
+                                    write_concern=write_concern, refit_tfidf=refit_tfidf,
+                                    output_format=output_format, force=force)
+    except PreprocessJobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    message = "이미 실행 중인 전처리 작업에 연결" if attached else "전처리 작업 등록 완료"
+    return BaseResponse(status="success", data=job, message=message)
 
-    # 3. 기존의 preprocess 함수 실행
-    if site_name.lower() == "letterboxd":
-        processor.df_processed = processor.df 
-        processor.stopwords = [] # stopwords 에러 방지
 
-    processor.preprocess() 
-    # 4. FE 실행
-    try:
-        processor.feature_engineering()
-        print(f"--- {site_name} Feature Engineering 완료 ---")
-    except Exception as e:
-        # 만약 FE 함수가 없는 프로세서가 있다면 무시하고 넘어갑니다.
-        print(f"--- {site_name} FE 건너뜀 또는 에러: {e} ---")
-    
-    # 5. 로컬 저장
+@router.get("/review/preprocess/jobs", response_model=BaseResponse[List[PreprocessJob]])
+def list_preprocess_jobs(jobs: PreprocessJobManager = Depends(get_preprocess_job_manager)) -> BaseResponse[List[PreprocessJob]]:
+    return BaseResponse(status="success", data=jobs.list())
+
+
+@router.get("/review/preprocess/jobs/{job_id}", response_model=BaseResponse[PreprocessJob])
+def get_preprocess_job(job_id: str, jobs: PreprocessJobManager = Depends(get_preprocess_job_manager)) -> BaseResponse[PreprocessJob]:
+    """
+    Returns the state, row counts and timings of a preprocessing job.
+    Raises a 404 error if the job id is unknown.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not Found.")
+    return BaseResponse(status="success", data=job)
+
+
+@router.get("/review/preprocess/stats/{site_name}", response_model=BaseResponse[List[PreprocessRunStats]])
+def get_preprocess_stats(
+    site_name: str,
+    limit: int = Query(20, gt=0, le=500, description="최근 실행부터 반환할 개수"),
+    stats: RunStatsStore = Depends(get_preprocess_stats_store),
+) -> BaseResponse[List[PreprocessRunStats]]:
+    """
+    Returns per-stage wall/CPU time, row counts and memory peaks of recent preprocessing runs, newest first.
+    Raises a 400 error if the site has no processor.
+    """
+    site = site_name.lower()
+    if not has_processor(site):
+        raise HTTPException(status_code=400, detail="Invalid site name")
+    return BaseResponse(status="success", data=stats.load(site, limit))
+
+
+@router.post("/review/eda/{site_name}", response_model=BaseResponse[EdaReport])
+def generate_eda_report(
+    site_name: str,
+    force: bool = Query(False, description="데이터가 같아도 모든 그림을 다시 그림"),
+    reports: EdaReportService = Depends(get_eda_report_service),
+) -> BaseResponse[EdaReport]:
+    """
+    Renders the EDA figures of a site under /static/reports/{site_name}/ from its latest preprocessing output.
+    Figures whose data did not change are reused. Raises a 400 error for an unknown site
+    and a 404 error if the site has not been preprocessed yet.
+    """
+    if not has_processor(site_name):
+        raise HTTPException(status_code=400, detail="Invalid site name")
     try:
-        processor.save_to_database()
-        print(f"--- {site_name} 로컬 파일 저장 성공 ---")
-    except Exception as e:
-        print(f"--- {site_name} 로컬 저장 실패: {e} ---")
-    
-    # 6. 전처리가 완료된 데이터를 딕셔너리 형태로 변환
-    if site_name.lower() == "letterboxd":
-        # Letterboxd는 FE 결과가 담긴 df_processed를 사용
-        final_df = processor.df_processed
-    elif site_name.lower() == "imdb":
-        # IMDb는 sentence_count를 self.df에 직접 추가
-        final_df = processor.df
-    else:
-        # Rotten은 self.df를 갱신
-        final_df = processor.df
+        report = reports.generate(site_name, force=force)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Preprocessed data not found.")
+    return BaseResponse(status="success", data=report, message=f"{report['rendered']}개 그림 새로 그림")
 
-    # 몽고DB 저장 시 _id 충돌 방지를 위해 변환
-    processed_docs = final_df.to_dict("records")
-    for doc in processed_docs:
-        if '_id' in doc:
-            doc['original_id'] = str(doc.pop('_id'))
-    
-    # [확인용]
-    print(f"--- {site_name} 최종 저장 컬럼: {final_df.columns.tolist()} ---")
 
-    return {"status": "success", "message": "기존 로직으로 자동 전처리 완료", "count": len(processed_docs)}
\ No newline at end of file
+@router.get("/review/eda/{site_name}", response_model=BaseResponse[EdaReport])
+def get_eda_report(site_name: str, reports: EdaReportService = Depends(get_eda_report_service)) -> BaseResponse[EdaReport]:
+    """
+    Returns the last generated EDA report of a site without rendering anything.
+    Raises a 400 error for an unknown site and a 404 error if no report has been generated.
+    """
+    if not has_processor(site_name):
+        raise HTTPException(status_code=400, detail="Invalid site name")
+    report = reports.get(site_name)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not Found.")
+    return BaseResponse(status="success", data=report)
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class PreprocessJob(BaseModel):
+    job_id: str
+    site_name: str
+    state: str = Field("queued", description="queued / running / succeeded / failed")
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_sec: Optional[float] = Field(None, description="실제 전처리 실행 시간(초)")
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    result: Optional[Dict[str, Any]] = Field(None, description="전처리 요약 (배치 수, 최대 RSS, 출력 경로 등)")
+    error: Optional[str] = None
+
+
+class StageStats(BaseModel):
+    stage: str
+    calls: int = Field(..., description="배치/chunk 수만큼 반복 실행된 횟수")
+    cached: int = Field(0, description="단계 캐시로 건너뛴 횟수")
+    wall_sec: float
+    cpu_sec: float
+    rows_in: int
+    rows_out: int
+    peak_mem_mb: Optional[float] = Field(None, description="tracemalloc 최대 증가량 (측정을 켠 경우만)")
+
+
+class PreprocessRunStats(BaseModel):
+    run_id: str
+    site_name: str
+    source: str = Field(..., description="api / cli")
+    started_at: datetime
+    finished_at: datetime
+    wall_sec: float
+    rows_in: int
+    rows_out: int
+    stages: List[StageStats]
+
+
+class EdaFigure(BaseModel):
+    name: str
+    url: str = Field(..., description="/static 아래 그림 경로 (그림이 바뀌면 v 쿼리도 바뀜)")
+    fingerprint: str
+    cached: bool = Field(..., description="데이터가 같아 이번 요청에서 다시 그리지 않은 그림")
+    rendered_at: Optional[datetime] = None
+
+
+class EdaReport(BaseModel):
+    site_name: str
+    rows: int
+    dpi: int
+    generated_at: datetime
+    render_sec: float
+    rendered: int = Field(..., description="이번 요청에서 새로 그린 그림 수")
+    figures: List[EdaFigure]
@@ -0,0 +1,366 @@
+import gc
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from pymongo.write_concern import WriteConcern
+
+from app.config import (PROCESSED_DIR, REVIEW_BATCH_SIZE, REVIEW_MIN_BATCH_SIZE, REVIEW_MEMORY_BUDGET_MB,
+                        REVIEW_RESULT_CACHE_DIR, REVIEW_STAGE_CACHE_DIR, REVIEW_STATS_DIR, REVIEW_TRACE_MEMORY, REVIEW_WRITE_BATCH_SIZE,
+                        REVIEW_WRITE_CONCERN, REVIEW_WRITE_JOURNAL)
+from app.review.review_cache import PreprocessResultCache
+from app.review.review_repository import PROCESSED_COLLECTION, ReviewRepository
+from review_analysis.preprocessing.output_format import (DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, check_format,
+                                                         frame_parts, read_columns, read_frame, write_frame)
+from review_analysis.preprocessing.profiling import RunStatsStore, summarize_stages
+from review_analysis.preprocessing.registry import get_processor
+from review_analysis.preprocessing.vectorizer_store import VectorizerStore
+
+logger = logging.getLogger(__name__)
+
+class MemoryBudgetExceeded(RuntimeError):
+    """최소 배치 크기로도 메모리 예산을 지킬 수 없을 때 발생"""
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스의 RSS(MB). /proc 가 없는 환경에서는 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+        except ImportError:
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_write_concern(w: str, journal: bool = REVIEW_WRITE_JOURNAL) -> WriteConcern:
+    """"1", "majority" 같은 문자열을 WriteConcern으로 변환 (w=0이면 journal 사용 불가)"""
+    w_value = int(w) if w.isdigit() else w
+    return WriteConcern(w=w_value, j=journal if w_value != 0 else None)
+
+
+class ReviewService:
+    def __init__(self, reviewRepository: ReviewRepository, output_dir: str = PROCESSED_DIR,
+                 stage_cache_dir: Optional[str] = REVIEW_STAGE_CACHE_DIR,
+                 stats_dir: str = REVIEW_STATS_DIR, trace_memory: bool = REVIEW_TRACE_MEMORY,
+                 result_cache_dir: Optional[str] = REVIEW_RESULT_CACHE_DIR) -> None:
+        self.repo = reviewRepository
+        self.output_dir = output_dir
+        self.stage_cache_dir = stage_cache_dir
+        self.stats = RunStatsStore(stats_dir)
+        self.trace_memory = trace_memory
+        self.result_cache = PreprocessResultCache(result_cache_dir) if result_cache_dir else None
+
+    def preprocess(self, site_name: str, batch_size: int = REVIEW_BATCH_SIZE,
+                   memory_budget_mb: Optional[int] = REVIEW_MEMORY_BUDGET_MB,
+                   incremental: bool = False,
+                   write_batch_size: int = REVIEW_WRITE_BATCH_SIZE,
+                   write_concern: str = REVIEW_WRITE_CONCERN,
+                   refit_tfidf: bool = False,
+                   output_format: str = DEFAULT_OUTPUT_FORMAT,
+                   force: bool = False) -> Dict:
+        """
+        Streams raw reviews from MongoDB and preprocesses them batch by batch.
+        1) If the site has no processor, raise error
+        2) Each batch runs through the site processor and is written as one part file (Parquet by default)
+        3) If RSS exceeds the memory budget, halve the batch size; raise if it cannot shrink further
+        4) In incremental mode only documents newer than the site watermark are processed and appended
+        5) Processed documents are upserted into {site}_processed by original_id with unordered bulk writes,
+           tagged with the run id; a full run then deletes every document it did not write
+           (rows now filtered out or deduped, raw reviews that were deleted)
+        6) TF-IDF uses the persisted site vectorizer (transform only) unless refit_tfidf is set or drift is too high;
+           drift is checked on the first batch only, and if that refits during an incremental run the existing
+           TF-IDF parts are re-transformed so every part shares the new column space
+        7) Reviews that exactly duplicate one saved by an earlier batch or run (per-site dedupe index) are dropped
+           before writing, upserting and TF-IDF; near duplicates keep the earlier dup_cluster_id
+        8) Per-stage wall/CPU time and row counts are summed over batches and appended to the site's run stats
+        9) If the raw collection fingerprint, processor version and output options match the last run,
+           that run's summary is returned without reprocessing (unless force or refit_tfidf is set)
+        """
+        site = site_name.lower()
+        processor_class = get_processor(site)
+        if not processor_class:
+            raise ValueError("Invalid site name")
+
+        check_format(output_format)
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self._result_cache_key(site_name, processor_class, batch_size, output_format, incremental)
+            cached = None if force or refit_tfidf else self.result_cache.get(site, cache_key)
+            if cached is not None and frame_parts(cached["output_path"]):
+                logger.info(f"--- {site_name} 원본 변경 없음: 이전 전처리 결과 반환 (run {cached['run_id']}) ---")
+                return {**cached, "cached": True}
+            # 이번 실행이 출력 디렉터리를 다시 쓰므로 이전 결과는 더 이상 유효하지 않음
+            self.result_cache.invalidate(site)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        # 배치마다 part 파일을 추가하는 디렉터리 (증분 실행도 part만 추가)
+        output_path = os.path.join(self.output_dir, f"preprocessed_reviews_{site}")
+
+        # 워터마크나 이어붙일 출력이 없으면 전체 처리로 전환
+        watermark = self.repo.get_watermark(site) if incremental else None
+        incremental = watermark is not None and bool(frame_parts(output_path))
+        if not incremental:
+            watermark = None
+        columns: Optional[List[str]] = None
+        tfidf_dir = os.path.join(self.output_dir, f"tfidf_{site}")
+        if incremental:
+            columns = read_columns(output_path)
+        else:
+            shutil.rmtree(output_path, ignore_errors=True)
+            shutil.rmtree(tfidf_dir, ignore_errors=True)
+        output_parts = len(frame_parts(output_path))
+        tfidf_parts = len(glob.glob(os.path.join(tfidf_dir, "part-*.npz")))
+        tfidf_version = VectorizerStore(self.output_dir, site).manifest()["current"]
+
+        run_id = uuid.uuid4().hex
+        started_at = datetime.now(timezone.utc)
+        began = time.perf_counter()
+        stage_records: List[Dict] = []
+        concern = build_write_concern(write_concern)
+        self.repo.ensure_processed_index(site)
+        write_stats: List[Dict] = []
+
+        cursor = self.repo.iter_reviews(site_name, batch_size, after_id=watermark)
+        size = batch_size
+        rows_in = rows_out = batches = 0
+        peak_rss = current_rss_mb()
+        dedupe_index = None
+        # 첫 벡터화 배치에서 TF-IDF 재학습 여부를 정했는지 (전처리 후 빈 배치는 벡터화하지 않음)
+        tfidf_decided = False
+
+        while True:
+            size, rss = self._enforce_budget(size, memory_budget_mb)
+            peak_rss = max(peak_rss, rss)
+
+            docs = list(islice(cursor, size))
+            if not docs:
+                break
+
+            # 재학습(요청 또는 drift)은 첫 벡터화 배치에서만 결정하고, 이후 배치는 그 어휘로 transform만 수행
+            processor, final_df = self._process_batch(site, processor_class, pd.DataFrame(docs),
+                                                      refit=refit_tfidf and not tfidf_decided,
+                                                      check_drift=not tfidf_decided)
+            if not tfidf_decided and processor.tfidf_version is not None:
+                tfidf_decided = True
+                if tfidf_parts and processor.tfidf_version != tfidf_version:
+                    # 증분 실행에서 새 버전이 학습됐으면 이전 part도 새 어휘로 다시 변환
+                    tfidf_parts = self._retransform_tfidf(processor, output_path, tfidf_dir)
+            if batches == 0:
+                # 배치 안 중복 제거는 dedupe 단계가, 이전 배치/실행과의 중복은 사이트 색인이 담당
+                dedupe_index = processor.dedupe_index()
+                if dedupe_index is not None and not incremental:
+                    dedupe_index.reset()
+            if dedupe_index is not None:
+                final_df = self._drop_seen_duplicates(processor, dedupe_index, final_df)
+            stage_records.extend(processor.stage_log)
+            # 남은 행이 없는 배치는 part를 만들지 않아 출력 part와 TF-IDF part 번호가 항상 같음
+            if not final_df.empty:
+                columns = self._write_part(output_path, output_parts, final_df, columns, output_format)
+                output_parts += 1
+                tfidf_parts += self._save_tfidf_part(processor, final_df, tfidf_dir, tfidf_parts)
+                write_stats.extend(self._persist_batch(site, final_df, write_batch_size, concern,
+                                                       len(write_stats), run_id))
+
+            # 배치가 저장된 뒤에 워터마크를 올려 실패 시 다음 실행에서 이어서 처리
+            watermark = docs[-1]["_id"]
+            self.repo.set_watermark(site, watermark)
+            if dedupe_index is not None:
+                dedupe_index.save()
+
+            rows_in += len(docs)
+            rows_out += len(final_df)
+            batches += 1
+            del docs, final_df, processor
+
+        # 전체 실행은 이번 실행에서 쓰지 않은 이전 문서를 지워 파일 결과와 컬렉션을 맞춤
+        deleted = 0 if incremental else self.repo.delete_stale_processed(site, run_id, concern)
+
+        peak_rss = max(peak_rss, current_rss_mb())
+        written = sum(stat["docs"] for stat in write_stats)
+        write_seconds = sum(stat["seconds"] for stat in write_stats)
+        mode = "증분" if incremental else "전체"
+        logger.info(f"--- {site_name} {mode} 전처리 완료: {batches}개 배치, {rows_in} -> {rows_out}행 ---")
+
+        run = {
+            "run_id": run_id,
+            "site_name": site,
+            "source": "api",
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "wall_sec": round(time.perf_counter() - began, 4),
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "stages": summarize_stages(stage_records),
+        }
+        self.stats.append(site, run)
+
+        result = {
+            "count": rows_out,
+            "rows_in": rows_in,
+            "batches": batches,
+            "batch_size": size,
+            "peak_rss_mb": round(peak_rss, 1),
+            "incremental": incremental,
+            "watermark": str(watermark) if watermark is not None else None,
+            "output_path": output_path,
+            "output_format": output_format,
+            "output_parts": output_parts,
+            "tfidf_parts": tfidf_parts,
+            "run_id": run["run_id"],
+            "stages": run["stages"],
+            "cached": False,
+            "writes": {
+                "collection": PROCESSED_COLLECTION.format(site=site),
+                "docs": written,
+                "deleted": deleted,
+                "docs_per_sec": round(written / write_seconds, 1) if write_seconds else None,
+                "batches": write_stats,
+            },
+        }
+        if self.result_cache is not None:
+            self.result_cache.put(site, cache_key, result)
+        return result
+
+    def _result_cache_key(self, site_name: str, processor_class, batch_size: int, output_format: str,
+                          incremental: bool) -> str:
+        """
+        결과 캐시 키: 원본 fingerprint(문서 수 + 최대 _id) + processor 버전 + 결과를 바꾸는 옵션
+        (배치 크기는 TF-IDF 학습 범위와 배치 내 중복 제거에 영향을 주고,
+         증분/전체 실행은 요약의 rows_in/watermark가 달라 서로의 결과로 응답하지 않음)
+        """
+        payload = {
+            "collection": self.repo.collection_fingerprint(site_name),
+            "processor": f"{processor_class.__name__}-v{processor_class.pipeline_version}",
+            "batch_size": batch_size,
+            "output_format": output_format,
+            "incremental": incremental,
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _process_batch(self, site: str, processor_class, df: pd.DataFrame, refit: bool = False,
+                       check_drift: bool = True):
+        """한 배치를 사이트 processor로 전처리 + FE 한 뒤 (processor, 최종 데이터프레임)을 반환"""
+        # CSV 대신 배치 데이터프레임으로 processor 생성 (결과는 항상 processor.df)
+        processor = processor_class.from_dataframe(df, self.output_dir, refit=refit, check_drift=check_drift,
+                                                   cache_dir=self.stage_cache_dir,
+                                                   trace_memory=self.trace_memory)
+
+        processor.preprocess()
+        # 전처리 후 남은 행이 없으면 벡터화할 것이 없으므로 FE 생략 (그 외 FE 오류는 작업 실패로 전파)
+        if processor.df.empty:
+            logger.info(f"--- {site} 전처리 후 남은 행 없음: FE 건너뜀 ---")
+        else:
+            processor.feature_engineering()
+
+        final_df = processor.df
+
+        # 몽고DB _id는 original_id(문자열)로 변환
+        if "_id" in final_df.columns:
+            final_df = final_df.rename(columns={"_id": "original_id"})
+            final_df["original_id"] = final_df["original_id"].astype(str)
+        return processor, final_df
+
+    @staticmethod
+    def _drop_seen_duplicates(processor, dedupe_index, final_df: pd.DataFrame) -> pd.DataFrame:
+        """이전 배치/실행에서 저장한 리뷰와 완전 중복인 행을 배치 결과와 TF-IDF 행렬에서 함께 제외"""
+        final_df, keep = dedupe_index.apply(final_df, processor.dedupe_column)
+        matrix = getattr(processor, "tfidf_matrix", None)
+        if matrix is not None and matrix.shape[0] == len(keep):
+            processor.tfidf_matrix = matrix[keep]
+        return final_df
+
+    @staticmethod
+    def _save_tfidf_part(processor, final_df: pd.DataFrame, tfidf_dir: str, part: int) -> int:
+        """배치의 TF-IDF 행렬을 tfidf_{site}/part-NNNNN.npz 로 저장 (저장한 개수 반환)"""
+        matrix = getattr(processor, "tfidf_matrix", None)
+        if matrix is None or matrix.shape[0] != len(final_df):
+            return 0
+        processor.save_tfidf(matrix, processor.tfidf_vectorizer.get_feature_names_out(),
+                             processor.tfidf_row_ids(final_df),
+                             base_path=os.path.join(tfidf_dir, f"part-{part:05d}"))
+        return 1
+
+    @staticmethod
+    def _retransform_tfidf(processor, output_path: str, tfidf_dir: str) -> int:
+        """
+        저장된 출력 part의 텍스트를 processor의 현재 벡터라이저로 다시 변환해 tfidf_{site}/ 를 새로 씀
+        (텍스트 컬럼이 없는 part는 건너뜀, 저장한 part 수 반환)
+        """
+        shutil.rmtree(tfidf_dir, ignore_errors=True)
+        feature_names = processor.tfidf_vectorizer.get_feature_names_out()
+        saved = 0
+        for path in frame_parts(output_path):
+            frame = read_frame(path)
+            if processor.text_column not in frame.columns or frame.empty:
+                continue
+            matrix = processor.tfidf_vectorizer.transform(frame[processor.text_column].fillna("").astype(str))
+            processor.save_tfidf(matrix, feature_names, processor.tfidf_row_ids(frame),
+                                 base_path=os.path.join(tfidf_dir, f"part-{saved:05d}"))
+            saved += 1
+        logger.info(f"--- TF-IDF v{processor.tfidf_version}: 기존 part {saved}개 다시 변환 ---")
+        return saved
+
+    def _persist_batch(self, site: str, df: pd.DataFrame, write_batch_size: int,
+                       concern: WriteConcern, offset: int, run_id: str) -> List[Dict]:
+        """전처리 결과를 실행 id와 함께 write_batch_size 단위로 upsert 하고 배치별 처리량을 기록"""
+        if "original_id" not in df.columns or df.empty:
+            return []
+
+        # NaN은 BSON null로 저장
+        df = df.assign(run_id=run_id)
+        docs = df.astype(object).where(df.notna(), None).to_dict("records")
+        stats = []
+        for start in range(0, len(docs), write_batch_size):
+            chunk = docs[start:start + write_batch_size]
+            began = time.perf_counter()
+            counts = self.repo.upsert_processed(site, chunk, concern)
+            elapsed = time.perf_counter() - began
+            stats.append({
+                "batch": offset + len(stats),
+                "docs": len(chunk),
+                **counts,
+                "seconds": round(elapsed, 4),
+                "docs_per_sec": round(len(chunk) / elapsed, 1) if elapsed else None,
+            })
+        return stats
+
+    @staticmethod
+    def _write_part(output_path: str, part: int, df: pd.DataFrame, columns: Optional[List[str]],
+                    output_format: str) -> List[str]:
+        """첫 part의 컬럼을 기준으로 part-NNNNN.{parquet|arrow|csv} 저장"""
+        if columns is None:
+            columns = list(df.columns)
+        path = os.path.join(output_path, f"part-{part:05d}{OUTPUT_FORMATS[output_format]}")
+        write_frame(df.reindex(columns=columns), path, output_format)
+        return columns
+
+    @staticmethod
+    def _enforce_budget(size: int, memory_budget_mb: Optional[int]) -> Tuple[int, float]:
+        """RSS가 예산을 넘으면 GC 후에도 넘는 경우 배치 크기를 절반으로 줄인다"""
+        rss = current_rss_mb()
+        if memory_budget_mb is None or rss <= memory_budget_mb:
+            return size, rss
+
+        gc.collect()
+        rss = current_rss_mb()
+        if rss <= memory_budget_mb:
+            return size, rss
+
+        if size <= REVIEW_MIN_BATCH_SIZE:
+            raise MemoryBudgetExceeded(
+                f"RSS {rss:.0f}MB exceeds memory budget {memory_budget_mb}MB at minimum batch size {size}"
+            )
+        return max(REVIEW_MIN_BATCH_SIZE, size // 2), rss
@@ -0,0 +1,364 @@
+import hashlib
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import USER_CACHE_REDIS_URL, USER_CACHE_SIZE, USER_CACHE_TTL_SEC, USER_CACHE_WORKERS
+from app.user.user_repository import AsyncUserRepository, UserRepository
+from app.user.user_schema import User, normalize_email
+
+logger = logging.getLogger(__name__)
+
+UserRecord = Dict[str, Any]
+
+# 캐시 항목의 비밀번호 해시 반복 횟수 (TTL 동안만 남는 항목이라 로그인 지연을 DB 조회보다 작게 유지)
+PASSWORD_HASH_ITERATIONS = 1000
+
+
+def hash_password(password: str, salt: Optional[str] = None) -> str:
+    """"salt$hex" 형식의 PBKDF2-SHA256 해시 (salt를 주지 않으면 새로 만듦)"""
+    salt = salt or secrets.token_hex(8)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), PASSWORD_HASH_ITERATIONS)
+    return f"{salt}${digest.hex()}"
+
+
+class CachedUser(User):
+    """
+    캐시에서 읽은 유저: 캐시(특히 Redis)에 평문 비밀번호를 두지 않도록 비밀번호는 해시만 가짐
+    password는 비어 있으므로 비밀번호 확인은 check_password로 함
+    """
+    password: str = ""
+    password_hash: str
+
+    def check_password(self, password: str) -> bool:
+        salt = self.password_hash.split("$", 1)[0]
+        return secrets.compare_digest(hash_password(password, salt), self.password_hash)
+
+
+def to_record(user: User) -> UserRecord:
+    return {"email": user.email, "username": user.username, "password_hash": hash_password(user.password)}
+
+
+def from_record(record: Optional[UserRecord]) -> Optional[CachedUser]:
+    # 해시가 없는 항목(이전 형식)은 miss로 보고 DB에서 다시 채움
+    if record is None or "password_hash" not in record:
+        return None
+    return CachedUser(**record)
+
+
+class UserCache:
+    """
+    이메일 → 유저 레코드 캐시의 공통 부분 (hit/miss 카운터, 비동기 메서드 기본 구현)
+    - 조회 결과가 없는 이메일은 캐시하지 않음 (다른 워커에서 가입한 유저가 바로 로그인할 수 있도록)
+    - generation: 무효화할 때마다 증가. DB 조회 전 값과 채울 때 값이 다르면 그 사이 쓰기가 있었으므로 채우지 않음
+    """
+
+    backend = "base"
+
+    def __init__(self, ttl_sec: float) -> None:
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _bump_generation(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+
+    def get(self, email: str) -> Optional[UserRecord]:
+        raise NotImplementedError
+
+    def set(self, email: str, record: UserRecord, generation: int) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, email: str) -> None:
+        raise NotImplementedError
+
+    # 로컬 캐시는 I/O가 없으므로 이벤트 루프에서 그대로 호출
+    async def aget(self, email: str) -> Optional[UserRecord]:
+        return self.get(email)
+
+    async def aset(self, email: str, record: UserRecord, generation: int) -> None:
+        self.set(email, record, generation)
+
+    async def ainvalidate(self, email: str) -> None:
+        self.invalidate(email)
+
+    def size(self) -> Optional[int]:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "ttl_sec": self.ttl_sec,
+                "size": self.size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+
+class LocalUserCache(UserCache):
+    """
+    프로세스(워커)마다 따로 두는 크기 제한 LRU + TTL 캐시
+    무효화는 이 프로세스에만 적용되므로 단일 워커에서만 사용 (다른 워커의 쓰기는 최대 ttl_sec 늦게 보임)
+    """
+
+    backend = "local"
+
+    def __init__(self, maxsize: int, ttl_sec: float, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(ttl_sec)
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, UserRecord]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, email: str) -> Optional[UserRecord]:
+        key = normalize_email(email)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, email: str, record: UserRecord, generation: int) -> None:
+        key = normalize_email(email)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (self.clock() + self.ttl_sec, dict(record))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(normalize_email(email), None)
+        self._bump_generation()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "maxsize": self.maxsize, "evictions": self.evictions}
+
+
+class RedisUserCache(UserCache):
+    """
+    여러 uvicorn 워커가 공유하는 Redis 캐시 (한 워커의 쓰기가 다른 워커의 캐시도 무효화)
+    - 동기 경로는 redis.Redis, 비동기 경로는 redis.asyncio.Redis 사용
+    - Redis 오류는 캐시 miss로 처리하고 DB에서 읽음 (errors 카운터 증가)
+    - generation은 워커 안에서만 확인하므로 다른 워커와의 조회/쓰기 경합은 TTL 안에서만 남음
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: Optional[str], ttl_sec: float, prefix: str = "user:",
+                 client: Any = None, async_client: Any = None) -> None:
+        super().__init__(ttl_sec)
+        if client is None or async_client is None:
+            try:
+                import redis  # type: ignore
+                import redis.asyncio  # type: ignore
+            except ImportError as e:
+                raise RuntimeError("USER_CACHE_REDIS_URL requires the redis package (pip install redis)") from e
+            client = client or redis.Redis.from_url(url)
+            async_client = async_client or redis.asyncio.Redis.from_url(url)
+        self.client = client
+        self.async_client = async_client
+        self.prefix = prefix
+
+    def _key(self, email: str) -> str:
+        return self.prefix + normalize_email(email)
+
+    def _loaded(self, raw: Any) -> Optional[UserRecord]:
+        self._count("misses" if raw is None else "hits")
+        return None if raw is None else json.loads(raw)
+
+    def _failed(self, action: str, error: Exception) -> None:
+        self._count("errors")
+        logger.warning(f"user cache {action} failed: {error}")
+
+    def get(self, email: str) -> Optional[UserRecord]:
+        try:
+            return self._loaded(self.client.get(self._key(email)))
+        except Exception as e:
+            self._failed("get", e)
+            return None
+
+    def set(self, email: str, record: UserRecord, generation: int) -> None:
+        if generation != self.generation():
+            return
+        try:
+            self.client.set(self._key(email), json.dumps(record), ex=max(1, int(self.ttl_sec)))
+        except Exception as e:
+            self._failed("set", e)
+
+    def invalidate(self, email: str) -> None:
+        self._bump_generation()
+        try:
+            self.client.delete(self._key(email))
+        except Exception as e:
+            self._failed("invalidate", e)
+
+    async def aget(self, email: str) -> Optional[UserRecord]:
+        try:
+            return self._loaded(await self.async_client.get(self._key(email)))
+        except Exception as e:
+            self._failed("get", e)
+            return None
+
+    async def aset(self, email: str, record: UserRecord, generation: int) -> None:
+        if generation != self.generation():
+            return
+        try:
+            await self.async_client.set(self._key(email), json.dumps(record), ex=max(1, int(self.ttl_sec)))
+        except Exception as e:
+            self._failed("set", e)
+
+    async def ainvalidate(self, email: str) -> None:
+        self._bump_generation()
+        try:
+            await self.async_client.delete(self._key(email))
+        except Exception as e:
+            self._failed("invalidate", e)
+
+
+class CachedUserRepository:
+    """
+    UserRepository 앞에 두는 read-through 캐시
+    get_user_by_email만 캐시하고(hit이면 CachedUser 반환), 쓰기 메서드는 그대로 실행한 뒤 해당 이메일을 무효화
+    """
+
+    def __init__(self, repo: UserRepository, cache: UserCache) -> None:
+        self.repo = repo
+        self.cache = cache
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        cached = from_record(self.cache.get(email))
+        if cached is not None:
+            return cached
+        generation = self.cache.generation()
+        user = self.repo.get_user_by_email(email)
+        if user is not None:
+            self.cache.set(email, to_record(user), generation)
+        return user
+
+    def save_user(self, user: User) -> User:
+        try:
+            return self.repo.save_user(user)
+        finally:
+            self.cache.invalidate(user.email)
+
+    def create_user(self, user: User) -> bool:
+        try:
+            return self.repo.create_user(user)
+        finally:
+            self.cache.invalidate(user.email)
+
+    def update_password(self, email: str, password: str) -> bool:
+        try:
+            return self.repo.update_password(email, password)
+        finally:
+            self.cache.invalidate(email)
+
+    def delete_user(self, user: User) -> bool:
+        try:
+            return self.repo.delete_user(user)
+        finally:
+            self.cache.invalidate(user.email)
+
+    # 없는 이메일은 캐시하지 않으므로 새로 넣는 유저는 무효화할 항목이 없음
+    def create_users(self, users: List[User]) -> Set[str]:
+        return self.repo.create_users(users)
+
+
+class AsyncCachedUserRepository:
+    """AsyncUserRepository용 CachedUserRepository"""
+
+    def __init__(self, repo: AsyncUserRepository, cache: UserCache) -> None:
+        self.repo = repo
+        self.cache = cache
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        cached = from_record(await self.cache.aget(email))
+        if cached is not None:
+            return cached
+        generation = self.cache.generation()
+        user = await self.repo.get_user_by_email(email)
+        if user is not None:
+            await self.cache.aset(email, to_record(user), generation)
+        return user
+
+    async def save_user(self, user: User) -> User:
+        try:
+            return await self.repo.save_user(user)
+        finally:
+            await self.cache.ainvalidate(user.email)
+
+    async def create_user(self, user: User) -> bool:
+        try:
+            return await self.repo.create_user(user)
+        finally:
+            await self.cache.ainvalidate(user.email)
+
+    async def update_password(self, email: str, password: str) -> bool:
+        try:
+            return await self.repo.update_password(email, password)
+        finally:
+            await self.cache.ainvalidate(email)
+
+    async def delete_user(self, user: User) -> bool:
+        try:
+            return await self.repo.delete_user(user)
+        finally:
+            await self.cache.ainvalidate(user.email)
+
+    async def create_users(self, users: List[User]) -> Set[str]:
+        return await self.repo.create_users(users)
+
+
+def build_user_cache(size: int, ttl_sec: float, redis_url: Optional[str], workers: int = 1) -> Optional[UserCache]:
+    """
+    USER_CACHE_REDIS_URL이 있으면 Redis, 없으면 워커별 LRU (size 0이면 캐시 사용 안 함)
+    워커가 여러 개인데 Redis가 없으면 LRU를 켜지 않음 (다른 워커의 쓰기가 TTL 동안 보이지 않으므로)
+    """
+    if redis_url:
+        return RedisUserCache(redis_url, ttl_sec)
+    if size > 0 and workers > 1:
+        logger.warning(f"user cache disabled: {workers} workers need USER_CACHE_REDIS_URL for shared invalidation")
+        return None
+    if size > 0:
+        return LocalUserCache(size, ttl_sec)
+    return None
+
+
+# 프로세스 전체에서 하나 (요청마다 만드는 Repository가 공유)
+user_cache = build_user_cache(USER_CACHE_SIZE, USER_CACHE_TTL_SEC, USER_CACHE_REDIS_URL, USER_CACHE_WORKERS)
@@ -1,7 +1,68 @@
-from typing import Optional
+from typing import AsyncIterator, Iterator, List, Optional, Set, Union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import text  # SQL 문장을 직접 쓰기 위한 도구
-from app.user.user_schema import User as UserSchema
+from sqlalchemy import bindparam, text  # SQL 문장을 직접 쓰기 위한 도구
+from app.user.user_schema import User as UserSchema, UserPublic, normalize_email
+
+# 동기/비동기 저장소가 같은 SQL을 사용 (메서드 하나가 SQL 문 하나)
+SELECT_USER = text("SELECT email, password, username FROM users WHERE email = :email")
+INSERT_USER = text("""
+    INSERT INTO users (email, password, username)
+    VALUES (:email, :password, :username)
+""")
+UPDATE_PASSWORD = text("UPDATE users SET password = :password WHERE email = :email")
+DELETE_USER = text("DELETE FROM users WHERE email = :email")
+# 대량 가입: 배치의 이메일 중 이미 있는 것을 한 번에 확인 (IN 목록은 실행 시 펼침)
+SELECT_EXISTING_EMAILS = text("SELECT email FROM users WHERE email IN :emails").bindparams(
+    bindparam("emails", expanding=True)
+)
+# 내보내기: 비밀번호 제외, PRIMARY KEY 순서로 읽어 결과 순서가 항상 같음
+SELECT_ALL_USERS = text("SELECT email, username FROM users ORDER BY email")
+# 있으면 수정, 없으면 저장을 한 문장으로 (SELECT 후 INSERT/UPDATE 사이의 경쟁 없음)
+UPSERT_USER = {
+    "mysql": text("""
+        INSERT INTO users (email, password, username)
+        VALUES (:email, :password, :username)
+        ON DUPLICATE KEY UPDATE password = VALUES(password), username = VALUES(username)
+    """),
+    # sqlite / postgresql
+    "default": text("""
+        INSERT INTO users (email, password, username)
+        VALUES (:email, :password, :username)
+        ON CONFLICT (email) DO UPDATE SET password = excluded.password, username = excluded.username
+    """),
+}
+
+
+def to_user(row) -> Optional[UserSchema]:
+    # 결과가 있으면 스키마 형식에 맞춰 반환
+    if row is None:
+        return None
+    return UserSchema(email=row[0], password=row[1], username=row[2])
+
+
+def upsert_query(db: Union[Session, AsyncSession]):
+    dialect = db.get_bind().dialect.name
+    return UPSERT_USER["mysql" if dialect in ("mysql", "mariadb") else "default"]
+
+
+def user_params(user: UserSchema) -> dict:
+    return {"email": user.email, "password": user.password, "username": user.username}
+
+
+def insert_many(users: List[UserSchema]):
+    """users 전체를 INSERT ... VALUES (...), (...) 한 문장으로 (executemany처럼 행마다 보내지 않음)"""
+    values = ", ".join(f"(:email_{i}, :password_{i}, :username_{i})" for i in range(len(users)))
+    params = {f"{key}_{i}": value for i, user in enumerate(users) for key, value in user_params(user).items()}
+    return text(f"INSERT INTO users (email, password, username) VALUES {values}"), params
+
+
+def split_existing(users: List[UserSchema], rows) -> tuple:
+    # DB에 이미 있는 이메일(정규화)과 새로 넣을 유저로 나눔
+    existing = {normalize_email(row[0]) for row in rows}
+    return existing, [user for user in users if normalize_email(user.email) not in existing]
+
 
 class UserRepository:
     # 1. 초기화 시 DB 세션을 외부에서 주입받음.
@@ -11,54 +72,132 @@ class UserRepository:
     # 2. 이메일로 유저 찾기(SELECT * FROM users WHERE email = ...)
     def get_user_by_email(self, email: str) -> Optional[UserSchema]:
         # SQL 문으로 직접 물어보기
-        query = text("SELECT email, password, username FROM users WHERE email = :email")
-        result = self.db.execute(query, {"email": email}).fetchone()
-        
-        if result:
-            # 결과가 있으면 스키마 형식에 맞춰 반환
-            return UserSchema(
-                email=result[0], 
-                password=result[1], 
-                username=result[2]
-            )
-        return None
+        result = self.db.execute(SELECT_USER, {"email": email}).fetchone()
+        return to_user(result)
 
-    # 3. 유저 저장하기(INSERT / UPDATE)
+    # 3. 유저 저장하기: 있으면 수정, 없으면 저장 (INSERT ... ON DUPLICATE KEY UPDATE 한 번)
     def save_user(self, user: UserSchema) -> UserSchema:
-        # 1. 먼저 이 유저가 이미 DB에 있는지 확인
-        existing_user = self.get_user_by_email(user.email)
-
-        if existing_user:
-            # 2. 이미 있다면 정보 수정(UPDATE).
-            query = text("""
-                UPDATE users 
-                SET password = :password, username = :username 
-                WHERE email = :email
-            """)
-        else:
-            # 3. 없다면 새로 저장(INSERT).
-            query = text("""
-                INSERT INTO users (email, password, username) 
-                VALUES (:email, :password, :username)
-            """)
-
-        self.db.execute(query, {
-            "email": user.email, 
-            "password": user.password, 
-            "username": user.username
-        })
-        self.db.commit() 
+        self.db.execute(upsert_query(self.db), user_params(user))
+        self.db.commit()
         return user
-    
 
-    # 4. 유저 삭제하기(DELETE)
-    # 수정 후
-    def delete_user(self, user: UserSchema) -> None:
+    # 4. 새 유저만 저장하기 (이미 있으면 PRIMARY KEY 충돌로 False, 확인용 SELECT 없음)
+    def create_user(self, user: UserSchema) -> bool:
+        try:
+            self.db.execute(INSERT_USER, user_params(user))
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return False
+        return True
+
+    # 5. 비밀번호만 수정하기 (해당 유저가 없으면 False)
+    def update_password(self, email: str, password: str) -> bool:
+        result = self.db.execute(UPDATE_PASSWORD, {"email": email, "password": password})
+        self.db.commit()
+        return result.rowcount > 0
+
+    # 6. 유저 삭제하기(DELETE), 이미 삭제됐으면 False
+    def delete_user(self, user: UserSchema) -> bool:
         # 1. SQL 문으로 직접 삭제하기
-        query = text("DELETE FROM users WHERE email = :email")
-        
-        # 2. 실행
-        self.db.execute(query, {"email": user.email})
-        
-        # 3. 커밋 (중요: 커밋을 해야 실제 반영됩니다)
-        self.db.commit()
\ No newline at end of file
+        result = self.db.execute(DELETE_USER, {"email": user.email})
+
+        # 2. 커밋 (중요: 커밋을 해야 실제 반영됩니다)
+        self.db.commit()
+        return result.rowcount > 0
+
+    # 7. 여러 유저를 한 트랜잭션으로 저장하기 (이미 있는 이메일 SELECT 한 번 + 여러 행 INSERT 한 번)
+    #    이미 있던 이메일(정규화)을 반환. 그 사이 다른 요청이 같은 이메일을 넣어 충돌하면 한 번 더 시도
+    def create_users(self, users: List[UserSchema]) -> Set[str]:
+        try:
+            return self._insert_new_users(users)
+        except IntegrityError:
+            self.db.rollback()
+            return self._insert_new_users(users)
+
+    def _insert_new_users(self, users: List[UserSchema]) -> Set[str]:
+        rows = self.db.execute(SELECT_EXISTING_EMAILS, {"emails": [user.email for user in users]})
+        existing, new_users = split_existing(users, rows)
+        if new_users:
+            self.db.execute(*insert_many(new_users))
+        self.db.commit()
+        return existing
+
+    # 8. 모든 유저 읽기 (서버 사이드 커서로 batch_size행씩 가져옴, 전체를 메모리에 올리지 않음)
+    def iter_users(self, batch_size: int) -> Iterator[UserPublic]:
+        query = SELECT_ALL_USERS.execution_options(stream_results=True, yield_per=batch_size)
+        for row in self.db.execute(query):
+            yield UserPublic(email=row[0], username=row[1])
+
+    # 9. 세션 닫기 (요청 의존성이 아니라 스트림이 세션을 가질 때 사용)
+    def close(self) -> None:
+        self.db.close()
+
+
+class AsyncUserRepository:
+    """
+    UserRepository의 비동기 버전 (SQLAlchemy AsyncSession + aiomysql)
+    DB 왕복을 기다리는 동안 이벤트 루프를 막지 않아 스레드풀 크기에 처리량이 묶이지 않음
+    """
+    # 1. 초기화 시 비동기 DB 세션을 외부에서 주입받음.
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    # 2. 이메일로 유저 찾기
+    async def get_user_by_email(self, email: str) -> Optional[UserSchema]:
+        result = await self.db.execute(SELECT_USER, {"email": email})
+        return to_user(result.fetchone())
+
+    # 3. 유저 저장하기 (upsert 한 번)
+    async def save_user(self, user: UserSchema) -> UserSchema:
+        await self.db.execute(upsert_query(self.db), user_params(user))
+        await self.db.commit()
+        return user
+
+    # 4. 새 유저만 저장하기 (이미 있으면 False)
+    async def create_user(self, user: UserSchema) -> bool:
+        try:
+            await self.db.execute(INSERT_USER, user_params(user))
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            return False
+        return True
+
+    # 5. 비밀번호만 수정하기 (해당 유저가 없으면 False)
+    async def update_password(self, email: str, password: str) -> bool:
+        result = await self.db.execute(UPDATE_PASSWORD, {"email": email, "password": password})
+        await self.db.commit()
+        return result.rowcount > 0
+
+    # 6. 유저 삭제하기(DELETE), 이미 삭제됐으면 False
+    async def delete_user(self, user: UserSchema) -> bool:
+        result = await self.db.execute(DELETE_USER, {"email": user.email})
+        await self.db.commit()
+        return result.rowcount > 0
+
+    # 7. 여러 유저를 한 트랜잭션으로 저장하기 (이미 있던 이메일 반환)
+    async def create_users(self, users: List[UserSchema]) -> Set[str]:
+        try:
+            return await self._insert_new_users(users)
+        except IntegrityError:
+            await self.db.rollback()
+            return await self._insert_new_users(users)
+
+    async def _insert_new_users(self, users: List[UserSchema]) -> Set[str]:
+        rows = await self.db.execute(SELECT_EXISTING_EMAILS, {"emails": [user.email for user in users]})
+        existing, new_users = split_existing(users, rows)
+        if new_users:
+            await self.db.execute(*insert_many(new_users))
+        await self.db.commit()
+        return existing
+
+    # 8. 모든 유저 읽기 (서버 사이드 커서)
+    async def iter_users(self, batch_size: int) -> AsyncIterator[UserPublic]:
+        result = await self.db.stream(SELECT_ALL_USERS.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield UserPublic(email=row[0], username=row[1])
+
+    # 9. 세션 닫기
+    async def close(self) -> None:
+        await self.db.close()
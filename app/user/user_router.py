@@ -1,35 +1,77 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.user.user_schema import User, UserLogin, UserUpdate, UserDeleteRequest
-from app.user.user_service import UserService
-from app.dependencies import get_user_service
+import inspect
+import json
+from typing import Any, Callable, List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.config import USER_BULK_BATCH_SIZE, USER_BULK_MAX_ROWS, USER_EXPORT_BATCH_SIZE
+from app.user.user_schema import BulkRegisterResult, User, UserLogin, UserUpdate, UserDeleteRequest
+from app.user.user_service import AnyUserService
+from app.dependencies import get_user_export_service, get_user_service
 from app.responses.base_response import BaseResponse
 
 user = APIRouter(prefix="/api/user")
 
 
+async def call_service(method: Callable[..., Any], *args: Any) -> Any:
+    """
+    AsyncUserService 메서드는 이벤트 루프에서 await 하고,
+    동기 UserService 메서드는 루프를 막지 않도록 스레드풀에서 실행
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
+
+
+def parse_bulk_body(body: bytes) -> List[Any]:
+    """
+    대량 가입 본문: JSON 배열이면 배열 그대로, 아니면 NDJSON(한 줄에 유저 하나, 빈 줄 무시)
+    NDJSON에서 파싱할 수 없는 줄은 그 줄만 invalid로 처리하도록 ValueError를 행 자리에 넣음
+    """
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("Body must be UTF-8.")
+    if text.lstrip().startswith("["):
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            raise ValueError("Invalid JSON array.")
+        return rows
+    rows: List[Any] = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            rows.append(ValueError(f"Invalid JSON on line {number}."))
+    return rows
+
+
 @user.post("/login", response_model=BaseResponse[User], status_code=status.HTTP_200_OK)
-def login_user(user_login: UserLogin, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+async def login_user(user_login: UserLogin, service: AnyUserService = Depends(get_user_service)) -> BaseResponse[User]:
     try:
-        user = service.login(user_login)
+        user = await call_service(service.login, user_login)
         return BaseResponse(status="success", data=user, message="Login Success.") 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @user.post("/register", response_model=BaseResponse[User], status_code=status.HTTP_201_CREATED)
-def register_user(user: User, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+async def register_user(user: User, service: AnyUserService = Depends(get_user_service)) -> BaseResponse[User]:
     """
     Register a new user in the system.
     
     """
     try:
-        new_user = service.register_user(user)
+        new_user = await call_service(service.register_user, user)
         return BaseResponse(status="success", data=new_user, message="User registration success.") 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @user.delete("/delete", response_model=BaseResponse[User], status_code=status.HTTP_200_OK)
-def delete_user(user_delete_request: UserDeleteRequest, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+async def delete_user(user_delete_request: UserDeleteRequest, service: AnyUserService = Depends(get_user_service)) -> BaseResponse[User]:
     """
     Delete a user account based on the provided email.
     
@@ -38,13 +80,13 @@ def delete_user(user_delete_request: UserDeleteRequest, service: UserService = D
     """
     
     try:
-        deleted_user = service.delete_user(user_delete_request.email)
+        deleted_user = await call_service(service.delete_user, user_delete_request.email)
         return BaseResponse(status="success", data=deleted_user, message="User Deletion Success.") 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @user.put("/update-password", response_model=BaseResponse[User], status_code=status.HTTP_200_OK)
-def update_user_password(user_update: UserUpdate, service: UserService = Depends(get_user_service)) -> BaseResponse[User]:
+async def update_user_password(user_update: UserUpdate, service: AnyUserService = Depends(get_user_service)) -> BaseResponse[User]:
     """
     Update the password for an existing user.
     
@@ -52,7 +94,37 @@ def update_user_password(user_update: UserUpdate, service: UserService = Depends
     if the user is not found.
     """
     try:
-        update_user_password = service.update_user_pwd(user_update)
+        update_user_password = await call_service(service.update_user_pwd, user_update)
         return BaseResponse(status="success", data= update_user_password, message="User password update success.")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+
+@user.post("/bulk", response_model=BaseResponse[BulkRegisterResult], status_code=status.HTTP_200_OK)
+async def register_users(request: Request, service: AnyUserService = Depends(get_user_service)) -> BaseResponse[BulkRegisterResult]:
+    """
+    Register many users from an NDJSON body (one user per line) or a JSON array of users.
+
+    Each row is validated with the User schema and gets its own result
+    (created / exists / duplicate / invalid); valid rows are inserted in batches,
+    one multi-row INSERT and one transaction per batch.
+    """
+    try:
+        rows = parse_bulk_body(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(rows) > USER_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Too many rows (max {USER_BULK_MAX_ROWS}).")
+
+    result = await call_service(service.register_users, rows, USER_BULK_BATCH_SIZE)
+    return BaseResponse(status="success", data=result, message=f"{result.created} users registered.")
+
+@user.get("/export", status_code=status.HTTP_200_OK)
+async def export_users(batch_size: int = Query(USER_EXPORT_BATCH_SIZE, ge=1, le=10000),
+                       service: AnyUserService = Depends(get_user_export_service)) -> StreamingResponse:
+    """
+    Export every user (email, username; no password) as NDJSON.
+
+    Rows are streamed from a server-side cursor batch_size at a time
+    instead of being loaded into memory all at once.
+    """
+    return StreamingResponse(service.export_users(batch_size), media_type="application/x-ndjson")
@@ -1,10 +1,21 @@
-from pydantic import BaseModel, EmailStr
+import secrets
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
+
+
+def normalize_email(email: str) -> str:
+    # MySQL 기본 collation은 대소문자를 구분하지 않으므로 캐시 키/중복 검사도 같은 기준으로 맞춤
+    return email.strip().lower()
+
 
 class User(BaseModel):
     email: EmailStr
     password: str
     username: str
 
+    def check_password(self, password: str) -> bool:
+        return secrets.compare_digest(self.password.encode(), password.encode())
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -19,3 +30,20 @@ class UserDeleteRequest(BaseModel):
 class MessageResponse(BaseModel):
     message: str
 
+class UserPublic(BaseModel):
+    """내보내기용 (비밀번호 제외)"""
+    email: EmailStr
+    username: str
+
+class BulkUserResult(BaseModel):
+    index: int = Field(..., description="요청 본문에서의 행 번호 (0부터)")
+    email: Optional[str] = None
+    status: str = Field(..., description="created / exists / duplicate / invalid")
+    error: Optional[str] = None
+
+class BulkRegisterResult(BaseModel):
+    created: int
+    exists: int = Field(..., description="이미 가입된 이메일이라 건너뛴 행 수")
+    duplicate: int = Field(..., description="같은 요청 안에서 앞 행과 이메일이 겹쳐 건너뛴 행 수")
+    invalid: int = Field(..., description="User 스키마 검증에 실패한 행 수")
+    results: List[BulkUserResult]
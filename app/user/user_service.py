@@ -1,5 +1,52 @@
-from app.user.user_repository import UserRepository
-from app.user.user_schema import User, UserLogin, UserUpdate
+from app.user.user_repository import AsyncUserRepository, UserRepository
+from typing import Any, AsyncIterator, Iterator, List, Optional, Set, Tuple, Union
+from pydantic import ValidationError
+from app.user.user_schema import BulkRegisterResult, BulkUserResult, User, UserLogin, UserUpdate, normalize_email
+
+
+def validate_bulk_rows(rows: List[Any]) -> Tuple[List[Optional[BulkUserResult]], List[Tuple[int, User]]]:
+    """
+    대량 가입 행을 User 스키마로 검증
+    - 검증 실패(또는 JSON 파싱 실패로 Exception이 들어온 행)는 invalid, 앞 행과 이메일이 같으면 duplicate
+    - 반환: 행 번호별 결과(아직 저장 전인 행은 None), 저장할 (행 번호, User) 목록
+    """
+    results: List[Optional[BulkUserResult]] = [None] * len(rows)
+    valid: List[Tuple[int, User]] = []
+    seen: Set[str] = set()
+    for index, row in enumerate(rows):
+        if isinstance(row, Exception):
+            results[index] = BulkUserResult(index=index, status="invalid", error=str(row))
+            continue
+        try:
+            user = User.model_validate(row)
+        except ValidationError as e:
+            email = row.get("email") if isinstance(row, dict) and isinstance(row.get("email"), str) else None
+            error = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors())
+            results[index] = BulkUserResult(index=index, email=email, status="invalid", error=error)
+            continue
+        key = normalize_email(user.email)
+        if key in seen:
+            results[index] = BulkUserResult(index=index, email=user.email, status="duplicate",
+                                            error="Duplicate email in request.")
+            continue
+        seen.add(key)
+        valid.append((index, user))
+    return results, valid
+
+
+def record_batch(results: List[Optional[BulkUserResult]], batch: List[Tuple[int, User]], existing: Set[str]) -> None:
+    for index, user in batch:
+        if normalize_email(user.email) in existing:
+            results[index] = BulkUserResult(index=index, email=user.email, status="exists",
+                                            error="User already Exists.")
+        else:
+            results[index] = BulkUserResult(index=index, email=user.email, status="created")
+
+
+def summarize_bulk(results: List[Optional[BulkUserResult]]) -> BulkRegisterResult:
+    rows = [result for result in results if result is not None]
+    counts = {name: sum(result.status == name for result in rows) for name in ("created", "exists", "duplicate", "invalid")}
+    return BulkRegisterResult(**counts, results=rows)
 
 class UserService:
     def __init__(self, userRepoitory: UserRepository) -> None:
@@ -16,52 +63,184 @@ class UserService:
         if user is None:
             raise ValueError("User not Found.")
         
-        if user.password != user_login.password:
+        if not user.check_password(user_login.password):
             raise ValueError("Invalid ID/PW")
 
-        return user
+        # 캐시에서 읽은 유저는 비밀번호 해시만 가지므로 확인된 비밀번호로 응답
+        return User(email=user.email, password=user_login.password, username=user.username)
         
 
 
     def register_user(self, new_user: User) -> User:
         """
-        Registers a new user.
-        1) If user already exists, raise error
-        2) Otherwise save and return the user
+        Registers a new user with a single INSERT (no existence check beforehand).
+        1) If user already exists (primary key conflict), raise error
+        2) Otherwise return the saved user
         """
-        existing_user : User|None = self.repo.get_user_by_email(new_user.email)
-        if existing_user:
+        if not self.repo.create_user(new_user):
             raise ValueError("User already Exists.")
 
-        return self.repo.save_user(new_user)
+        return new_user
 
 
 
     def delete_user(self, email: str) -> User:
         """
-        Deletes a user.
-        1) If user does not exist, raise a error 
+        Deletes a user (SELECT + DELETE).
+        1) If user does not exist (or was deleted concurrently), raise a error
         2) Otherwise, delete and return the user
-        """        
+        """
         delete_user : User|None = self.repo.get_user_by_email(email)
-        if delete_user is None:
+        if delete_user is None or not self.repo.delete_user(delete_user):
             raise ValueError("User not Found.")
-        
-        return self.repo.delete_user(delete_user)
+
+        return delete_user
 
 
 
     def update_user_pwd(self, user_update: UserUpdate) -> User:
         """
-        Updates Password for user with matching email
-        1) If user is not found, raise a error
+        Updates Password for user with matching email (SELECT + UPDATE of the password column only)
+        1) If user is not found (or was deleted concurrently), raise a error
         2) Otherwise update pswd and return the user
         """
         update_user : User|None = self.repo.get_user_by_email(user_update.email)
-        if update_user is None:
+        if update_user is None or not self.repo.update_password(user_update.email, user_update.new_password):
             raise ValueError("User not Found.")
-        
+
         update_user.password = user_update.new_password
+        return update_user
+
+
+
+    def register_users(self, rows: List[Any], batch_size: int) -> BulkRegisterResult:
+        """
+        Registers many users at once; one bad row does not fail the others.
+        1) Every row is validated with the User schema (invalid / duplicate rows are reported, not saved)
+        2) Valid rows are saved batch_size at a time, one transaction per batch
+           (one SELECT for existing emails + one multi-row INSERT)
+        3) Returns the status of every row: created / exists / duplicate / invalid
+        """
+        results, valid = validate_bulk_rows(rows)
+        for start in range(0, len(valid), batch_size):
+            batch = valid[start:start + batch_size]
+            record_batch(results, batch, self.repo.create_users([user for _, user in batch]))
+
+        return summarize_bulk(results)
+
+
+
+    def export_users(self, batch_size: int) -> Iterator[str]:
+        """
+        Streams every user (without password) as NDJSON, batch_size lines per chunk.
+        1) Rows are read with a server-side cursor, so memory does not grow with the table
+        2) The repository session is closed when the stream ends (the response outlives the request dependencies)
+        """
+        try:
+            lines: List[str] = []
+            for user in self.repo.iter_users(batch_size):
+                lines.append(user.model_dump_json() + "\n")
+                if len(lines) >= batch_size:
+                    yield "".join(lines)
+                    lines = []
+            if lines:
+                yield "".join(lines)
+        finally:
+            self.repo.close()
+
+
+class AsyncUserService:
+    """
+    UserService의 비동기 버전 (AsyncUserRepository 사용, 검증 규칙과 에러 메시지는 같음)
+    """
+    def __init__(self, userRepository: AsyncUserRepository) -> None:
+        self.repo = userRepository
+
+    async def login(self, user_login: UserLogin) -> User:
+        """
+        Searches user from db by matching e-mail address.
+        1) If the user does not exist or password doesn't match, raise error
+        2) Otherwise login and return the user
+        """
+        user : User|None = await self.repo.get_user_by_email(user_login.email)
+
+        if user is None:
+            raise ValueError("User not Found.")
+
+        if not user.check_password(user_login.password):
+            raise ValueError("Invalid ID/PW")
+
+        # 캐시에서 읽은 유저는 비밀번호 해시만 가지므로 확인된 비밀번호로 응답
+        return User(email=user.email, password=user_login.password, username=user.username)
+
+    async def register_user(self, new_user: User) -> User:
+        """
+        Registers a new user with a single INSERT (no existence check beforehand).
+        1) If user already exists (primary key conflict), raise error
+        2) Otherwise return the saved user
+        """
+        if not await self.repo.create_user(new_user):
+            raise ValueError("User already Exists.")
+
+        return new_user
+
+    async def delete_user(self, email: str) -> User:
+        """
+        Deletes a user (SELECT + DELETE).
+        1) If user does not exist (or was deleted concurrently), raise a error
+        2) Otherwise, delete and return the user
+        """
+        delete_user : User|None = await self.repo.get_user_by_email(email)
+        if delete_user is None or not await self.repo.delete_user(delete_user):
+            raise ValueError("User not Found.")
+
+        return delete_user
+
+    async def update_user_pwd(self, user_update: UserUpdate) -> User:
+        """
+        Updates Password for user with matching email (SELECT + UPDATE of the password column only)
+        1) If user is not found (or was deleted concurrently), raise a error
+        2) Otherwise update pswd and return the user
+        """
+        update_user : User|None = await self.repo.get_user_by_email(user_update.email)
+        if update_user is None or not await self.repo.update_password(user_update.email, user_update.new_password):
+            raise ValueError("User not Found.")
+
+        update_user.password = user_update.new_password
+        return update_user
+
+    async def register_users(self, rows: List[Any], batch_size: int) -> BulkRegisterResult:
+        """
+        Registers many users at once; one bad row does not fail the others.
+        1) Every row is validated with the User schema (invalid / duplicate rows are reported, not saved)
+        2) Valid rows are saved batch_size at a time, one transaction per batch
+        3) Returns the status of every row: created / exists / duplicate / invalid
+        """
+        results, valid = validate_bulk_rows(rows)
+        for start in range(0, len(valid), batch_size):
+            batch = valid[start:start + batch_size]
+            record_batch(results, batch, await self.repo.create_users([user for _, user in batch]))
+
+        return summarize_bulk(results)
+
+    async def export_users(self, batch_size: int) -> AsyncIterator[str]:
+        """
+        Streams every user (without password) as NDJSON, batch_size lines per chunk.
+        1) Rows are read with a server-side cursor, so memory does not grow with the table
+        2) The repository session is closed when the stream ends
+        """
+        try:
+            lines: List[str] = []
+            async for user in self.repo.iter_users(batch_size):
+                lines.append(user.model_dump_json() + "\n")
+                if len(lines) >= batch_size:
+                    yield "".join(lines)
+                    lines = []
+            if lines:
+                yield "".join(lines)
+        finally:
+            await self.repo.close()
+
 
-        return self.repo.save_user(update_user)
-        
\ No newline at end of file
+# 라우터는 설정(USER_DB_ASYNC)에 따라 둘 중 하나를 주입받음
+AnyUserService = Union[UserService, AsyncUserService]
@@ -0,0 +1,88 @@
+"""
+앱 시작(import) 시간 벤치마크: 매번 새 인터프리터에서 모듈을 import 해 cold start를 측정
+
+사용법:
+    python -m benchmarks.bench_import_time --module app.main --repeat 5
+    python -m benchmarks.bench_import_time --module review_analysis.preprocessing.imdb_processor --top 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# 시작 시 불러오지 않아야 하는 무거운 라이브러리
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "scipy", "sklearn", "matplotlib", "seaborn", "pymongo")
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def measure(module: str) -> dict:
+    """새 프로세스에서 import 한 번 (결과: 경과 시간, 불러온 무거운 라이브러리, -X importtime 로그)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["importtime"] = completed.stderr
+    return result
+
+
+def slowest_imports(importtime_log: str, top: int, depth: int) -> list:
+    """-X importtime 로그에서 누적 시간이 가장 긴 import (측정 대상 모듈 아래 depth 단계까지)"""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # 들여쓰기 두 칸이 import 한 단계
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if cumulative.strip().isdigit() and 1 <= level <= depth:
+            rows.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--module', default='app.main', help='import 할 모듈 (기본: FastAPI 앱)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='누적 시간이 긴 import 출력 개수')
+    parser.add_argument('--depth', type=int, default=2, help='측정 대상 모듈 아래 몇 단계 import까지 볼지')
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    seconds = [run["seconds"] for run in runs]
+
+    print(f"import {args.module}: median {statistics.median(seconds):.3f}s, "
+          f"min {min(seconds):.3f}s, max {max(seconds):.3f}s ({args.repeat} runs)")
+    print(f"heavy modules loaded: {', '.join(runs[-1]['loaded']) or '-'}")
+    print(f"\n{'cumulative(s)':>14}  import")
+    slowest = slowest_imports(runs[-1]["importtime"], args.top, args.depth)
+    for cumulative, name in slowest:
+        print(f"{cumulative:>14.3f}  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "module": args.module,
+                "runs": seconds,
+                "median_sec": statistics.median(seconds),
+                "heavy_modules_loaded": runs[-1]["loaded"],
+                "slowest_imports": [{"module": name, "cumulative_sec": sec} for sec, name in slowest],
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+리뷰 processor 벤치마크: 합성 리뷰(benchmarks.synthetic)로 사이트별 전처리/FE 단계를 크기별로 실행
+
+- (사이트, 행 수)마다 새 프로세스(spawn)에서 실행해 최대 RSS와 캐시/할당 상태가 다른 경우에 섞이지 않음
+- 단계별 처리량(rows/s)과 wall/cpu 시간, --trace-memory 를 켜면 단계별 tracemalloc 최대 메모리를 기록
+- --json 결과에는 커밋/라이브러리 버전이 함께 저장되고, --compare 로 이전 커밋 결과와 단계별 처리량을 비교
+
+사용법:
+    python -m benchmarks.bench_processors --sizes 10000 100000 1000000 --json bench/HEAD.json
+    python -m benchmarks.bench_processors --sites rotten --sizes 100000 --compare bench/main.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), "..")
+SITES = ("imdb", "rotten", "letterboxd")
+
+
+def rows_per_sec(rows: Optional[int], seconds: float) -> Optional[float]:
+    return round(rows / seconds, 1) if rows and seconds > 0 else None
+
+
+def run_case(site_name: str, rows: int, seed: int, trace_memory: bool) -> Dict[str, Any]:
+    """작업 프로세스: 합성 리뷰 생성 → preprocess → feature_engineering → save 를 측정"""
+    from benchmarks.synthetic import describe, generate_reviews
+    from review_analysis.preprocessing.main import peak_rss_mb
+    from review_analysis.preprocessing.registry import get_processor
+
+    start = time.perf_counter()
+    df = generate_reviews(site_name, rows, seed)
+    generate_sec = time.perf_counter() - start
+    generated, generate_rss_mb = describe(df), peak_rss_mb()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        processor = get_processor(site_name).from_dataframe(df, output_dir, refit=True, trace_memory=trace_memory)
+        del df
+        start = time.perf_counter()
+        processor.preprocess()
+        processor.feature_engineering()
+        save_start, save_cpu = time.perf_counter(), time.process_time()
+        processor.save_to_database()
+        stages = processor.stage_log + [{
+            "stage": "save",
+            "wall_sec": round(time.perf_counter() - save_start, 4),
+            "cpu_sec": round(time.process_time() - save_cpu, 4),
+            "rows_in": len(processor.df),
+            "rows_out": len(processor.df),
+            "peak_mem_mb": None,
+        }]
+        wall_sec = time.perf_counter() - start
+
+    return {
+        "site": site_name,
+        "rows": rows,
+        "status": "ok",
+        "generated": generated,
+        "generate_sec": round(generate_sec, 3),
+        "wall_sec": round(wall_sec, 3),
+        "rows_per_sec": rows_per_sec(rows, wall_sec),
+        "rows_out": stages[-1]["rows_out"],
+        # 생성 직후와 전체 실행의 최대 RSS (차이가 processor가 더 쓴 메모리)
+        "generate_rss_mb": generate_rss_mb,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": [{
+            "stage": record["stage"],
+            "wall_sec": record["wall_sec"],
+            "cpu_sec": record["cpu_sec"],
+            "rows_in": record["rows_in"],
+            "rows_out": record["rows_out"],
+            "rows_per_sec": rows_per_sec(record["rows_in"], record["wall_sec"]),
+            "peak_mem_mb": record["peak_mem_mb"],
+        } for record in stages],
+    }
+
+
+def run_isolated(site_name: str, rows: int, seed: int, trace_memory: bool) -> Dict[str, Any]:
+    """새 작업 프로세스 하나에서 run_case 실행 (메모리 부족으로 죽어도 벤치마크 전체는 계속)"""
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        return pool.submit(run_case, site_name, rows, seed, trace_memory).result()
+    except BrokenProcessPool:
+        error = "worker process died (out of memory?)"
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    finally:
+        pool.shutdown()
+    return {"site": site_name, "rows": rows, "status": "failed", "error": error}
+
+
+def environment() -> Dict[str, Any]:
+    """커밋 간 비교를 위해 결과와 함께 저장하는 실행 환경"""
+    import numpy
+    import pandas
+    import pyarrow  # type: ignore
+
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(baseline: Dict[str, Any], cases: List[Dict[str, Any]]) -> None:
+    """이전 결과와 (사이트, 행 수, 단계)별 처리량 비교 (ratio > 1 이면 빨라짐)"""
+    previous = {
+        (case["site"], case["rows"], stage["stage"]): stage["rows_per_sec"]
+        for case in baseline["cases"] if case["status"] == "ok" for stage in case["stages"]
+    }
+    print(f"\ncompare with {(baseline['environment'].get('commit') or '?')[:10]}")
+    print(f"{'site':<11}{'rows':>9}  {'stage':<20}{'before rows/s':>15}{'after rows/s':>15}{'ratio':>8}")
+    for case in cases:
+        if case["status"] != "ok":
+            continue
+        for stage in case["stages"]:
+            before = previous.get((case["site"], case["rows"], stage["stage"]))
+            after = stage["rows_per_sec"]
+            ratio = f"{after / before:.2f}x" if before and after else "-"
+            print(f"{case['site']:<11}{case['rows']:>9}  {stage['stage']:<20}"
+                  f"{before or '-':>15}{after or '-':>15}{ratio:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--sites', nargs='+', choices=SITES, default=list(SITES))
+    parser.add_argument('--seed', type=int, default=0, help='합성 리뷰 난수 시드 (커밋 간 비교 시 같은 값 사용)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='단계별 tracemalloc 최대 메모리 측정 (할당 추적으로 수 배 느려짐)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 경로')
+    args = parser.parse_args()
+
+    cases = []
+    for rows in args.sizes:
+        for site_name in args.sites:
+            case = run_isolated(site_name, rows, args.seed, args.trace_memory)
+            cases.append(case)
+            if case["status"] != "ok":
+                print(f"{site_name:<11}{rows:>9}  FAILED: {case['error']}", file=sys.stderr)
+                continue
+            print(f"{site_name:<11}{rows:>9}  {case['wall_sec']:>8.2f}s  {case['rows_per_sec']:>10} rows/s  "
+                  f"peak RSS {case['peak_rss_mb']} MB (generate {case['generate_sec']}s)")
+            for stage in case["stages"]:
+                memory = f"  {stage['peak_mem_mb']} MB" if stage["peak_mem_mb"] is not None else ""
+                print(f"    {stage['stage']:<20}{stage['wall_sec']:>8.3f}s  {stage['rows_in']:>9} -> "
+                      f"{stage['rows_out']:<9} {stage['rows_per_sec'] or '-':>12} rows/s{memory}")
+
+    result = {
+        "environment": environment(),
+        "config": {"sizes": args.sizes, "sites": args.sites, "seed": args.seed, "trace_memory": args.trace_memory},
+        "cases": cases,
+    }
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), cases)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+텍스트 정제 벤치마크: 기존 행 단위 apply(clean_text) vs 벡터화된 TextCleaner
+
+사용법:
+    python -m benchmarks.bench_text_cleaning --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+from review_analysis.preprocessing.letterboxd_processor import LetterboxdProcessor
+from review_analysis.preprocessing.text_cleaning import TextCleaner
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+SITES = ("imdb", "letterboxd", "rotten")
+
+
+def legacy_clean_text(text, stopwords):
+    """기존 LetterboxdProcessor 의 행 단위 정제 (비교 기준)"""
+    if not isinstance(text, str):
+        return ""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\.\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    words = [w for w in text.split() if w not in stopwords and len(w) > 1]
+    return ' '.join(words).strip()
+
+
+def sample_reviews(size: int) -> pd.Series:
+    """크롤링된 리뷰 CSV에서 복원 추출해 원하는 크기의 코퍼스 생성"""
+    corpus = pd.concat(
+        [pd.read_csv(os.path.join(DATABASE_DIR, f"reviews_{site}.csv"))["content"].dropna() for site in SITES],
+        ignore_index=True,
+    )
+    return corpus.sample(n=size, replace=True, random_state=0).reset_index(drop=True)
+
+
+def rows_per_sec(func, texts: pd.Series) -> float:
+    start = time.perf_counter()
+    func(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--skip-legacy', action='store_true', help='기존 apply 방식 측정 생략 (큰 코퍼스용)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    args = parser.parse_args()
+
+    stopwords = set(LetterboxdProcessor("", "").stopwords)
+    cleaner = TextCleaner(remove_urls=True, keep_chars="a-zA-Z0-9", stopwords=stopwords, min_token_length=2)
+
+    results = []
+    print(f"{'rows':>10} {'legacy rows/s':>15} {'vectorized rows/s':>18} {'speedup':>8}")
+    for size in args.sizes:
+        texts = sample_reviews(size)
+        legacy = None if args.skip_legacy else rows_per_sec(
+            lambda s: s.apply(legacy_clean_text, stopwords=stopwords), texts)
+        vectorized = rows_per_sec(cleaner.clean, texts)
+        speedup = f"{vectorized / legacy:.1f}x" if legacy else "-"
+        print(f"{size:>10} {legacy or 0:>15,.0f} {vectorized:>18,.0f} {speedup:>8}")
+        results.append({"rows": size, "legacy_rows_per_sec": legacy, "vectorized_rows_per_sec": vectorized})
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+사이트별 스키마와 특이값을 흉내 낸 합성 리뷰 생성기 (벤치마크 입력용)
+
+크롤링된 CSV(database/reviews_{site}.csv)에서 별점 분포, 토큰(공백 단위, 문장부호/대소문자 포함)과
+리뷰 길이 분포를 가져오고, 사이트별로 processor가 처리해야 하는 값을 섞음
+- imdb      : YYYY.MM.DD 날짜, 0~10 정수 별점 (0점은 이상치)
+- rotten    : "5d" / "9h" / "Jan 21" / "Jan 21, 2024" / "01/03/2025" 같은 상대·혼합 날짜, 실수 별점
+- letterboxd: 문자열 별점과 '평점 없음', 빠진 날짜와 2010년 이전 날짜
+- 공통      : 10000자를 넘는 긴 리뷰, 완전 중복 리뷰, 본문 결측
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+SITES = ("imdb", "rotten", "letterboxd")
+
+# 전체 행 대비 비율
+LONG_REVIEW_RATE = 0.005
+DUPLICATE_RATE = 0.02
+MISSING_CONTENT_RATE = 0.01
+CHUNK_ROWS = 20_000
+
+# 사이트별 CSV 컬럼 순서
+COLUMNS = {"imdb": ["date", "rating", "content"], "rotten": ["date", "rating", "content"],
+           "letterboxd": ["rating", "date", "content"]}
+# read_csv가 만드는 문자열 타입 (arrow 배열을 복사 없이 감쌈)
+STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+MONTHS = np.array(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+
+
+@lru_cache(maxsize=None)
+def site_profile(site_name: str) -> Tuple[np.ndarray, pd.Series, Tuple[float, float]]:
+    """(토큰 어휘, 별점 분포, 토큰 수 로그정규 분포 (mu, sigma))"""
+    df = pd.read_csv(os.path.join(DATABASE_DIR, f"reviews_{site_name}.csv"))
+    tokens = df["content"].dropna().astype(str).str.split()
+    vocabulary = np.array([token for review in tokens for token in review], dtype=object)
+    log_lengths = np.log(tokens.str.len().clip(lower=1))
+    ratings = df["rating"].value_counts(normalize=True)
+    return vocabulary, ratings, (float(log_lengths.mean()), float(log_lengths.std()))
+
+
+def _texts(rng: np.random.Generator, site_name: str, rows: int) -> pa.ChunkedArray:
+    """
+    어휘에서 토큰을 뽑아 리뷰별 list로 묶은 뒤 arrow에서 공백으로 이어 붙임
+    - 행마다 python에서 join 하지 않고, 결과도 python 문자열 객체로 바꾸지 않음 (1M행 imdb ≈ 1.3GB)
+    - 토큰 배열이 커지지 않도록 CHUNK_ROWS행씩 생성
+    - 완전 중복(앞서 나온 리뷰를 그대로 다시 올린 행)과 본문 결측을 섞음
+    """
+    vocabulary, _, (mu, sigma) = site_profile(site_name)
+    words = pa.array(vocabulary.tolist(), pa.large_string())
+    separator = pa.scalar(" ", pa.large_string())
+    counts = np.clip(rng.lognormal(mu, sigma, rows), 1, 2000).astype(np.int64)
+    # 일부는 processor의 길이 상한(10000자)을 넘는 긴 리뷰
+    long_rows = rng.random(rows) < LONG_REVIEW_RATE
+    counts[long_rows] = rng.integers(2000, 2500, long_rows.sum())
+
+    chunks = []
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = counts[start:start + CHUNK_ROWS]
+        tokens = words.take(pa.array(rng.integers(0, len(vocabulary), chunk.sum(), dtype=np.int32)))
+        offsets = pa.array(np.concatenate([[0], np.cumsum(chunk)]), pa.int64())
+        reviews = pc.binary_join(pa.LargeListArray.from_arrays(offsets, tokens), separator)
+        # 중복/결측도 청크 안에서 처리 (전체 크기의 복사본을 여러 벌 만들지 않음)
+        order = np.arange(len(chunk))
+        duplicates = rng.random(len(chunk)) < DUPLICATE_RATE
+        order[duplicates] = rng.integers(0, len(chunk), duplicates.sum())
+        missing = pa.array(rng.random(len(chunk)) < MISSING_CONTENT_RATE)
+        chunks.append(pc.if_else(missing, pa.scalar(None, pa.large_string()), reviews.take(pa.array(order))))
+    return pa.chunked_array(chunks, pa.large_string())
+
+
+def _dotted_dates(rng: np.random.Generator, rows: int, start: str, end: str) -> pd.Series:
+    first, last = pd.Timestamp(start), pd.Timestamp(end)
+    days = rng.integers(0, (last - first).days + 1, rows)
+    return pd.Series(first + pd.to_timedelta(days, unit="D")).dt.strftime("%Y.%m.%d")
+
+
+def _rotten_dates(rng: np.random.Generator, rows: int) -> pd.Series:
+    """크롤링 직후 Rotten 날짜처럼 절대/상대/월 일 형식을 섞음"""
+    dates = _dotted_dates(rng, rows, "2025-01-22", "2026-01-21").to_numpy(dtype=object)
+    kind = rng.choice(6, rows, p=[0.6, 0.15, 0.05, 0.1, 0.05, 0.05])
+    amount = rng.integers(1, 30, rows).astype(str)
+    month = MONTHS[rng.integers(0, 12, rows)]
+    day = rng.integers(1, 29, rows).astype(str)
+    year = rng.integers(2023, 2026, rows).astype(str)
+    dates[kind == 1] = (amount + "d")[kind == 1]
+    dates[kind == 2] = (amount + "h")[kind == 2]
+    dates[kind == 3] = np.char.add(np.char.add(month, " "), day)[kind == 3]
+    dates[kind == 4] = np.char.add(np.char.add(np.char.add(month, " "), day), np.char.add(", ", year))[kind == 4]
+    dates[kind == 5] = np.char.add(np.char.add(np.char.zfill(day, 2), "/"), np.char.add("01/", year))[kind == 5]
+    return pd.Series(dates)
+
+
+def _dates(rng: np.random.Generator, site_name: str, rows: int) -> pd.Series:
+    if site_name == "rotten":
+        return _rotten_dates(rng, rows)
+    if site_name == "letterboxd":
+        dates = _dotted_dates(rng, rows, "2014-10-20", "2026-01-18").to_numpy(dtype=object)
+        kind = rng.random(rows)
+        dates[kind < 0.01] = None                                                   # 날짜 없음
+        dates[(kind >= 0.01) & (kind < 0.02)] = _dotted_dates(rng, rows, "2005-01-01", "2009-12-31")[
+            (kind >= 0.01) & (kind < 0.02)]                                          # 2010년 이전
+        return pd.Series(dates)
+    return _dotted_dates(rng, rows, "2014-10-29", "2026-01-03")
+
+
+def generate_reviews(site_name: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """reviews_{site}.csv 와 같은 컬럼(date, rating, content)의 합성 리뷰"""
+    if site_name not in SITES:
+        raise ValueError(f"Unknown site: {site_name} (choices: {', '.join(SITES)})")
+    rng = np.random.default_rng(seed)
+    _, ratings, _ = site_profile(site_name)
+
+    df = pd.DataFrame({
+        "date": _dates(rng, site_name, rows),
+        "rating": rng.choice(ratings.index.to_numpy(), rows, p=ratings.to_numpy()),
+        "content": pd.array(_texts(rng, site_name, rows).cast(pa.string()), dtype=STRING_DTYPE),
+    })
+
+    # letterboxd는 CSV를 읽었을 때처럼 별점이 문자열 ('평점 없음' 포함)
+    if site_name == "letterboxd":
+        df["rating"] = df["rating"].astype(STRING_DTYPE)
+    return df[COLUMNS[site_name]]
+
+
+def describe(df: pd.DataFrame) -> Dict[str, float]:
+    """생성 결과 요약 (벤치마크 결과에 함께 기록)"""
+    lengths = df["content"].dropna().str.len()
+    return {"rows": len(df), "mean_length": round(float(lengths.mean()), 1), "max_length": int(lengths.max()),
+            "missing_content": int(df["content"].isna().sum())}
@@ -1,10 +1,17 @@
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 import os
 from dotenv import load_dotenv
 
+from database.pool_metrics import PoolMetrics, instrumented_pool, pool_status
+from database.query_counter import track_queries
+
 load_dotenv()
 
 user = os.getenv("MYSQL_USER")
@@ -14,6 +21,41 @@ port = os.getenv("MYSQL_PORT")
 db = os.getenv("MYSQL_DB")
 
 DB_URL = f'mysql+pymysql://{user}:{passwd}@{host}:{port}/{db}?charset=utf8'
+# 같은 DB를 비동기 드라이버(aiomysql)로 접속 (/api/user 비동기 경로용)
+ASYNC_DB_URL = f'mysql+aiomysql://{user}:{passwd}@{host}:{port}/{db}?charset=utf8'
+
+# SQL 문장 로그 (운영에서는 끔)
+ECHO = os.getenv("MYSQL_ECHO", "false").lower() == "true"
+# 커넥션 풀 설정 (동기/비동기 엔진이 각각 이 크기의 풀을 가짐)
+POOL_OPTIONS: Dict[str, Any] = {
+    "pool_size": int(os.getenv("MYSQL_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("MYSQL_MAX_OVERFLOW", "10")),  # pool_size를 넘어 잠시 더 만들 수 있는 연결 수
+    "pool_timeout": float(os.getenv("MYSQL_POOL_TIMEOUT", "30")),  # 연결을 기다리는 최대 시간(초)
+    "pool_recycle": int(os.getenv("MYSQL_POOL_RECYCLE", "1800")),  # MySQL wait_timeout 전에 연결을 새로 맺음(초)
+    "pool_pre_ping": os.getenv("MYSQL_POOL_PRE_PING", "true").lower() == "true",  # 끊긴 연결을 쓰기 전에 확인
+}
+
+# 엔진별 풀 측정값 (GET /internal/db/pool)
+pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
 
-engine = create_engine(DB_URL, echo=True)
+engine = create_engine(DB_URL, echo=ECHO, poolclass=instrumented_pool(QueuePool, pool_metrics["sync"]),
+                       **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 연결은 첫 쿼리 때 맺음 (import 시점에는 DB에 접속하지 않음)
+async_engine = create_async_engine(ASYNC_DB_URL, echo=ECHO,
+                                   poolclass=instrumented_pool(AsyncAdaptedQueuePool, pool_metrics["async"]),
+                                   **POOL_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# 요청별 SQL 문 수 (X-DB-Query-Count 응답 헤더)
+track_queries(engine)
+track_queries(async_engine)
+
+
+def get_pool_status() -> Dict[str, Dict[str, Any]]:
+    """동기/비동기 엔진의 풀 설정, 현재 상태와 누적 측정값"""
+    return {
+        "sync": {**POOL_OPTIONS, **pool_status(engine.pool, pool_metrics["sync"])},
+        "async": {**POOL_OPTIONS, **pool_status(async_engine.pool, pool_metrics["async"])},
+    }
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """
+    커넥션 풀 대기 시간/이벤트 누적 기록 (스레드/코루틴에서 동시에 갱신)
+    - checkout 대기: 풀에서 연결을 받을 때까지 걸린 시간 (pre-ping 포함), 최근 samples개로 분위수 계산
+    - overflow_events: pool_size를 넘어 overflow 연결을 새로 만든 횟수
+    - timeouts: pool_timeout 안에 연결을 받지 못한 횟수
+    """
+
+    def __init__(self, samples: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._waits: deque = deque(maxlen=samples)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_events = 0
+        self.connections_created = 0
+        self.total_wait_sec = 0.0
+        self.max_wait_sec = 0.0
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_sec += seconds
+            self.max_wait_sec = max(self.max_wait_sec, seconds)
+            self._waits.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self, overflow: bool) -> None:
+        with self._lock:
+            self.connections_created += 1
+            self.overflow_events += int(overflow)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts, total = self.checkouts, self.total_wait_sec
+
+            def percentile(q: float) -> float:
+                return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 3) if waits else 0.0
+
+            return {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "overflow_events": self.overflow_events,
+                "connections_created": self.connections_created,
+                "wait_ms": {
+                    "avg": round(total / checkouts * 1000, 3) if checkouts else 0.0,
+                    "p50": percentile(0.5),
+                    "p95": percentile(0.95),
+                    "max": round(self.max_wait_sec * 1000, 3),
+                },
+            }
+
+
+def instrumented_pool(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    pool_class(QueuePool / AsyncAdaptedQueuePool)에 측정을 붙인 하위 클래스
+    engine.dispose() 후 recreate()로 새 풀을 만들어도 같은 클래스라 metrics가 이어짐
+    """
+
+    class InstrumentedPool(pool_class):  # type: ignore[valid-type, misc]
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except exc.TimeoutError:
+                metrics.record_timeout()
+                raise
+            metrics.record_checkout(time.perf_counter() - started)
+            return connection
+
+        def _create_connection(self):
+            # QueuePool은 overflow 카운터를 먼저 올린 뒤 연결을 만듦 (0보다 크면 pool_size 초과분)
+            connection = super()._create_connection()
+            metrics.record_connect(overflow=getattr(self, "_overflow", 0) > 0)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    InstrumentedPool.metrics = metrics  # type: ignore[attr-defined]
+    return InstrumentedPool
+
+
+def pool_status(pool: Pool, metrics: PoolMetrics) -> Dict[str, Any]:
+    """현재 풀 상태(크기, 사용 중/유휴 연결, overflow)와 누적 측정값"""
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        method = getattr(pool, name, None)
+        status[name] = method() if callable(method) else None
+    return {**status, **metrics.snapshot()}
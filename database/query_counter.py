@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+
+
+class QueryCount:
+    """count_queries() 범위 안에서 DB로 보낸 SQL 문 수 (바깥 범위에도 함께 더함)"""
+
+    def __init__(self, parent: Optional["QueryCount"] = None) -> None:
+        self.count = 0
+        self.parent = parent
+
+    def add(self) -> None:
+        counter: Optional[QueryCount] = self
+        while counter is not None:
+            counter.count += 1
+            counter = counter.parent
+
+
+# 요청(또는 테스트)마다 따로 세도록 ContextVar에 현재 카운터를 둠
+# 값은 변경 가능한 객체라 스레드풀/greenlet으로 복사된 context에서 센 것도 같은 카운터에 반영됨
+_current: ContextVar[Optional[QueryCount]] = ContextVar("db_query_count", default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """
+    with count_queries() as queries:
+        service.register_user(user)
+    assert queries.count == 1
+    """
+    counter = QueryCount(_current.get())
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current.get()
+    if counter is not None:
+        counter.add()
+
+
+def track_queries(engine: Any) -> None:
+    """엔진(동기 또는 AsyncEngine)이 실행하는 SQL 문을 현재 카운터에 더함 (pre-ping/commit은 세지 않음)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
@@ -2,7 +2,6 @@ from review_analysis.crawling.base_crawler import BaseCrawler
 import time
 import pandas as pd
 import os
-from datetime import datetime # [핵심] 영문 날짜를 숫자로 바꾸기 위해 필요
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -11,6 +10,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from review_analysis.preprocessing.dates import format_dates, parse_dates
 
 class ImdbCrawler(BaseCrawler):
     '''
@@ -32,16 +32,12 @@ class ImdbCrawler(BaseCrawler):
         self.driver.get(self.base_url)
         time.sleep(3)
 
-    def format_date(self, date_str: str) -> str:
-        '''영문날짜 형식 -> 숫자 형식 변환'''
-        try:
-            # strip()으로 앞뒤 공백과 따옴표 영향을 제거한 뒤 파싱
-            clean_date = date_str.strip().replace('"', '').replace("'", "")
-            date_obj = datetime.strptime(clean_date, '%b %d, %Y')
-            return date_obj.strftime('%Y.%m.%d')
-        except Exception:
-            # 변환 실패 시 원본에서 불필요한 문자만 제거하여 반환
-            return date_str.strip().replace('"', '').replace("'", "")
+    def format_review_dates(self, dates: pd.Series) -> pd.Series:
+        '''영문날짜 형식(Jan 21, 2025) -> 숫자 형식 일괄 변환'''
+        # 변환 실패 시 원본에서 앞뒤 공백과 따옴표만 제거하여 유지
+        fallback = dates.str.strip().str.replace(r"[\"']", "", regex=True)
+        # IMDb는 항상 연도가 있는 형식이므로 다른 사이트 기준일로 상대 날짜를 해석하지 않도록 이 형식만 허용
+        return format_dates(parse_dates(fallback, '%b %d, %Y'), missing=fallback)
 
     def load_all_reviews(self, target_count):
         '''목표 수집 개수만큼 리뷰 목록 확장'''
@@ -116,9 +112,8 @@ class ImdbCrawler(BaseCrawler):
                 rating_raw = detail_soup.select_one('span.ipc-rating-star--rating').get_text() if detail_soup.select_one('span.ipc-rating-star--rating') else "0"
                 rating = rating_raw.split('/')[0]
                 
-                # 날짜 추출 및 변환
-                date_raw = detail_soup.select_one('li.review-date').get_text() if detail_soup.select_one('li.review-date') else ""
-                date = self.format_date(date_raw)
+                # 날짜 추출 (숫자 형식 변환은 저장 시 일괄 처리)
+                date = detail_soup.select_one('li.review-date').get_text() if detail_soup.select_one('li.review-date') else ""
                 
                 # 본문 정제: 줄바꿈 제거 및 따옴표 통일
                 raw_content = detail_soup.select_one('div.ipc-html-content-inner-div').get_text(separator=" ").strip()
@@ -148,6 +143,7 @@ class ImdbCrawler(BaseCrawler):
             return
         
         df = pd.DataFrame(self.reviews)
+        df['date'] = self.format_review_dates(df['date'])
         save_path = os.path.join(self.output_dir, "reviews_imdb.csv")
         os.makedirs(self.output_dir, exist_ok=True)
         df.to_csv(save_path, index=False, encoding='utf-8-sig')
@@ -14,6 +14,7 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException,
 
 # 기존 프로젝트 구조 임포트
 from review_analysis.crawling.base_crawler import BaseCrawler
+from review_analysis.preprocessing.dates import format_dates, parse_dates
 from utils.logger import setup_logger
 
 class letterboxdCrawler(BaseCrawler):
@@ -112,15 +113,15 @@ class letterboxdCrawler(BaseCrawler):
             self.logger.error(f"JS 추출 오류: {e}")
             return []
 
-    def _format_date(self, date_str):
-        if not date_str or date_str == '날짜 정보 없음':
-            return '날짜 정보 없음'
-        try:
-            if 'T' in date_str:
-                return date_str.split('T')[0].replace('-', '.')
-            return date_str.replace('-', '.')
-        except:
-            return date_str
+    def _format_dates(self, dates: pd.Series) -> pd.Series:
+        """
+        ISO 날짜(2025-01-21T...)를 YYYY.MM.DD로 일괄 변환
+        (다른 사이트 기준일로 상대 날짜를 해석하지 않도록 ISO 형식만 허용, 해석할 수 없으면 '-'만 '.'로 바꿔 유지)
+        """
+        text = dates.astype("string").str.strip()
+        fallback = text.str.replace('-', '.', regex=False).astype(object)
+        fallback = fallback.where(text.fillna('').ne(''), '날짜 정보 없음')
+        return format_dates(parse_dates(text.str.split('T').str[0], '%Y-%m-%d'), missing=fallback)
 
     def _wait_for_reviews(self, timeout=8):
         try:
@@ -174,7 +175,7 @@ class letterboxdCrawler(BaseCrawler):
                     
                     self.reviews_data.append({
                         "rating": review['rating'],
-                        "date": self._format_date(review['date']),
+                        "date": review['date'],
                         "content": content
                     })
                     new_count += 1
@@ -214,6 +215,7 @@ class letterboxdCrawler(BaseCrawler):
         if not self.reviews_data: return
         os.makedirs(self.output_dir, exist_ok=True)
         df = pd.DataFrame(self.reviews_data)
+        df['date'] = self._format_dates(df['date'])
         save_path = os.path.join(self.output_dir, "reviews_letterboxd.csv")
         df.to_csv(save_path, index=False, encoding="utf-8-sig")
         self.logger.info(f"최종 저장 완료: {save_path}")
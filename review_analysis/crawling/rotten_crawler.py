@@ -1,7 +1,6 @@
 import os
 import time
-import re
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,6 +8,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from review_analysis.crawling.base_crawler import BaseCrawler
+from review_analysis.preprocessing.dates import normalize_dates
 
 
 class RottenCrawler(BaseCrawler):
@@ -166,53 +166,13 @@ class RottenCrawler(BaseCrawler):
 
   
 
-    def _parse_rotten_date(self, s: str, now: datetime) -> datetime | None:
-        """
-        RottenTomatoes timestamp가 다음과 같이 나올 수 있음:
-        - '9h', '20h'
-        - '1d', '2d'
-        - 'Oct 13' (연도 없음)
-        - 그 외 포맷 Unknown 등
-        """
-        s = str(s).strip()
-
-        # 상대시간: 9h, 20h
-        m = re.fullmatch(r"(\d+)\s*h", s)
-        if m:
-            return now - timedelta(hours=int(m.group(1)))
-
-        # 상대시간: 1d, 2d
-        m = re.fullmatch(r"(\d+)\s*d", s)
-        if m:
-            return now - timedelta(days=int(m.group(1)))
-
-        # 월/일만 있는 형태: Oct 13
-        try:
-            dt = datetime.strptime(s, "%b %d")
-            dt = dt.replace(year=now.year)
-
-            # 오늘 기준 미래면 말이 안 되므로 작년으로 내림
-            if dt.date() > now.date():
-                dt = dt.replace(year=dt.year - 1)
-
-            return dt
-        except Exception:
-            pass
-
-        return None
-
     def _normalize_and_fix_dates(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         - date를 YYYY.MM.DD로 통일
         - CSV가 "위가 최신, 아래가 과거"임을 이용해 year 충돌 자동 해결
         """
-        now = datetime.now()
-
-        parsed = []
-        for x in df["date"]:
-            parsed.append(self._parse_rotten_date(x, now))
-
-        df["parsed_date"] = parsed
+        # '9h', '1d' 같은 상대시간과 'Oct 13'(연도 없음)을 현재 시각 기준으로 일괄 변환
+        df["parsed_date"] = normalize_dates(df["date"], reference_date=datetime.now(), parse_hours=True)
 
         # 파싱 가능한 행만 대상으로 충돌 해결
         valid_mask = df["parsed_date"].notna()
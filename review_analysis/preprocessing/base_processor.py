@@ -1,19 +1,287 @@
+import json
+import logging
+import os
+import shutil
 from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer  # type: ignore
+from sklearn.preprocessing import normalize  # type: ignore
+
+from review_analysis.preprocessing.dedupe import DedupeIndex, MinHashDeduper, dedupe_reviews
+from review_analysis.preprocessing.features import add_text_features
+from review_analysis.preprocessing.output_format import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, check_format, write_frame
+from review_analysis.preprocessing.pipeline import Pipeline, Stage
+from review_analysis.preprocessing.vectorizer_store import VectorizerStore, oov_rate
+
+logger = logging.getLogger(__name__)
 
 class BaseDataProcessor:
+    # 출력 파일 이름에 쓰이는 사이트 이름 (예: preprocessed_reviews_{site_name}.csv)
+    site_name: str = ""
+    # 전처리 결과 저장 형식 (parquet / arrow / csv)
+    output_format: str = DEFAULT_OUTPUT_FORMAT
+
+    # False면 저장된 TF-IDF 벡터라이저로 transform만 수행 (없으면 학습)
+    refit: bool = False
+    # 학습 시점보다 OOV 비율이 이만큼 늘어나면 어휘 drift로 보고 재학습
+    drift_threshold: float = 0.1
+    # False면 drift 검사 없이 저장된 벡터라이저로 transform (배치 실행에서 첫 배치만 검사해 실행 중 열 공간이 바뀌지 않도록)
+    check_drift: bool = True
+    tfidf_version = None
+
+    # chunked 모드에서 벡터화할 텍스트 컬럼과 저장할 컬럼 (None이면 전체 컬럼)
+    text_column: str = "content"
+    output_columns: Optional[List[str]] = None
+    # HashingVectorizer 특징 수 (어휘를 저장하지 않으므로 chunk마다 같은 열 공간을 씀)
+    hashing_features: int = 2 ** 18
+
+    # 단계별 결과 캐시 디렉터리 (None이면 캐시하지 않음)
+    cache_dir: Optional[str] = None
+    # 캐시 키에 단계 코드 해시가 들어가므로, 코드 밖 변경(데이터 파일/라이브러리 등)으로 결과가 바뀔 때 올려서 이전 캐시를 무효화
+    pipeline_version: int = 1
+    # 단계 캐시 최대 크기(MB) / 최대 보관 일수 (None이면 제한 없음), 넘으면 오래 쓰지 않은 항목부터 삭제
+    cache_max_mb: Optional[float] = 2048
+    cache_max_age_days: Optional[float] = 7
+    # 단계별 tracemalloc 최대 메모리 측정 여부 (할당 추적으로 수 배 느려지므로 필요할 때만 켬)
+    trace_memory: bool = False
+
+    # 전처리 마지막 단계의 중복 탐지 설정 (None이면 중복 제거/dup_cluster_id 생략)
+    deduper: Optional[MinHashDeduper] = MinHashDeduper()
+    # 중복 비교에 쓸 본문 컬럼 (불용어 제거 전 텍스트 기준)
+    dedupe_column: str = "content"
+
     def __init__(self, input_path: str, output_dir: str):
         self.input_path = input_path
         self.output_dir = output_dir
-    
+        # 전처리/FE 결과는 항상 self.df 하나에 담김
+        self.df: Optional[pd.DataFrame] = None
+        # 실행한 단계별 측정 기록 (wall/cpu 시간, 행 수, 최대 메모리)
+        self.stage_log: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, output_dir: str, **options) -> "BaseDataProcessor":
+        """CSV 대신 이미 읽어 둔 데이터프레임(예: 몽고DB 배치)으로 프로세서 생성"""
+        processor = cls("", output_dir)
+        processor.df = df
+        for name, value in options.items():
+            setattr(processor, name, value)
+        return processor
+
     @abstractmethod
-    def preprocess(self):
-        pass
-    
+    def preprocess_stages(self) -> List[Stage]:
+        """결측치/이상치/텍스트 정제 단계 (하위 클래스에서 구현)"""
+        raise NotImplementedError
+
     @abstractmethod
+    def feature_stages(self) -> List[Stage]:
+        """파생 변수/벡터화 단계 (하위 클래스에서 구현)"""
+        raise NotImplementedError
+
+    def dedupe_stages(self) -> List[Stage]:
+        """완전 중복 제거 + MinHash/LSH 유사 중복 클러스터링 (모든 사이트 공통)"""
+        if self.deduper is None:
+            return []
+        return [Stage("dedupe", self._dedupe, {"column": self.dedupe_column, **self.deduper.params()})]
+
+    def _dedupe(self, df: pd.DataFrame) -> pd.DataFrame:
+        return dedupe_reviews(df, self.dedupe_column, self.deduper)
+
+    def dedupe_index(self) -> Optional[DedupeIndex]:
+        """배치/실행 간 중복 확인용 사이트 색인 ({output_dir}/dedupe_{site}/, 중복 탐지를 끄면 None)"""
+        if self.deduper is None:
+            return None
+        return DedupeIndex(os.path.join(self.output_dir, f"dedupe_{self.site_name}"), self.deduper)
+
+    def run_stages(self, stages: List[Stage]) -> pd.DataFrame:
+        """단계를 실행하며 self.df를 갱신 (cache_dir가 있으면 입력이 같은 단계는 캐시를 사용)"""
+        pipeline = Pipeline(stages, cache_dir=self.cache_dir,
+                            namespace=f"{self.site_name}-v{self.pipeline_version}",
+                            trace_memory=self.trace_memory,
+                            cache_max_bytes=None if self.cache_max_mb is None else int(self.cache_max_mb * 1024 ** 2),
+                            cache_max_age_sec=None if self.cache_max_age_days is None else self.cache_max_age_days * 86400)
+        try:
+            for frame in pipeline.iter_run(self.df):
+                self.df = frame
+        finally:
+            self.stage_log.extend(pipeline.log)
+        return self.df
+
+    def preprocess(self):
+        """CSV(또는 주입된 데이터프레임)를 읽고 전처리 단계 실행"""
+        if self.df is None:
+            self.df = pd.read_csv(self.input_path)
+        self.run_stages(self.preprocess_stages() + self.dedupe_stages())
+
     def feature_engineering(self):
-        pass
+        self.run_stages(self.feature_stages())
 
     @abstractmethod
     def save_to_database(self):
-        
+
         pass
+
+    def output_path(self) -> str:
+        """preprocessed_reviews_{site}.{parquet|arrow|csv}"""
+        extension = OUTPUT_FORMATS[check_format(self.output_format)]
+        return os.path.join(self.output_dir, f"preprocessed_reviews_{self.site_name}{extension}")
+
+    def write_output(self, frame: pd.DataFrame) -> str:
+        """전처리 결과를 output_format으로 저장하고 경로를 반환"""
+        return write_frame(frame, self.output_path(), self.output_format)
+
+    def select_output_columns(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """output_columns 순서로 선택 (dup_cluster_id는 중복 탐지를 실행했을 때만 붙임, None이면 전체 컬럼)"""
+        if not self.output_columns:
+            return frame
+        columns = list(self.output_columns)
+        if self.deduper is not None and "dup_cluster_id" not in columns:
+            columns.append("dup_cluster_id")
+        return frame[columns]
+
+    def make_vectorizer(self):
+        """사이트별 TF-IDF 벡터라이저 설정 (하위 클래스에서 구현)"""
+        raise NotImplementedError
+
+    def vectorize(self, texts: pd.Series):
+        """
+        TF-IDF 벡터화
+        - 저장된 벡터라이저가 있으면 기존 어휘로 transform만 수행
+        - refit=True 이거나 어휘 drift가 drift_threshold를 넘으면 다시 학습해 새 버전으로 저장 (check_drift=False면 drift 검사 생략)
+        """
+        store = VectorizerStore(self.output_dir, self.site_name)
+        vectorizer, meta = (None, None) if self.refit else store.load()
+
+        if vectorizer is not None:
+            drift = oov_rate(vectorizer, texts) - meta["baseline_oov_rate"] if self.check_drift else 0.0
+            if drift <= self.drift_threshold:
+                self.tfidf_vectorizer, self.tfidf_version = vectorizer, meta["version"]
+                return vectorizer.transform(texts)
+            logger.warning(f"어휘 drift {drift:.3f} > {self.drift_threshold} → TF-IDF 재학습")
+
+        vectorizer = self.make_vectorizer()
+        matrix = vectorizer.fit_transform(texts)
+        meta = store.save(vectorizer, texts)
+        self.tfidf_vectorizer, self.tfidf_version = vectorizer, meta["version"]
+        return matrix
+
+    def make_hashing_vectorizer(self) -> HashingVectorizer:
+        """make_vectorizer와 같은 토큰화 설정(불용어, n-gram)을 쓰는 stateless HashingVectorizer"""
+        params = self.make_vectorizer().get_params()
+        analyzer = {key: params[key] for key in ("lowercase", "stop_words", "ngram_range", "token_pattern")}
+        return HashingVectorizer(n_features=self.hashing_features, alternate_sign=False, norm=None, **analyzer)
+
+    def process_in_chunks(self, chunk_size: int, idf: bool = False) -> Dict[str, Any]:
+        """
+        대용량 CSV를 chunk_size 행씩 읽어 chunk마다 전처리 → 파생 변수 → 저장 (전체를 메모리에 올리지 않음)
+        - 결과: preprocessed_reviews_{site}/part-NNNNN.*, tfidf_{site}/part-NNNNN.npz
+        - 텍스트 특징은 HashingVectorizer로 계산 (TfidfVectorizer처럼 전체 코퍼스로 학습할 필요 없음)
+        - idf=False: L2 정규화한 단어 빈도
+        - idf=True : chunk마다 문서 빈도를 누적한 뒤 두 번째 패스에서 저장된 part를 TF-IDF로 변환
+        - 앞 chunk에서 저장한 리뷰와의 완전 중복은 dedupe_index로 제외 (유사 중복은 이전 dup_cluster_id로 묶음)
+        """
+        extension = OUTPUT_FORMATS[check_format(self.output_format)]
+        output_path = os.path.join(self.output_dir, f"preprocessed_reviews_{self.site_name}")
+        tfidf_dir = os.path.join(self.output_dir, f"tfidf_{self.site_name}")
+        for path in (output_path, tfidf_dir):
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path)
+
+        index = self.dedupe_index()
+        if index is not None:
+            index.reset()
+
+        hasher = self.make_hashing_vectorizer()
+        doc_freq = np.zeros(self.hashing_features, dtype=np.int64)
+        rows_in = rows_out = parts = 0
+        self.tfidf_version = None
+
+        for chunk in pd.read_csv(self.input_path, chunksize=chunk_size):
+            rows_in += len(chunk)
+            self.df = chunk
+            self.preprocess()
+
+            frame = add_text_features(self.df)
+            if index is not None:
+                frame, _ = index.apply(frame, self.dedupe_column)
+            frame = self.select_output_columns(frame)
+            if frame.empty:
+                continue
+
+            counts = hasher.transform(frame[self.text_column])
+            doc_freq += np.bincount(counts.indices, minlength=self.hashing_features)
+
+            write_frame(frame, os.path.join(output_path, f"part-{parts:05d}{extension}"), self.output_format)
+            self.save_tfidf(counts if idf else normalize(counts), [], self.tfidf_row_ids(frame),
+                            base_path=os.path.join(tfidf_dir, f"part-{parts:05d}"))
+            if index is not None:
+                index.save()
+            rows_out += len(frame)
+            parts += 1
+
+        if idf and parts:
+            # sklearn TfidfTransformer(smooth_idf=True)와 같은 식
+            idf_weights = np.log((1 + rows_out) / (1 + doc_freq)) + 1
+            np.save(os.path.join(tfidf_dir, "idf.npy"), idf_weights.astype(np.float32))
+            for part in range(parts):
+                npz_path = os.path.join(tfidf_dir, f"part-{part:05d}.npz")
+                weighted = normalize(sp.load_npz(npz_path).multiply(idf_weights).tocsr())
+                sp.save_npz(npz_path, weighted.astype(np.float32), compressed=True)
+
+        logger.info(f"--- {self.site_name} chunk 처리 완료: {parts}개 part, {rows_in} -> {rows_out}행 ---")
+        return {
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "parts": parts,
+            "output_path": output_path,
+            "tfidf_dir": tfidf_dir,
+            "idf": idf,
+        }
+
+    @staticmethod
+    def tfidf_row_ids(frame: pd.DataFrame) -> List[Any]:
+        """TF-IDF 행렬의 각 행에 대응하는 리뷰 id (몽고DB id가 있으면 사용, 없으면 원본 CSV 행 번호)"""
+        if "original_id" in frame.columns:
+            return frame["original_id"].astype(str).tolist()
+        if "_id" in frame.columns:
+            return frame["_id"].astype(str).tolist()
+        return frame.index.tolist()
+
+    def save_tfidf(self, tfidf_matrix, feature_names: Sequence[str], row_ids: Sequence[Any],
+                   base_path: Optional[str] = None) -> str:
+        """
+        TF-IDF 행렬을 dense 컬럼 대신 CSR(.npz)로 저장
+        - tfidf_reviews_{site}.npz : float32 CSR 행렬 (행 순서 = 리뷰 테이블 행 순서)
+        - tfidf_reviews_{site}.json: 어휘(컬럼 순서), row id, 벡터라이저 버전 sidecar
+        """
+        matrix = sp.csr_matrix(tfidf_matrix, dtype=np.float32)
+        if matrix.shape[0] != len(row_ids):
+            raise ValueError(f"row_ids ({len(row_ids)}) do not match TF-IDF rows ({matrix.shape[0]})")
+
+        if base_path is None:
+            base_path = os.path.join(self.output_dir, f"tfidf_reviews_{self.site_name}")
+        os.makedirs(os.path.dirname(base_path) or ".", exist_ok=True)
+        sp.save_npz(base_path + ".npz", matrix, compressed=True)
+
+        sidecar = {
+            "shape": list(matrix.shape),
+            "nnz": int(matrix.nnz),
+            "vectorizer_version": self.tfidf_version,
+            "vocabulary": [str(name) for name in feature_names],
+            "row_ids": list(row_ids),
+        }
+        with open(base_path + ".json", "w", encoding="utf-8") as f:
+            json.dump(sidecar, f, ensure_ascii=False, default=str)
+        return base_path + ".npz"
+
+    @staticmethod
+    def load_tfidf(output_dir: str, site_name: str) -> Tuple[sp.csr_matrix, List[str], List[Any]]:
+        """save_tfidf로 저장한 (CSR 행렬, 어휘, row id)를 읽어옴"""
+        base_path = os.path.join(output_dir, f"tfidf_reviews_{site_name}")
+        matrix = sp.load_npz(base_path + ".npz").tocsr()
+        with open(base_path + ".json", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        return matrix, sidecar["vocabulary"], sidecar["row_ids"]
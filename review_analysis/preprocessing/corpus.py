@@ -0,0 +1,159 @@
+import logging
+import os
+import shutil
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+
+from review_analysis.preprocessing.dates import DATE_FORMAT
+from review_analysis.preprocessing.dedupe import MinHashDeduper, dedupe_reviews
+from review_analysis.preprocessing.features import add_text_features
+from review_analysis.preprocessing.output_format import OUTPUT_FORMATS, frame_parts, read_frame
+
+logger = logging.getLogger(__name__)
+
+# 모든 사이트 전처리 결과를 맞추는 공통 스키마 (site, year_month는 파티션 디렉터리로 저장)
+CORPUS_SCHEMA = pa.schema([
+    ("review_id", pa.string()),
+    ("date", pa.date32()),
+    ("rating", pa.float32()),
+    ("content", pa.string()),
+    # 불용어 제거 등 사이트별 정제 텍스트 (없는 사이트는 null)
+    ("content_cleaned", pa.string()),
+    ("content_length", pa.uint32()),
+    ("sentence_count", pa.uint16()),
+    ("token_count", pa.uint32()),
+    # 사이트를 합친 뒤 다시 계산한 중복 클러스터 (대표 리뷰의 review_id)
+    ("dup_cluster_id", pa.string()),
+    ("site", pa.string()),
+    ("year_month", pa.string()),
+])
+PARTITION_COLUMNS = ["site", "year_month"]
+PARTITIONING = ds.partitioning(pa.schema([("site", pa.string()), ("year_month", pa.string())]), flavor="hive")
+
+DateLike = Union[str, date, pd.Timestamp]
+
+
+def find_site_output(output_dir: str, site_name: str) -> Optional[str]:
+    """
+    사이트 전처리 결과 경로 (chunked/API part 디렉터리, parquet / arrow / csv 단일 파일 중 가장 최근에 쓴 것)
+    이전 실행이 남긴 다른 형식의 결과가 새 결과를 가리지 않도록 수정 시각으로 고름 (디렉터리는 가장 최근 part 기준)
+    """
+    base_path = os.path.join(output_dir, f"preprocessed_reviews_{site_name}")
+    written: Dict[str, float] = {}
+    parts = frame_parts(base_path) if os.path.isdir(base_path) else []
+    if parts:
+        written[base_path] = max(os.path.getmtime(part) for part in parts)
+    for extension in OUTPUT_FORMATS.values():
+        if os.path.exists(base_path + extension):
+            written[base_path + extension] = os.path.getmtime(base_path + extension)
+    return max(written, key=written.__getitem__) if written else None
+
+
+def normalize_site_frame(df: pd.DataFrame, site_name: str) -> pd.DataFrame:
+    """
+    사이트별 전처리 결과를 CORPUS_SCHEMA 컬럼으로 변환
+    - rating: 숫자 별점 컬럼(rating_numeric)이 있으면 우선 사용
+    - review_id: "{site}:{몽고DB id 또는 결과 파일 행 번호}"
+    - 텍스트 특징이 없는 예전 결과는 다시 계산, tfidf_* 같은 사이트 전용 컬럼은 버림
+    """
+    df = df.reset_index(drop=True)
+    if not {"content_length", "sentence_count", "token_count"} <= set(df.columns):
+        df = add_text_features(df.copy())
+
+    ids = df["original_id"].astype(str) if "original_id" in df.columns else df.index.astype(str)
+    rating = df["rating_numeric"] if "rating_numeric" in df.columns else df["rating"]
+    dates = pd.to_datetime(df["date"].astype("string"), format=DATE_FORMAT, errors="coerce")
+    return pd.DataFrame({
+        "review_id": site_name + ":" + pd.Series(ids, index=df.index),
+        "date": dates.dt.date,
+        "rating": pd.to_numeric(rating, errors="coerce"),
+        "content": df["content"],
+        "content_cleaned": df["content_cleaned"] if "content_cleaned" in df.columns else None,
+        "content_length": df["content_length"],
+        "sentence_count": df["sentence_count"],
+        "token_count": df["token_count"],
+        "site": site_name,
+        "year_month": dates.dt.strftime("%Y-%m"),
+    })
+
+
+def build_corpus(output_dir: str, corpus_dir: str, site_names: Iterable[str],
+                 deduper: Optional[MinHashDeduper] = None) -> Dict[str, Any]:
+    """
+    사이트별 전처리 결과를 하나의 스키마로 합쳐 site/year_month 파티션 parquet 데이터셋으로 저장
+    - {corpus_dir}/site=imdb/year_month=2025-01/part-0.parquet (hive 파티션)
+    - 사이트를 합친 뒤 중복 탐지를 다시 실행해 사이트 간 중복도 같은 dup_cluster_id로 묶음 (행은 모두 유지)
+    - 읽을 때는 read_corpus로 필요한 사이트/기간 디렉터리만 읽음
+    """
+    frames, rows = [], {}
+    for site_name in site_names:
+        path = find_site_output(output_dir, site_name)
+        if path is None:
+            logger.warning(f"{site_name} 전처리 결과가 없어 corpus에서 제외: {output_dir}")
+            continue
+        frame = normalize_site_frame(read_frame(path), site_name)
+        rows[site_name] = len(frame)
+        frames.append(frame)
+    if not frames:
+        raise ValueError(f"No preprocessed outputs found in {output_dir}")
+
+    corpus = pd.concat(frames, ignore_index=True)
+    corpus = dedupe_reviews(corpus.set_index("review_id", drop=False), "content", deduper, drop_exact=False)
+    table = pa.Table.from_pandas(corpus[CORPUS_SCHEMA.names], schema=CORPUS_SCHEMA, preserve_index=False)
+
+    # 예전 corpus의 파티션이 남지 않도록 통째로 다시 씀
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    ds.write_dataset(table, corpus_dir, format="parquet", partitioning=PARTITIONING,
+                     basename_template="part-{i}.parquet",
+                     file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"))
+
+    cross_site = corpus.groupby("dup_cluster_id")["site"].nunique()
+    logger.info(f"--- corpus 저장 완료: {len(corpus)}행, 사이트 간 중복 클러스터 {int((cross_site > 1).sum())}개 ---")
+    return {
+        "corpus_dir": corpus_dir,
+        "rows": len(corpus),
+        "rows_per_site": rows,
+        "partitions": len(corpus.groupby(PARTITION_COLUMNS, dropna=False)),
+        "cross_site_clusters": int((cross_site > 1).sum()),
+    }
+
+
+def corpus_dataset(corpus_dir: str) -> ds.Dataset:
+    return ds.dataset(corpus_dir, format="parquet", partitioning=PARTITIONING)
+
+
+def corpus_filter(site_names: Optional[Iterable[str]] = None, start: Optional[DateLike] = None,
+                  end: Optional[DateLike] = None) -> Optional[ds.Expression]:
+    """
+    사이트/기간 조건 (start, end 포함)
+    site와 year_month는 파티션 디렉터리라 조건에 맞지 않는 파일은 열지 않고,
+    date는 parquet row group 통계로 걸러짐
+    """
+    conditions = []
+    if site_names is not None:
+        conditions.append(ds.field("site").isin(list(site_names)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field("year_month") >= start.strftime("%Y-%m"))
+        conditions.append(ds.field("date") >= start.date())
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field("year_month") <= end.strftime("%Y-%m"))
+        conditions.append(ds.field("date") <= end.date())
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def read_corpus(corpus_dir: str, site_names: Optional[Iterable[str]] = None, start: Optional[DateLike] = None,
+                end: Optional[DateLike] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """필요한 사이트/기간/컬럼만 읽어 데이터프레임으로 반환"""
+    table = corpus_dataset(corpus_dir).to_table(columns=columns, filter=corpus_filter(site_names, start, end))
+    return table.to_pandas()
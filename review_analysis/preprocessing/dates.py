@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Optional, Union
+
+import pandas as pd
+
+# 상대 날짜("5d", "Jan 21")를 계산할 기준일 (크롤링 시점)
+REFERENCE_DATE = pd.Timestamp(2025, 1, 21)
+DATE_FORMAT = "%Y.%m.%d"
+
+# 형식 분류 정규식 (전체 일치) → 형식별로 한 번에 pd.to_datetime
+HOURS_AGO = r"(\d+) ?h"
+DAYS_AGO = r"(\d+) ?d"
+MONTH_DAY = r"([A-Za-z]{3} \d{1,2})"
+ABSOLUTE_FORMATS = (
+    (r"(\d{4}\.\d{1,2}\.\d{1,2})", "%Y.%m.%d"),           # 2025.01.21
+    (r"(\d{4}-\d{1,2}-\d{1,2})(?:T.*)?", "%Y-%m-%d"),     # 2025-01-21, 2025-01-21T10:00:00Z
+    (r"([A-Za-z]{3} \d{1,2}, \d{4})", "%b %d, %Y"),      # Jan 21, 2025
+)
+
+DateLike = Union[str, datetime, pd.Timestamp]
+
+
+def _extract(text: pd.Series, pattern: str) -> pd.Series:
+    return text.str.extract(f"^{pattern}$", expand=False)
+
+
+def normalize_dates(values: pd.Series, reference_date: DateLike = REFERENCE_DATE, parse_hours: bool = False,
+                    min_date: Optional[DateLike] = None, max_date: Optional[DateLike] = None) -> pd.Series:
+    """
+    여러 형식이 섞인 날짜 문자열을 datetime64 Series로 변환 (해석할 수 없으면 NaT)
+    - "5d" / "9h"      : reference_date 기준 상대 시간 (parse_hours=False면 "h"는 NaT)
+    - "Jan 21"         : reference_date의 연도, 기준일보다 미래면 전년도
+    - 2025.01.21 / 2025-01-21 / Jan 21, 2025
+    - min_date / max_date 범위를 벗어나면 NaT
+    """
+    reference = pd.Timestamp(reference_date)
+    text = (values.astype("string").str.strip()
+            .str.replace(r"[\"']", "", regex=True)
+            .str.replace(r"\s+", " ", regex=True))
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    for pattern, unit, enabled in ((DAYS_AGO, "D", True), (HOURS_AGO, "h", parse_hours)):
+        amount = _extract(text, pattern).dropna()
+        if enabled and len(amount):
+            parsed[amount.index] = reference - pd.to_timedelta(amount.astype("int64"), unit=unit)
+
+    month_day = _extract(text, MONTH_DAY).dropna()
+    if len(month_day):
+        dates = pd.to_datetime(f"{reference.year} " + month_day, format="%Y %b %d", errors="coerce")
+        future = dates > reference.normalize()
+        dates[future] = dates[future] - pd.DateOffset(years=1)
+        parsed[dates.index] = dates
+
+    for pattern, date_format in ABSOLUTE_FORMATS:
+        matched = _extract(text, pattern).dropna()
+        if len(matched):
+            parsed[matched.index] = pd.to_datetime(matched, format=date_format, errors="coerce")
+
+    return _clip(parsed, min_date, max_date)
+
+
+def parse_dates(values: pd.Series, date_format: str = DATE_FORMAT,
+                min_date: Optional[DateLike] = None, max_date: Optional[DateLike] = None) -> pd.Series:
+    """
+    한 가지 형식만 허용하는 날짜 변환 (상대 날짜를 해석하지 않으므로 기준일이 필요 없음)
+    형식이 다르거나 min_date / max_date 범위를 벗어나면 NaT
+    """
+    parsed = pd.to_datetime(values.astype("string").str.strip(), format=date_format, errors="coerce")
+    return _clip(parsed, min_date, max_date)
+
+
+def _clip(parsed: pd.Series, min_date: Optional[DateLike], max_date: Optional[DateLike]) -> pd.Series:
+    if min_date is not None:
+        parsed = parsed.where(parsed >= pd.Timestamp(min_date))
+    if max_date is not None:
+        parsed = parsed.where(parsed <= pd.Timestamp(max_date))
+    return parsed
+
+
+def format_dates(parsed: pd.Series, missing=None) -> pd.Series:
+    """datetime64 Series를 YYYY.MM.DD 문자열로 (NaT는 missing 값 또는 같은 위치의 Series 값)"""
+    return parsed.dt.strftime(DATE_FORMAT).astype(object).where(parsed.notna(), missing)
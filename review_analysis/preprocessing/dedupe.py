@@ -0,0 +1,317 @@
+import glob
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.feature_extraction.text import HashingVectorizer  # type: ignore
+
+from review_analysis.preprocessing.text_cleaning import WHITESPACE
+
+# (a * x + b) mod p 해시 순열: a, b < 2^32, x < 2^30 이므로 uint64에서 넘치지 않음
+_PRIME = np.uint64(4294967311)
+_EMPTY = np.iinfo(np.uint64).max
+_SHINGLE_SPACE = 2 ** 30
+
+
+def _star_edges(keys: np.ndarray, members: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """같은 key를 가진 행을 그룹의 첫 행과 연결하는 간선 (그룹 안에서 모든 쌍을 만들지 않음)"""
+    order = members[np.argsort(keys[members], kind="stable")]
+    sorted_keys = keys[order]
+    is_start = np.ones(len(order), dtype=bool)
+    is_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    first = np.maximum.accumulate(np.where(is_start, np.arange(len(order)), 0))
+    return order[first][~is_start], order[~is_start]
+
+
+class MinHashDeduper:
+    """
+    리뷰 중복 탐지
+    - 완전 중복: 소문자/공백 정규화한 본문의 해시가 같은 리뷰
+    - 유사 중복: 단어 shingle의 MinHash 서명을 LSH band로 나눠 같은 bucket에 들어온 후보만
+      추정 Jaccard 유사도로 검증 (전체 쌍 비교 없이 문서 수에 거의 선형)
+    - 중복 관계는 connected components로 묶어 클러스터 대표(가장 앞 행)를 기준으로 id 부여
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 0, batch_rows: int = 2000):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.batch_rows = batch_rows
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._band_coeffs = rng.randint(1, 2 ** 63, size=num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self._shingler = HashingVectorizer(analyzer="word", ngram_range=(shingle_size, shingle_size),
+                                           token_pattern=r"(?u)\b\w+\b", n_features=_SHINGLE_SPACE,
+                                           alternate_sign=False, norm=None, binary=True)
+
+    def params(self) -> Dict[str, Any]:
+        """결과에 영향을 주는 설정 (단계 캐시 키용)"""
+        return {"threshold": self.threshold, "num_perm": self.num_perm, "bands": self.bands,
+                "shingle_size": self.shingle_size, "seed": self.seed}
+
+    @staticmethod
+    def normalize(texts: pd.Series) -> pd.Series:
+        return (texts.astype("string[pyarrow]").fillna("").str.lower()
+                .str.replace(f"[{WHITESPACE}]+", " ", regex=True).str.strip())
+
+    def signatures(self, texts: pd.Series) -> np.ndarray:
+        """(num_perm, 문서 수) MinHash 서명. shingle이 없는 짧은 문서는 _EMPTY"""
+        signatures = np.full((self.num_perm, len(texts)), _EMPTY, dtype=np.uint64)
+        for start in range(0, len(texts), self.batch_rows):
+            shingles = self._shingler.transform(texts.iloc[start:start + self.batch_rows])
+            lengths = np.diff(shingles.indptr)
+            rows = np.flatnonzero(lengths) + start
+            if not len(rows):
+                continue
+            indices = shingles.indices.astype(np.uint64)
+            offsets = shingles.indptr[:-1][lengths > 0]
+            # 순열 16개씩 계산해 (순열 수 x shingle 수) 임시 배열 크기를 제한
+            for p in range(0, self.num_perm, 16):
+                hashed = (self._a[p:p + 16, None] * indices[None, :] + self._b[p:p + 16, None]) % _PRIME
+                signatures[p:p + 16, rows] = np.minimum.reduceat(hashed, offsets, axis=1)
+        return signatures
+
+    def sketch(self, texts: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """(정규화한 본문의 해시, MinHash 서명) — 배치 안 클러스터링과 DedupeIndex 조회에 같이 사용"""
+        normalized = self.normalize(texts)
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy(), self.signatures(normalized)
+
+    def band_keys(self, signatures: np.ndarray, band: int) -> np.ndarray:
+        """LSH band 하나의 bucket key"""
+        rows_per_band = self.num_perm // self.bands
+        block = signatures[band * rows_per_band:(band + 1) * rows_per_band]
+        return (block * self._band_coeffs[:, None]).sum(axis=0)
+
+    def cluster(self, texts: pd.Series,
+                sketch: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (각 행의 클러스터 대표 위치, 완전 중복 여부) 반환
+        완전 중복 여부는 같은 본문이 앞에 이미 있는 행만 True (첫 행은 유지)
+        """
+        n = len(texts)
+        everyone = np.arange(n)
+
+        content_hash, all_signatures = sketch if sketch is not None else self.sketch(texts)
+        sources, targets = [], []
+        exact_src, exact_dst = _star_edges(content_hash, everyone)
+        sources.append(exact_src)
+        targets.append(exact_dst)
+        exact_duplicate = np.zeros(n, dtype=bool)
+        exact_duplicate[exact_dst] = True
+
+        # 완전 중복은 이미 연결됐으므로 대표 행만 MinHash/LSH로 비교
+        unique_rows = np.flatnonzero(~exact_duplicate)
+        signatures = all_signatures[:, unique_rows]
+        has_shingles = signatures[0] != _EMPTY
+        candidates = np.flatnonzero(has_shingles)
+        for band in range(self.bands):
+            src, dst = _star_edges(self.band_keys(signatures, band), candidates)
+            if not len(src):
+                continue
+            # bucket 충돌/우연한 band 일치는 서명 일치 비율(추정 Jaccard)로 걸러냄
+            similar = (signatures[:, src] == signatures[:, dst]).mean(axis=0) >= self.threshold
+            sources.append(unique_rows[src[similar]])
+            targets.append(unique_rows[dst[similar]])
+
+        src, dst = np.concatenate(sources), np.concatenate(targets)
+        graph = coo_matrix((np.ones(len(src), dtype=np.int8), (src, dst)), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        representative = np.full(labels.max() + 1 if n else 0, n, dtype=np.int64)
+        np.minimum.at(representative, labels, everyone)
+        return representative[labels], exact_duplicate
+
+
+class _SortedRun:
+    """
+    DedupeIndex의 메모리 내 정렬 run: 행 순서의 id + 키(본문 해시, band key)별 정렬 순서
+    (키마다 id를 복사하지 않고 정렬 순서만 저장, 같은 키는 먼저 저장된 행이 앞)
+    """
+
+    def __init__(self, keys: np.ndarray, ids: np.ndarray):
+        self.keys = keys  # (1 + bands, 행 수): 0행은 본문 해시, 나머지는 band key
+        self.ids = ids
+        self.orders = np.argsort(keys, axis=1, kind="stable")
+        self.sorted = np.take_along_axis(keys, self.orders, axis=1)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, which: int, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(keys 각각이 이 run에 있는지, 있으면 먼저 저장된 행의 id)"""
+        ordered = self.sorted[which]
+        position = np.searchsorted(ordered, keys).clip(max=len(ordered) - 1)
+        return ordered[position] == keys, self.ids[self.orders[which][position]]
+
+
+class DedupeIndex:
+    """
+    사이트별로 지금까지 저장한 리뷰의 (본문 해시, LSH band key, dup_cluster_id) 색인 ({output_dir}/dedupe_{site}/)
+    - dedupe 단계는 배치/chunk 하나만 보므로, 이전 배치·실행에서 저장한 리뷰와의 중복은 이 색인으로 확인
+    - 완전 중복은 제외하고, 유사 중복은 남기되 이전 클러스터의 dup_cluster_id를 이어 받음
+    - 서명 전체(리뷰당 1KB) 대신 리뷰당 (1 + bands)개 uint64 키만 저장하므로 유사도는 검증하지 않고,
+      같은 클러스터와 band key가 min_band_matches개 이상 일치하면 유사 중복으로 봄
+      (band당 일치 확률이 Jaccard^(num_perm/bands)라 기본 설정에서 Jaccard 0.5 리뷰가 걸릴 확률은 약 0.2%)
+    - save()는 마지막 저장 이후 추가된 행만 shard-NNNNN.npz로 추가 기록 (기존 shard는 다시 쓰지 않음)
+    - 메모리에서는 정렬된 run 몇 개로 유지하고 비슷한 크기의 run끼리 병합하므로 배치당 조회 비용은 색인 크기의 로그 수준
+    - 중복 탐지 설정(MinHashDeduper.params)이 바뀌면 이전 색인은 버림
+    """
+
+    # 불러올 때 shard가 이보다 많으면 하나로 합쳐 다시 씀
+    max_shards: int = 64
+
+    def __init__(self, path: str, deduper: MinHashDeduper, min_band_matches: int = 2):
+        self.path = path
+        self.deduper = deduper
+        self.min_band_matches = min_band_matches
+        self._params = deduper.params()
+        self._runs: List[_SortedRun] = []
+        self._pending: List[_SortedRun] = []
+        self._valid = self._read_params() == self._params
+        if self._valid:
+            shards = self._shards()
+            keys, ids = [], []
+            for shard in shards:
+                with np.load(shard) as data:
+                    keys.append(data["keys"])
+                    ids.append(data["ids"].astype(object))
+            if shards:
+                self._append(_SortedRun(np.concatenate(keys, axis=1), np.concatenate(ids)))
+            if len(shards) > self.max_shards:
+                self._write_shard(self._runs[0], 0)
+                for shard in shards[1:]:
+                    os.remove(shard)
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    def _params_path(self) -> str:
+        return os.path.join(self.path, "params.json")
+
+    def _read_params(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self._params_path()):
+            return None
+        with open(self._params_path(), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _shards(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.path, "shard-*.npz")))
+
+    def _write_shard(self, run: _SortedRun, number: int) -> None:
+        tmp_path = os.path.join(self.path, f"shard-{number:05d}.tmp.npz")
+        np.savez(tmp_path, keys=run.keys, ids=np.array(run.ids.tolist()))
+        os.replace(tmp_path, os.path.join(self.path, f"shard-{number:05d}.npz"))
+
+    def _append(self, run: _SortedRun) -> None:
+        # 크기가 비슷한 run끼리 병합 (run 수는 색인 크기의 로그 수준, 병합 비용은 행마다 로그 번)
+        self._runs.append(run)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer, older = self._runs.pop(), self._runs.pop()
+            self._runs.append(_SortedRun(np.concatenate([older.keys, newer.keys], axis=1),
+                                         np.concatenate([older.ids, newer.ids])))
+
+    def reset(self) -> None:
+        """전체 재처리 시작 시 이전 색인 삭제"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.__init__(self.path, self.deduper, self.min_band_matches)
+
+    def _match_near(self, band_keys: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """rows 중 같은 클러스터와 band key가 min_band_matches개 이상 일치하는 행과 그 클러스터 id"""
+        pairs = []
+        for run in self._runs:
+            for band in range(self.deduper.bands):
+                hit, ids = run.lookup(band + 1, band_keys[band, rows])
+                pairs.append(pd.DataFrame({"row": rows[hit], "band": band, "id": ids[hit]}))
+        if not pairs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+        votes = (pd.concat(pairs, ignore_index=True).drop_duplicates()
+                 .groupby(["row", "id"], sort=False).size().reset_index(name="bands"))
+        votes = votes[votes["bands"] >= self.min_band_matches]
+        votes = votes.sort_values(["row", "bands"], ascending=[True, False], kind="stable").drop_duplicates("row")
+        return votes["row"].to_numpy(), votes["id"].to_numpy()
+
+    def apply(self, df: pd.DataFrame, text_column: str) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        dedupe_reviews를 거친 배치를 색인과 비교해 (남길 행, 남길 행 mask) 반환하고 남긴 행을 색인에 추가
+        (색인 파일은 배치가 저장된 뒤 save()로 기록)
+        """
+        if df.empty:
+            return df, np.ones(0, dtype=bool)
+        content_hash, signatures = self.deduper.sketch(df[text_column])
+        keys = np.vstack([content_hash[None, :]] +
+                         [self.deduper.band_keys(signatures, band)[None, :] for band in range(self.deduper.bands)])
+        earlier = np.full(len(df), None, dtype=object)
+        seen = np.zeros(len(df), dtype=bool)
+        for run in self._runs:
+            hit, ids = run.lookup(0, content_hash)
+            first_hit = hit & ~seen
+            earlier[first_hit] = ids[first_hit]
+            seen |= hit
+        rows, ids = self._match_near(keys[1:], np.flatnonzero(~seen & (signatures[0] != _EMPTY)))
+        earlier[rows] = ids
+
+        # 배치 안 클러스터 중 한 행이라도 이전 리뷰와 겹치면 클러스터 전체가 이전 id를 이어 받음
+        clusters = df["dup_cluster_id"].to_numpy()
+        inherited = pd.Series(earlier).groupby(clusters, sort=False).transform("first").to_numpy()
+        cluster_ids = np.where(pd.isna(inherited), clusters, inherited)
+        keep = ~seen
+
+        if keep.any():
+            run = _SortedRun(keys[:, keep], cluster_ids[keep].astype(object))
+            self._pending.append(run)
+            self._append(run)
+        return df.assign(dup_cluster_id=cluster_ids)[keep], keep
+
+    def save(self) -> None:
+        """마지막 저장 이후 추가된 행만 새 shard로 기록"""
+        os.makedirs(self.path, exist_ok=True)
+        if not self._valid:
+            # 설정이 바뀐 이전 색인은 버리고 새로 시작
+            for shard in self._shards():
+                os.remove(shard)
+            with open(self._params_path(), "w", encoding="utf-8") as f:
+                json.dump(self._params, f)
+            self._valid = True
+        if not self._pending:
+            return
+        pending = self._pending[0] if len(self._pending) == 1 else _SortedRun(
+            np.concatenate([run.keys for run in self._pending], axis=1),
+            np.concatenate([run.ids for run in self._pending]))
+        shards = self._shards()
+        number = int(os.path.basename(shards[-1])[len("shard-"):-len(".npz")]) + 1 if shards else 0
+        self._write_shard(pending, number)
+        self._pending = []
+
+
+def dedupe_reviews(df: pd.DataFrame, text_column: str = "content", deduper: Optional[MinHashDeduper] = None,
+                   drop_exact: bool = True) -> pd.DataFrame:
+    """
+    dup_cluster_id 컬럼 추가 (중복이 없는 리뷰는 자기 자신의 id)
+    - id는 클러스터 대표 행의 몽고DB _id / original_id, 없으면 인덱스 (여러 사이트를 합친 프레임에도 사용 가능)
+    - drop_exact=True면 완전 중복은 첫 행만 남김. 유사 중복은 남기고 같은 dup_cluster_id로 표시
+    """
+    deduper = deduper or MinHashDeduper()
+    if df.empty:
+        return df.assign(dup_cluster_id=pd.Series(dtype=object))
+
+    representative, exact_duplicate = deduper.cluster(df[text_column])
+    for id_column in ("original_id", "_id"):
+        if id_column in df.columns:
+            ids = df[id_column].astype(str).to_numpy()
+            break
+    else:
+        ids = df.index.to_numpy()
+
+    df = df.assign(dup_cluster_id=ids[representative])
+    return df[~exact_duplicate] if drop_exact else df
@@ -0,0 +1,101 @@
+"""
+EDA 그림 그리기 (프로세스 풀 작업 프로세스에서 실행)
+작업 프로세스가 pandas 없이 numpy/matplotlib만 import 하도록 데이터 준비(eda_report)와 분리
+"""
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+
+Payload = Dict[str, Any]
+
+
+def _time_axis(plt, dates: List[str]) -> None:
+    step = max(1, len(dates) // 10)
+    plt.xticks(range(0, len(dates), step), dates[::step], rotation=45)
+
+
+def _render_histogram(plt, data, xlabel, title, color, xticks=None):
+    edges = np.asarray(data["edges"])
+    plt.bar(edges[:-1], data["counts"], width=np.diff(edges), align="edge",
+            edgecolor="black", color=color, alpha=0.7)
+    plt.xlabel(xlabel)
+    plt.ylabel("Number of Reviews")
+    plt.title(title)
+    if xticks is not None:
+        plt.xticks(xticks)
+    if data["mean"] is not None:
+        plt.axvline(data["mean"], color="red", linestyle="--", label=f"Mean: {data['mean']:.1f}")
+        plt.legend()
+
+
+def _render_rating_histogram(plt, data):
+    _render_histogram(plt, data, "Rating", "Rating Distribution (Histogram)", "#3498db", range(1, 11))
+
+
+def _render_length_boxplot(plt, data):
+    if data["stats"] is not None:
+        # vert/orientation 인자는 matplotlib 버전마다 달라 기본(세로) 방향으로 그림
+        plt.gca().bxp([data["stats"]], patch_artist=True, boxprops={"facecolor": "#2ecc71"})
+        plt.xticks([])
+    plt.ylabel("Review Length (characters)")
+    plt.title("Review Length Distribution (Boxplot)")
+
+
+def _render_rating_piechart(plt, data):
+    if sum(data["counts"]):
+        plt.pie(data["counts"], labels=["High (8-10)", "Medium (5-7)", "Low (1-4)"], autopct="%1.1f%%",
+                colors=["#2ecc71", "#f39c12", "#e74c3c"], startangle=90)
+    plt.title("Rating Distribution (Pie Chart)")
+
+
+def _render_sentence_histogram(plt, data):
+    _render_histogram(plt, data, "Sentence Count", "Sentence Count Distribution (Histogram)", "#9b59b6")
+
+
+def _render_reviews_timeseries(plt, data):
+    plt.plot(range(len(data["values"])), data["values"], marker="o", color="#3498db", linewidth=2, markersize=4)
+    plt.xlabel("Date")
+    plt.ylabel("Number of Reviews")
+    plt.title("Reviews Over Time (Time Series)")
+    _time_axis(plt, data["dates"])
+
+
+def _render_rating_timeseries(plt, data):
+    plt.plot(range(len(data["values"])), data["values"], marker="s", color="#e74c3c", linewidth=2, markersize=4)
+    plt.xlabel("Date")
+    plt.ylabel("Average Rating")
+    plt.title("Average Rating Over Time (Time Series)")
+    plt.ylim(0, 10)
+    _time_axis(plt, data["dates"])
+
+
+# 그림 이름 → (그림 크기, 그리기 함수)
+RENDERERS: Dict[str, tuple] = {
+    "rating_histogram": ((10, 6), _render_rating_histogram),
+    "length_boxplot": ((10, 6), _render_length_boxplot),
+    "rating_piechart": ((8, 8), _render_rating_piechart),
+    "sentence_histogram": ((10, 6), _render_sentence_histogram),
+    "reviews_timeseries": ((12, 6), _render_reviews_timeseries),
+    "rating_timeseries": ((12, 6), _render_rating_timeseries),
+}
+
+
+def render_figure(name: str, data: Payload, path: str, dpi: int) -> str:
+    """그림 하나를 PNG로 저장 (프로세스 풀 작업 함수, 화면 없는 Agg backend 사용)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figsize, render = RENDERERS[name]
+    plt.figure(figsize=figsize)
+    try:
+        render(plt, data)
+        plt.tight_layout()
+        # 그리는 도중 실패해도 이전 그림이 깨지지 않도록 임시 파일에 저장한 뒤 교체
+        tmp_path = f"{path}.{os.getpid()}.tmp.png"
+        plt.savefig(tmp_path, dpi=dpi)
+        os.replace(tmp_path, path)
+    finally:
+        plt.close("all")
+    return path
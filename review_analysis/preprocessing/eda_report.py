@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from review_analysis.preprocessing.dates import DATE_FORMAT
+from review_analysis.preprocessing.eda_render import Payload, render_figure
+
+logger = logging.getLogger(__name__)
+
+# 그리는 코드가 바뀌면 올려서 기존 그림을 다시 그림
+RENDER_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# 시계열은 이 점 수 이하로 구간을 묶어서 그림
+MAX_POINTS = 500
+# 그림을 동시에 그릴 프로세스 수 (코어가 하나면 프로세스 시작 비용만 늘어나므로 직접 그림)
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+def _rating(df: pd.DataFrame) -> pd.Series:
+    column = "rating_numeric" if "rating_numeric" in df.columns else "rating"
+    return pd.to_numeric(df[column], errors="coerce").dropna()
+
+
+def _histogram(values: pd.Series, bins, value_range=None) -> Payload:
+    """행 전체 대신 구간별 개수만 넘김 (그림 크기와 무관하게 payload가 작음)"""
+    counts, edges = np.histogram(values.to_numpy(dtype=float), bins=bins, range=value_range)
+    return {"counts": counts.tolist(), "edges": edges.tolist(),
+            "mean": float(values.mean()) if len(values) else None}
+
+
+def _daily(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    날짜별 리뷰 수/별점 합계. 날짜가 max_points보다 많으면 연속한 날짜를 같은 크기 구간으로 묶음
+    (구간 평균 별점은 리뷰 수 가중 평균이 되도록 합계로 집계)
+    """
+    dates = pd.to_datetime(df["date"].astype("string"), format=DATE_FORMAT, errors="coerce")
+    frame = pd.DataFrame({"date": dates, "rating": pd.to_numeric(
+        df["rating_numeric" if "rating_numeric" in df.columns else "rating"], errors="coerce")}).dropna(subset=["date"])
+    daily = frame.groupby("date")["rating"].agg(["size", "sum", "count"]).sort_index()
+    if len(daily) > max_points:
+        bucket = np.arange(len(daily)) // int(np.ceil(len(daily) / max_points))
+        daily = daily.groupby(bucket).agg({"size": "sum", "sum": "sum", "count": "sum"}).set_index(
+            daily.index[np.unique(bucket, return_index=True)[1]])
+    return daily
+
+
+def _prepare_rating_histogram(df, max_points):
+    return _histogram(_rating(df), bins=10, value_range=(1, 11))
+
+
+def _prepare_length_boxplot(df, max_points):
+    # 박스플롯 통계(사분위, 수염)를 미리 계산하고 이상치는 최대 max_points개만 표시
+    lengths = pd.to_numeric(df["content_length"], errors="coerce").dropna()
+    if lengths.empty:
+        return {"stats": None}
+    q1, median, q3 = lengths.quantile([0.25, 0.5, 0.75]).tolist()
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = lengths[(lengths >= low) & (lengths <= high)]
+    fliers = lengths[(lengths < low) | (lengths > high)]
+    if len(fliers) > max_points:
+        fliers = fliers.sample(n=max_points, random_state=0)
+    return {"stats": {"q1": q1, "med": median, "q3": q3, "whislo": float(inside.min()),
+                      "whishi": float(inside.max()), "fliers": sorted(fliers.astype(float).tolist())}}
+
+
+def _prepare_rating_piechart(df, max_points):
+    rating = _rating(df)
+    return {"counts": [int((rating >= 8).sum()), int(((rating >= 5) & (rating < 8)).sum()), int((rating < 5).sum())]}
+
+
+def _prepare_sentence_histogram(df, max_points):
+    return _histogram(pd.to_numeric(df["sentence_count"], errors="coerce").dropna(), bins=20)
+
+
+def _prepare_reviews_timeseries(df, max_points):
+    daily = _daily(df, max_points)
+    return {"dates": daily.index.strftime(DATE_FORMAT).tolist(), "values": daily["size"].astype(int).tolist()}
+
+
+def _prepare_rating_timeseries(df, max_points):
+    daily = _daily(df, max_points)
+    daily = daily[daily["count"] > 0]
+    return {"dates": daily.index.strftime(DATE_FORMAT).tolist(),
+            "values": (daily["sum"] / daily["count"]).round(4).tolist()}
+
+
+# 그림 이름 → 데이터 준비 함수 (부모 프로세스에서 pandas로 작은 payload를 만들고, 그리기는 eda_render가 담당)
+FIGURES: Dict[str, Callable[[pd.DataFrame, int], Payload]] = {
+    "rating_histogram": _prepare_rating_histogram,
+    "length_boxplot": _prepare_length_boxplot,
+    "rating_piechart": _prepare_rating_piechart,
+    "sentence_histogram": _prepare_sentence_histogram,
+    "reviews_timeseries": _prepare_reviews_timeseries,
+    "rating_timeseries": _prepare_rating_timeseries,
+}
+
+
+def figure_fingerprint(name: str, data: Payload, dpi: int) -> str:
+    payload = json.dumps([RENDER_VERSION, name, dpi, data], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def load_manifest(report_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(report_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def make_render_pool(workers: int = DEFAULT_WORKERS) -> ProcessPoolExecutor:
+    """그림 작업 프로세스 풀 (spawn: 작업 프로세스는 eda_render의 numpy/matplotlib만 import)"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def build_report(df: pd.DataFrame, site_name: str, report_dir: str, workers: int = DEFAULT_WORKERS,
+                 dpi: int = 100, max_points: int = MAX_POINTS, force: bool = False,
+                 figures: Optional[List[str]] = None, executor: Optional[Executor] = None) -> Dict[str, Any]:
+    """
+    EDA 그림을 {report_dir}/{figure}.png 로 저장하고 manifest.json 을 갱신
+    - 그림마다 준비한 데이터의 fingerprint가 manifest와 같고 파일이 있으면 다시 그리지 않음
+    - 다시 그릴 그림이 여러 개면 프로세스 풀에서 동시에 그림
+      (executor를 넘기면 재사용, 없으면 workers > 1일 때만 이번 호출용 풀을 만듦)
+    - 히스토그램/파이/박스플롯은 집계값만, 시계열은 max_points개 이하 구간으로 묶어서 넘김
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    previous = (load_manifest(report_dir) or {}).get("figures", {})
+    names = figures or list(FIGURES)
+
+    stale: Dict[str, Payload] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        data = FIGURES[name](df, max_points)
+        fingerprint = figure_fingerprint(name, data, dpi)
+        path = os.path.join(report_dir, f"{name}.png")
+        cached = not force and previous.get(name, {}).get("fingerprint") == fingerprint and os.path.exists(path)
+        entries[name] = {"file": f"{name}.png", "fingerprint": fingerprint, "cached": cached,
+                         "rendered_at": previous[name]["rendered_at"] if cached else None}
+        if not cached:
+            stale[name] = data
+
+    began = time.perf_counter()
+    jobs = [(name, data, os.path.join(report_dir, f"{name}.png"), dpi) for name, data in stale.items()]
+    if executor is not None and len(jobs) > 1:
+        list(executor.map(render_figure, *zip(*jobs)))
+    elif workers > 1 and len(jobs) > 1:
+        with make_render_pool(min(workers, len(jobs))) as pool:
+            list(pool.map(render_figure, *zip(*jobs)))
+    else:
+        for job in jobs:
+            render_figure(*job)
+    rendered_at = time.time()
+    for name in stale:
+        entries[name]["rendered_at"] = rendered_at
+
+    manifest = {
+        "site_name": site_name,
+        "rows": len(df),
+        "dpi": dpi,
+        "generated_at": rendered_at,
+        "render_sec": round(time.perf_counter() - began, 3),
+        "rendered": len(stale),
+        "figures": {**previous, **entries},
+    }
+    tmp_path = os.path.join(report_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(report_dir, MANIFEST_NAME))
+    logger.info(f"--- {site_name} EDA 리포트: {len(stale)}개 그림 새로 그림, {len(names) - len(stale)}개 재사용 ---")
+    return manifest
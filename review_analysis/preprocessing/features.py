@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from review_analysis.preprocessing.output_format import COMPACT_INT_COLUMNS
+from review_analysis.preprocessing.text_cleaning import WHITESPACE
+
+# 문장 종결 부호(., !, ?) 사이에 공백이 아닌 문자가 하나라도 있는 구간 = 문장 하나
+# (re.split(r'[.!?]+') 후 빈 문장을 제외한 개수와 같음)
+SENTENCE_PATTERN = rf"[^.!?]*[^.!?{WHITESPACE}][^.!?]*"
+TOKEN_PATTERN = rf"[^{WHITESPACE}]+"
+
+
+def _compact(counts: pd.Series, column: str) -> pd.Series:
+    dtype = COMPACT_INT_COLUMNS[column]
+    return counts.fillna(0).clip(0, np.iinfo(dtype).max).astype(dtype)
+
+
+def add_text_features(df: pd.DataFrame, column: str = "content") -> pd.DataFrame:
+    """
+    모든 사이트 공통 파생 변수 (행 단위 apply 없이 문자열 배열 연산으로 계산)
+    - sentence_count: 문장 수 (uint16)
+    - content_length: 글자 수 (uint32)
+    - token_count   : 공백 기준 단어 수 (uint32)
+    """
+    texts = df[column].astype("string[pyarrow]")
+    df['sentence_count'] = _compact(texts.str.count(SENTENCE_PATTERN), 'sentence_count')
+    df['content_length'] = _compact(texts.str.len(), 'content_length')
+    df['token_count'] = _compact(texts.str.count(TOKEN_PATTERN), 'token_count')
+    return df
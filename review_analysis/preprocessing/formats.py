@@ -0,0 +1,12 @@
+# 지원하는 출력 형식과 확장자 (pandas/pyarrow 없이 import 가능해야 API 라우터가 가볍게 뜸)
+# - parquet: 기본값, zstd 압축 컬럼 포맷
+# - arrow  : 압축하지 않은 Arrow IPC 파일 (memory-map으로 zero-copy 읽기)
+# - csv    : 기존 utf-8-sig CSV (내보내기용)
+OUTPUT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+DEFAULT_OUTPUT_FORMAT = "parquet"
+
+
+def check_format(output_format: str) -> str:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format} (choices: {', '.join(OUTPUT_FORMATS)})")
+    return output_format
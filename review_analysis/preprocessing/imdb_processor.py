@@ -1,58 +1,80 @@
-import pandas as pd
+import logging
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re
+
+import pandas as pd
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from review_analysis.preprocessing.base_processor import BaseDataProcessor
+from review_analysis.preprocessing.features import add_text_features
+from review_analysis.preprocessing.pipeline import Stage
+from review_analysis.preprocessing.text_cleaning import TextCleaner
+
+logger = logging.getLogger(__name__)
+
+# 소문자 변환 + 영숫자/공백/문장부호(.?!) 외 문자 제거
+TEXT_CLEANER = TextCleaner(keep_chars="a-z0-9.?!", replacement="", collapse_whitespace=False)
 
 class ImdbDataProcessor(BaseDataProcessor):
+    site_name = "imdb"
+
     def __init__(self, input_path: str, output_path: str):
         super().__init__(input_path, output_path)
-        self.df = pd.read_csv(input_path)
+        self.tfidf_matrix = None
+        self.tfidf_vectorizer = None
 
-    def preprocess(self):
+    def preprocess_stages(self):
         '''
         1. 결측치 처리 (별점, 리뷰, 날짜)
         2. 이상치 처리 (별점 범위 외 제거)
         3. 텍스트 전처리 (특수문자 제거)
         '''
-        # 결측치 제거
-        self.df = self.df.dropna(subset=['rating', 'content', 'date'])
+        return [
+            Stage("missing_values", self._drop_missing),
+            Stage("outliers", self._drop_outliers, {"min_rating": 1, "min_length": 5}),
+            Stage("clean_text", self._clean_text, vars(TEXT_CLEANER)),
+        ]
 
-        # 이상치 처리
-        self.df = self.df[self.df['rating'] >= 1]  # 별점
-        self.df = self.df[self.df['content'].str.len() >= 5]  # 텍스트 길이
-        
-        # 텍스트 전처리
-        self.df['content'] = self.df['content'].str.lower().str.replace(r'[^a-z0-9\s.?!]', '', regex=True)        
-        print("Preprocessing & EDA Plots 완료")
+    def _drop_missing(self, df):
+        return df.dropna(subset=['rating', 'content', 'date'])
 
+    def _drop_outliers(self, df):
+        df = df[df['rating'] >= 1]  # 별점
+        return df[df['content'].str.len() >= 5]  # 텍스트 길이
 
-    def feature_engineering(self):
+    def _clean_text(self, df):
+        df['content'] = TEXT_CLEANER.clean(df['content'])
+        logger.info("Preprocessing & EDA Plots 완료")
+        return df
+
+
+    def feature_stages(self):
         '''
-        1. 파생 변수 생성 (문장 수)
+        1. 파생 변수 생성 (문장 수, 글자 수, 단어 수)
         2. 텍스트 벡터화 (TF-IDF)
         '''
+        return [
+            Stage("text_features", add_text_features),
+            Stage("tfidf", self._vectorize_text, cache=False),
+        ]
+
+    def _vectorize_text(self, df):
+        # 텍스트 벡터화: TF-IDF (sparse 행렬 그대로 보관, save_to_database에서 .npz로 저장)
+        self.tfidf_matrix = self.vectorize(df['content'])
 
-        # 1. 파생변수 생성: 문장 수 
-        self.df['sentence_count'] = self.df['content'].apply(
-            lambda x: len([s for s in re.split(r'[.!?]+', str(x)) if s.strip()]) if pd.notnull(x) else 0
-        )
-        
-        # 2. 텍스트 벡터화: TF-IDF
-        tfidf = TfidfVectorizer(max_features=2000, stop_words='english')
-        tfidf_matrix = tfidf.fit_transform(self.df['content'])
-        
-        # 벡터화 결과 확인용 (선택 사항: 데이터프레임에 결합하거나 별도 저장)
-        print(f"FE 완료 (TF-IDF 특징 수: {len(tfidf.get_feature_names_out())})")        
+        logger.info(f"FE 완료 (TF-IDF 특징 수: {len(self.tfidf_vectorizer.get_feature_names_out())})")
+        return df
+
+
+    def make_vectorizer(self):
+        return TfidfVectorizer(max_features=2000, stop_words='english')
 
 
     def save_to_database(self):
-        '''최종 전처리 결과를 지정된 경로에 CSV로 저장'''
-        save_path = os.path.join(self.output_dir, "preprocessed_reviews_imdb.csv")
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        self.df.to_csv(save_path, index=False, encoding='utf-8-sig')
-        print(f"데이터 저장 완료: {save_path}")
+        '''최종 전처리 결과를 지정된 경로에 output_format(기본 Parquet)으로 저장'''
+        save_path = self.write_output(self.df)
+        logger.info(f"데이터 저장 완료: {save_path}")
+
+        if self.tfidf_matrix is not None:
+            tfidf_path = self.save_tfidf(self.tfidf_matrix, self.tfidf_vectorizer.get_feature_names_out(),
+                                         self.tfidf_row_ids(self.df))
+            logger.info(f"TF-IDF 저장 완료: {tfidf_path}")
@@ -3,6 +3,8 @@ import os
 import sys
 import glob
 
+import pandas as pd
+
 # 1. 원본 유지 및 경로 자동 추가 로직
 # main.py 파일의 위치를 기준으로 프로젝트 루트(YBIGTA... 폴더)를 찾습니다.
 current_dir = os.path.dirname(os.path.abspath(__file__)) # preprocessing 폴더
@@ -11,10 +13,21 @@ project_root = os.path.abspath(os.path.join(current_dir, "../../")) # 최상위
 if project_root not in sys.path:
     sys.path.insert(0, project_root) # 최우선 순위로 경로 추가
 
+import logging
+import multiprocessing
+import time
+import uuid
 from argparse import ArgumentParser
-from typing import Dict, Type
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Type
 from review_analysis.preprocessing.base_processor import BaseDataProcessor
+from review_analysis.preprocessing.corpus import build_corpus
 from review_analysis.preprocessing.imdb_processor import ImdbDataProcessor
+from review_analysis.preprocessing.letterboxd_processor import LetterboxdProcessor
+from review_analysis.preprocessing.rotten_processor import RottenProcessor
+from review_analysis.preprocessing.output_format import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS
+from review_analysis.preprocessing.profiling import RunStatsStore, summarize_stages
 
 
 
@@ -25,11 +38,121 @@ if project_root not in sys.path:
 # key는 "reviews_사이트이름"으로, value는 해당 처리를 위한 클래스
 PREPROCESS_CLASSES: Dict[str, Type[BaseDataProcessor]] = {
     "reviews_imdb": ImdbDataProcessor,
+    "reviews_letterboxd": LetterboxdProcessor,
+    "reviews_rotten": RottenProcessor,
     # key는 크롤링한 csv파일 이름으로 적어주세요! ex. reviews_naver.csv -> reviews_naver
 }
 
 REVIEW_COLLECTIONS = glob.glob(os.path.join(project_root, "database", "reviews_*.csv"))
 
+
+LOG_FORMAT = '%(asctime)s - %(processName)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(level: int) -> None:
+    """spawn으로 뜬 작업 프로세스는 부모의 로깅 설정을 물려받지 않으므로 풀 initializer로도 호출"""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 메모리 사용량(MB). resource 모듈이 없는 Windows에서는 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_preprocessor(name: str, csv_file: str, output_dir: str,
+                     output_format: str = DEFAULT_OUTPUT_FORMAT, refit: bool = False,
+                     chunk_size: Optional[int] = None, idf: bool = False,
+                     cache_dir: Optional[str] = None, trace_memory: bool = False) -> Dict:
+    """
+    사이트 하나의 전처리 → 피처 엔지니어링 → 저장을 실행하고 요약을 반환 (프로세스 풀에서 실행)
+    chunk_size를 지정하면 CSV를 나눠 읽는 chunked 모드(HashingVectorizer)로 실행
+    단계별 통계는 {output_dir}/stats/preprocess_stats_{site}.jsonl 에 추가 (API 통계와 같은 형식)
+    """
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    preprocessor = PREPROCESS_CLASSES[name](csv_file, output_dir)
+    preprocessor.trace_memory = trace_memory
+    preprocessor.refit = refit
+    preprocessor.output_format = output_format
+    preprocessor.cache_dir = cache_dir
+
+    if chunk_size:
+        summary = preprocessor.process_in_chunks(chunk_size, idf=idf)
+        rows_in, rows_out = summary["rows_in"], summary["rows_out"]
+    else:
+        preprocessor.df = pd.read_csv(csv_file)
+        rows_in = len(preprocessor.df)
+        preprocessor.preprocess()
+        preprocessor.feature_engineering()
+        preprocessor.save_to_database()
+        rows_out = len(preprocessor.df)
+
+    wall_sec = time.perf_counter() - start
+    RunStatsStore(os.path.join(output_dir, "stats")).append(preprocessor.site_name, {
+        "run_id": uuid.uuid4().hex,
+        "site_name": preprocessor.site_name,
+        "source": "cli",
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "wall_sec": round(wall_sec, 4),
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "stages": summarize_stages(preprocessor.stage_log),
+    })
+    return {
+        "name": name,
+        "wall_sec": round(wall_sec, 2),
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_all(tasks: Dict[str, str], output_dir: str, jobs: int,
+            output_format: str = DEFAULT_OUTPUT_FORMAT, refit: bool = False,
+            chunk_size: Optional[int] = None, idf: bool = False,
+            cache_dir: Optional[str] = None, trace_memory: bool = False) -> List[Dict]:
+    """
+    여러 사이트를 프로세스 풀에서 동시에 전처리
+    - 전체 시간은 합이 아니라 가장 느린 사이트 정도
+    - 작업마다 새 프로세스(max_tasks_per_child=1)를 써서 사이트별 최대 메모리가 섞이지 않음
+    - 한 사이트가 실패해도 나머지는 계속 진행하고 요약에 오류로 표시
+    """
+    pool_options = {"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=configure_logging, initargs=(logging.getLogger().level,),
+                             **pool_options) as executor:
+        futures = {
+            executor.submit(run_preprocessor, name, csv_file, output_dir, output_format, refit, chunk_size, idf,
+                            cache_dir, trace_memory): name
+            for name, csv_file in tasks.items()
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"name": futures[future], "error": f"{type(e).__name__}: {e}"})
+    return sorted(results, key=lambda result: result["name"])
+
+
+def print_summary(results: List[Dict], total_sec: float) -> None:
+    print(f"\n{'site':<22}{'wall(s)':>9}{'rows in':>9}{'rows out':>10}{'peak MB':>9}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['name']:<22}  실패: {result['error']}")
+            continue
+        peak = "-" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.1f}"
+        print(f"{result['name']:<22}{result['wall_sec']:>9.2f}{result['rows_in']:>9}{result['rows_out']:>10}{peak:>9}")
+    print(f"전체 소요 시간: {total_sec:.2f}초")
+
+
 def create_parser() -> ArgumentParser:
     parser = ArgumentParser()
     parser.add_argument('-o', '--output_dir', type=str, required=False, default = "../../database", help="Output file dir. Example: ../../database")
@@ -37,21 +160,55 @@ def create_parser() -> ArgumentParser:
                         help=f"Which processor to use. Choices: {', '.join(PREPROCESS_CLASSES.keys())}")
     parser.add_argument('-a', '--all', action='store_true',
                         help="Run all data preprocessors. Default to False.")    
+    parser.add_argument('-j', '--jobs', type=int, default=len(PREPROCESS_CLASSES),
+                        help=f"Number of sites to preprocess concurrently with --all. Default to {len(PREPROCESS_CLASSES)}.")
+    parser.add_argument('-f', '--format', type=str, default=DEFAULT_OUTPUT_FORMAT, choices=OUTPUT_FORMATS.keys(),
+                        help=f"Output format. Default to {DEFAULT_OUTPUT_FORMAT} (csv for export).")
+    parser.add_argument('--refit', action='store_true',
+                        help="Refit TF-IDF vectorizers instead of reusing the saved ones. Default to False.")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Stream the CSV in chunks of this many rows with HashingVectorizer features. Default to off.")
+    parser.add_argument('--idf', action='store_true',
+                        help="With --chunk-size, apply an IDF pass over the hashed features. Default to False.")
+    parser.add_argument('--stage-cache', type=str, default=None,
+                        help="Cache each pipeline stage result in this dir so unchanged stages are skipped. Default to off.")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record the tracemalloc peak of every stage (several times slower). Default to False.")
+    parser.add_argument('--corpus', type=str, nargs='?', const='corpus', default=None,
+                        help="After preprocessing, merge all site outputs into a site/year_month partitioned dataset "
+                             "under this dir (relative to --output_dir). Default to off, 'corpus' if given without a value.")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Show detailed per-step logs. Default to False.")
     return parser
 
 if __name__ == "__main__":
 
     parser = create_parser()
     args = parser.parse_args()
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
 
     os.makedirs(args.output_dir, exist_ok=True)
 
-    if args.all: 
+    if args.all:
+        tasks = {}
         for csv_file in REVIEW_COLLECTIONS:
             base_name = os.path.splitext(os.path.basename(csv_file))[0]
             if base_name in PREPROCESS_CLASSES:
-                preprocessor_class = PREPROCESS_CLASSES[base_name]
-                preprocessor = preprocessor_class(csv_file, args.output_dir)
-                preprocessor.preprocess()
-                preprocessor.feature_engineering()
-                preprocessor.save_to_database()
+                tasks[base_name] = csv_file
+            else:
+                print(f"등록된 전처리 클래스가 없어 건너뜀: {base_name}")
+    elif args.preprocessor:
+        tasks = {args.preprocessor: os.path.join(project_root, "database", f"{args.preprocessor}.csv")}
+    else:
+        parser.error("--all 또는 -c/--preprocessor 중 하나를 지정해주세요.")
+
+    start = time.perf_counter()
+    results = run_all(tasks, args.output_dir, max(1, args.jobs), args.format, args.refit,
+                      args.chunk_size, args.idf, args.stage_cache, args.trace_memory)
+    print_summary(results, time.perf_counter() - start)
+
+    if args.corpus:
+        # 이번 실행 여부와 관계없이 output_dir에 있는 모든 사이트 결과를 합침
+        site_names = [processor_class.site_name for processor_class in PREPROCESS_CLASSES.values()]
+        corpus = build_corpus(args.output_dir, os.path.join(args.output_dir, args.corpus), site_names)
+        print(f"corpus: {corpus['rows']}행, {corpus['partitions']}개 파티션 → {corpus['corpus_dir']}")
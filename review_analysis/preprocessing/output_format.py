@@ -0,0 +1,92 @@
+import glob
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from review_analysis.preprocessing.formats import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, check_format  # noqa: F401
+
+
+# 컬럼별 compact dtype
+FLOAT32_COLUMNS = ("rating", "rating_numeric")
+COMPACT_INT_COLUMNS = {"sentence_count": "uint16", "content_length": "uint32", "token_count": "uint32"}
+DICTIONARY_COLUMNS = ("date",)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """별점은 float32, 길이/문장 수는 작은 정수, 날짜는 dictionary(category)로 변환"""
+    df = df.copy()
+    for column in FLOAT32_COLUMNS:
+        if column in df.columns and pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = df[column].astype("float32")
+    for column, dtype in COMPACT_INT_COLUMNS.items():
+        if column in df.columns:
+            df[column] = df[column].fillna(0).clip(0, np.iinfo(dtype).max).astype(dtype)
+    for column in DICTIONARY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def write_frame(df: pd.DataFrame, path: str, output_format: str = DEFAULT_OUTPUT_FORMAT) -> str:
+    """데이터프레임을 지정한 형식으로 저장"""
+    check_format(output_format)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if output_format == "csv":
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+    table = pa.Table.from_pandas(compact_frame(df), preserve_index=False)
+    if output_format == "parquet":
+        pq.write_table(table, path, compression="zstd")
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+def frame_parts(path: str) -> List[str]:
+    """디렉터리로 저장된 결과(part-NNNNN.*)의 파일 목록"""
+    return sorted(p for ext in OUTPUT_FORMATS.values() for p in glob.glob(os.path.join(path, f"part-*{ext}")))
+
+
+def read_table(path: str) -> pa.Table:
+    """Arrow Table로 읽기. .arrow 파일은 memory-map 으로 복사 없이 읽음"""
+    if os.path.isdir(path):
+        return pa.concat_tables([read_table(part) for part in frame_parts(path)], promote_options="default")
+    if path.endswith(".arrow"):
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if path.endswith(".csv"):
+        return pa.Table.from_pandas(pd.read_csv(path, encoding='utf-8-sig'), preserve_index=False)
+    return pq.read_table(path)
+
+
+def read_frame(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """저장 형식(확장자)에 맞게 데이터프레임으로 읽기 (part 디렉터리 포함)"""
+    if os.path.isdir(path):
+        parts = frame_parts(path)
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat([read_frame(part, columns) for part in parts], ignore_index=True)
+    if path.endswith(".csv"):
+        return pd.read_csv(path, usecols=columns, encoding='utf-8-sig')
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    table = read_table(path)
+    return (table.select(columns) if columns else table).to_pandas()
+
+
+def read_columns(path: str) -> List[str]:
+    """데이터를 읽지 않고 컬럼 이름만 조회"""
+    if os.path.isdir(path):
+        parts = frame_parts(path)
+        return read_columns(parts[0]) if parts else []
+    if path.endswith(".csv"):
+        return list(pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns)
+    if path.endswith(".parquet"):
+        return [name for name in pq.read_schema(path).names if not name.startswith("__index_level_")]
+    return read_table(path).schema.names
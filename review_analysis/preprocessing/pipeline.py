@@ -0,0 +1,231 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from review_analysis.preprocessing.profiling import cached_record, profile_stage
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    파이프라인의 한 단계: 데이터프레임을 받아 데이터프레임을 반환
+    - params: 결과에 영향을 주는 설정 (캐시 키에 포함되므로 바뀌면 이 단계부터 다시 실행)
+    - cache : False면 결과를 캐시하지 않음 (TF-IDF처럼 프로세서 상태를 바꾸는 단계)
+    """
+    name: str
+    func: Callable[[pd.DataFrame], pd.DataFrame]
+    params: Dict[str, Any] = field(default_factory=dict)
+    cache: bool = True
+
+
+def _json_default(value: Any) -> Any:
+    # set은 순서가 없으므로 정렬해서 같은 설정이면 같은 키가 나오게 함
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+# 이 패키지 안에서 정의한 함수/클래스만 단계 코드 해시에 포함 (pandas 등 라이브러리는 제외)
+CODE_PACKAGE = "review_analysis"
+# 단계 캐시 최대 크기 / 최대 보관 기간 (넘으면 오래 쓰지 않은 항목부터 삭제)
+STAGE_CACHE_MAX_BYTES = 2 * 1024 ** 3
+STAGE_CACHE_MAX_AGE_SEC = 7 * 24 * 3600
+
+
+def _source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        code = getattr(obj, "__code__", None)
+        return repr((code.co_code, code.co_consts)) if code is not None else repr(obj)
+
+
+@functools.lru_cache(maxsize=256)
+def _function_code_hash(func: Callable) -> str:
+    """함수 소스 + 함수가 직접 참조하는 이 패키지의 함수/클래스 소스(한 단계)의 해시"""
+    digest = hashlib.sha1(_source(func).encode())
+    code = getattr(func, "__code__", None)
+    names = sorted(set(code.co_names)) if code is not None else []
+    for name in names:
+        target = getattr(func, "__globals__", {}).get(name)
+        if (inspect.isfunction(target) or inspect.isclass(target)) and \
+                getattr(target, "__module__", "").startswith(CODE_PACKAGE):
+            digest.update(name.encode())
+            digest.update(_source(target).encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _class_code_hash(cls: type) -> str:
+    """클래스와 이 패키지 안의 부모 클래스 소스 해시 (self.헬퍼() 호출까지 포함되도록)"""
+    digest = hashlib.sha1()
+    for klass in cls.__mro__:
+        if getattr(klass, "__module__", "").startswith(CODE_PACKAGE):
+            digest.update(_source(klass).encode())
+    return digest.hexdigest()
+
+
+def code_fingerprint(func: Callable) -> str:
+    """
+    단계 함수 코드의 해시 (캐시 키에 포함되어 단계 코드가 바뀌면 pipeline_version을 올리지 않아도 다시 실행)
+    - 함수: 함수 소스 + 직접 참조하는 이 패키지의 함수/클래스 소스
+    - 바운드 메서드: 위 해시 + 전처리기 클래스(와 부모 클래스) 전체 소스
+    - functools.partial은 감싼 함수 기준
+    (참조를 두 단계 이상 거친 모듈 함수만 바뀐 경우는 여전히 pipeline_version으로 무효화)
+    """
+    while isinstance(func, functools.partial):
+        func = func.func
+    owner = getattr(func, "__self__", None)
+    func = getattr(func, "__func__", func)
+    if not inspect.isfunction(func):
+        # 호출 가능한 객체는 인스턴스마다 repr이 달라지므로 클래스 기준
+        return _class_code_hash(type(func))
+    digest = _function_code_hash(func)
+    if owner is not None:
+        digest += _class_code_hash(owner if isinstance(owner, type) else type(owner))
+    return digest
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """데이터프레임 내용(값, 인덱스, 컬럼, dtype)의 해시"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    단계별 결과를 {cache_dir}/{key}.pkl 로 저장 (몽고DB ObjectId 같은 객체 컬럼도 그대로 보존)
+    - 저장할 때마다 max_age_sec보다 오래 쓰지 않은 항목을 지우고, 전체가 max_bytes를 넘으면 오래 쓰지 않은 항목부터 삭제
+    - 읽을 때 수정 시각을 갱신하므로 자주 쓰는 항목이 남음 (LRU)
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = STAGE_CACHE_MAX_BYTES,
+                 max_age_sec: Optional[float] = STAGE_CACHE_MAX_AGE_SEC):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def load(self, key: str) -> pd.DataFrame:
+        frame = pd.read_pickle(self._path(key))
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return frame
+
+    def save(self, key: str, df: pd.DataFrame) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 쓰는 도중 중단돼도 깨진 캐시가 남지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = self._path(key) + ".tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, self._path(key))
+        self.prune(keep=key)
+
+    def prune(self, keep: Optional[str] = None) -> int:
+        """기간/크기 제한을 넘는 항목 삭제 (keep은 방금 저장한 항목이라 남김), 삭제한 수 반환"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl") and entry.name != f"{keep}.pkl":
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        kept_bytes = os.path.getsize(self._path(keep)) if keep and self.has(keep) else 0
+        total = kept_bytes + sum(size for _, size, _ in entries)
+        cutoff = time.time() - self.max_age_sec if self.max_age_sec is not None else None
+        removed = 0
+        for mtime, size, path in entries:
+            expired = cutoff is not None and mtime < cutoff
+            oversized = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or oversized):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+class Pipeline:
+    """
+    이름 있는 단계들을 순서대로 실행
+    - 단계 i의 캐시 키 = hash(단계 i-1의 키, 단계 이름, params, 단계 코드 해시), 첫 키는 입력 데이터의 fingerprint
+    - 입력과 앞 단계 설정이 같으면 캐시된 가장 마지막 단계 결과를 읽고 그 다음 단계부터 실행
+    """
+
+    def __init__(self, stages: Sequence[Stage], cache_dir: Optional[str] = None, namespace: str = "",
+                 trace_memory: bool = False, cache_max_bytes: Optional[int] = STAGE_CACHE_MAX_BYTES,
+                 cache_max_age_sec: Optional[float] = STAGE_CACHE_MAX_AGE_SEC):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+        self.stages = list(stages)
+        self.cache = StageCache(cache_dir, cache_max_bytes, cache_max_age_sec) if cache_dir else None
+        self.namespace = namespace
+        self.trace_memory = trace_memory
+        # 마지막 실행의 단계별 측정 기록 (profiling.profile_stage 참고)
+        self.log: List[Dict[str, Any]] = []
+
+    def stage_keys(self, input_fingerprint: str) -> List[str]:
+        keys, previous = [], f"{self.namespace}:{input_fingerprint}"
+        for stage in self.stages:
+            payload = json.dumps([previous, stage.name, stage.params, code_fingerprint(stage.func)],
+                                 sort_keys=True, default=_json_default)
+            previous = hashlib.sha1(payload.encode()).hexdigest()
+            keys.append(previous)
+        return keys
+
+    def _resume_point(self, keys: List[str]) -> int:
+        """캐시에서 이어서 시작할 단계 번호 (앞 단계가 모두 캐시 가능한 경우만)"""
+        if self.cache is None:
+            return 0
+        cacheable = 0
+        while cacheable < len(self.stages) and self.stages[cacheable].cache:
+            cacheable += 1
+        for index in range(cacheable - 1, -1, -1):
+            if self.cache.has(keys[index]):
+                return index + 1
+        return 0
+
+    def iter_run(self, frame: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        """단계마다 결과 데이터프레임을 yield (중간에 실패해도 호출 측에 직전 결과가 남음)"""
+        self.log = []
+        keys = self.stage_keys(fingerprint(frame)) if self.cache else []
+        start = self._resume_point(keys)
+
+        if start:
+            frame = self.cache.load(keys[start - 1])
+            self.log.extend(cached_record(stage.name) for stage in self.stages[:start])
+            yield frame
+
+        for index in range(start, len(self.stages)):
+            stage = self.stages[index]
+            frame, record = profile_stage(stage.name, stage.func, frame, self.trace_memory)
+            if self.cache and stage.cache:
+                self.cache.save(keys[index], frame)
+            self.log.append(record)
+            yield frame
+
+    def run(self, frame: pd.DataFrame) -> pd.DataFrame:
+        for frame in self.iter_run(frame):
+            pass
+        return frame
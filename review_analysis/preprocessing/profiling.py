@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+import time
+import tracemalloc
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    # API 앱은 통계 조회(RunStatsStore)만 쓰므로 시작 시 pandas를 불러오지 않음
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def profile_stage(name: str, func: Callable[["pd.DataFrame"], "pd.DataFrame"], frame: "pd.DataFrame",
+                  trace_memory: bool = False) -> Tuple["pd.DataFrame", Dict[str, Any]]:
+    """
+    단계 하나를 실행하고 측정 기록을 반환
+    - wall_sec / cpu_sec: 경과 시간과 프로세스 CPU 시간
+    - rows_in / rows_out: 단계 전후 행 수
+    - peak_mem_mb: 단계 실행 중 tracemalloc 최대 증가량 (Python/numpy 할당 기준, Arrow 버퍼는 제외)
+    """
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = func(frame)
+        peak = tracemalloc.get_traced_memory()[1] - baseline if trace_memory else None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    record = {
+        "stage": name,
+        "cached": False,
+        "wall_sec": round(time.perf_counter() - wall, 4),
+        "cpu_sec": round(time.process_time() - cpu, 4),
+        "rows_in": len(frame),
+        "rows_out": len(result),
+        "peak_mem_mb": round(peak / (1024 * 1024), 2) if peak is not None else None,
+    }
+    memory = f", peak {record['peak_mem_mb']} MB" if trace_memory else ""
+    logger.info("stage %s: %.3fs wall, %.3fs cpu, %d -> %d rows%s", name, record["wall_sec"], record["cpu_sec"],
+                record["rows_in"], record["rows_out"], memory, extra={"stage_record": record})
+    return result, record
+
+
+def cached_record(name: str) -> Dict[str, Any]:
+    """캐시에서 읽어 실행하지 않은 단계의 기록"""
+    return {"stage": name, "cached": True, "wall_sec": 0.0, "cpu_sec": 0.0,
+            "rows_in": None, "rows_out": None, "peak_mem_mb": None}
+
+
+def summarize_stages(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """배치/chunk마다 반복된 단계 기록을 단계 이름별로 합산 (시간·행 수는 합, 메모리는 최대)"""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        stage = summary.setdefault(record["stage"], {
+            "stage": record["stage"], "calls": 0, "cached": 0, "wall_sec": 0.0, "cpu_sec": 0.0,
+            "rows_in": 0, "rows_out": 0, "peak_mem_mb": None,
+        })
+        stage["calls"] += 1
+        stage["cached"] += int(record["cached"])
+        stage["wall_sec"] = round(stage["wall_sec"] + record["wall_sec"], 4)
+        stage["cpu_sec"] = round(stage["cpu_sec"] + record["cpu_sec"], 4)
+        stage["rows_in"] += record["rows_in"] or 0
+        stage["rows_out"] += record["rows_out"] or 0
+        if record["peak_mem_mb"] is not None:
+            stage["peak_mem_mb"] = max(stage["peak_mem_mb"] or 0.0, record["peak_mem_mb"])
+    return list(summary.values())
+
+
+class RunStatsStore:
+    """실행별 단계 통계를 {stats_dir}/preprocess_stats_{site}.jsonl 에 한 줄씩 추가"""
+
+    def __init__(self, stats_dir: str):
+        self.stats_dir = stats_dir
+
+    def _path(self, site_name: str) -> str:
+        return os.path.join(self.stats_dir, f"preprocess_stats_{site_name}.jsonl")
+
+    def append(self, site_name: str, run: Dict[str, Any]) -> None:
+        os.makedirs(self.stats_dir, exist_ok=True)
+        with open(self._path(site_name), "a", encoding="utf-8") as f:
+            f.write(json.dumps(run, ensure_ascii=False, default=str) + "\n")
+
+    def load(self, site_name: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 실행부터 최대 limit개"""
+        path = self._path(site_name)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            lines = deque((line for line in f if line.strip()), maxlen=limit)
+        return [json.loads(line) for line in reversed(lines)]
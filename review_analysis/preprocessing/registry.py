@@ -0,0 +1,46 @@
+import importlib
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Type
+
+if TYPE_CHECKING:
+    from review_analysis.preprocessing.base_processor import BaseDataProcessor
+
+# 사이트 이름 → "모듈:클래스" 경로
+# 모듈은 그 사이트가 처음 쓰일 때 import (pandas/sklearn 등을 앱 시작 시 불러오지 않음)
+PROCESSOR_PATHS: Dict[str, str] = {
+    "imdb": "review_analysis.preprocessing.imdb_processor:ImdbDataProcessor",
+    "letterboxd": "review_analysis.preprocessing.letterboxd_processor:LetterboxdProcessor",
+    "rotten": "review_analysis.preprocessing.rotten_processor:RottenProcessor",
+}
+
+_loaded: Dict[str, Type["BaseDataProcessor"]] = {}
+_lock = threading.Lock()
+
+
+def register_processor(site_name: str, path: str) -> None:
+    """새 사이트 processor 등록 (예: register_processor("naver", "my_package.naver:NaverProcessor"))"""
+    with _lock:
+        PROCESSOR_PATHS[site_name.lower()] = path
+        _loaded.pop(site_name.lower(), None)
+
+
+def site_names() -> List[str]:
+    return list(PROCESSOR_PATHS)
+
+
+def has_processor(site_name: str) -> bool:
+    """모듈을 import 하지 않고 등록 여부만 확인"""
+    return site_name.lower() in PROCESSOR_PATHS
+
+
+def get_processor(site_name: str) -> Optional[Type["BaseDataProcessor"]]:
+    """사이트 processor 클래스 (처음 호출할 때 모듈을 import, 등록되지 않은 사이트면 None)"""
+    site = site_name.lower()
+    with _lock:
+        if site not in _loaded:
+            path = PROCESSOR_PATHS.get(site)
+            if path is None:
+                return None
+            module_name, class_name = path.split(":")
+            _loaded[site] = getattr(importlib.import_module(module_name), class_name)
+        return _loaded[site]
@@ -0,0 +1,80 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import joblib  # type: ignore
+import pandas as pd
+
+# 어휘 drift 측정 시 사용하는 최대 문서 수 (전체 코퍼스를 다시 분석하지 않도록 샘플링)
+DRIFT_SAMPLE_SIZE = 2000
+
+
+def oov_rate(vectorizer, texts: pd.Series, sample_size: int = DRIFT_SAMPLE_SIZE) -> float:
+    """벡터라이저 어휘에 없는 토큰(n-gram 포함)의 비율"""
+    if len(texts) > sample_size:
+        texts = texts.sample(n=sample_size, random_state=0)
+
+    analyzer = vectorizer.build_analyzer()
+    vocabulary = vectorizer.vocabulary_
+    total = unknown = 0
+    for text in texts:
+        terms = analyzer(text)
+        total += len(terms)
+        unknown += sum(1 for term in terms if term not in vocabulary)
+    return unknown / total if total else 0.0
+
+
+class VectorizerStore:
+    """
+    사이트별 학습된 TF-IDF 벡터라이저 저장소
+    - tfidf_vectorizer_{site}_v{N}.joblib: 버전별 벡터라이저
+    - tfidf_vectorizer_{site}.json       : 현재 버전과 버전별 메타데이터 (학습 시 OOV 비율 포함)
+    """
+
+    def __init__(self, output_dir: str, site_name: str):
+        self.output_dir = output_dir
+        self.site_name = site_name
+        self.manifest_path = os.path.join(output_dir, f"tfidf_vectorizer_{site_name}.json")
+
+    def _model_path(self, version: int) -> str:
+        return os.path.join(self.output_dir, f"tfidf_vectorizer_{self.site_name}_v{version}.joblib")
+
+    def manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {"current": None, "versions": []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self) -> Tuple[Optional[object], Optional[dict]]:
+        """현재 버전의 (벡터라이저, 메타데이터). 저장된 것이 없으면 (None, None)"""
+        manifest = self.manifest()
+        if manifest["current"] is None:
+            return None, None
+        meta = next(v for v in manifest["versions"] if v["version"] == manifest["current"])
+        return joblib.load(self._model_path(meta["version"])), meta
+
+    def save(self, vectorizer, texts: pd.Series) -> dict:
+        """새 버전으로 저장하고 현재 버전으로 지정"""
+        manifest = self.manifest()
+        version = max((v["version"] for v in manifest["versions"]), default=0) + 1
+
+        # stop_words_ 는 max_features/min_df로 잘린 단어 전체라 용량만 차지하므로 제외
+        if hasattr(vectorizer, "stop_words_"):
+            delattr(vectorizer, "stop_words_")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        joblib.dump(vectorizer, self._model_path(version))
+
+        meta = {
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "n_docs": int(len(texts)),
+            "vocab_size": len(vectorizer.vocabulary_),
+            "baseline_oov_rate": round(oov_rate(vectorizer, texts), 4),
+        }
+        manifest["versions"].append(meta)
+        manifest["current"] = version
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return meta
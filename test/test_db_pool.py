@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+from app.main import app
+import app.dependencies as dependencies
+from database.pool_metrics import PoolMetrics, instrumented_pool, pool_status
+
+client = TestClient(app)
+
+
+def test_pool_metrics_record_wait_overflow_and_timeout(tmp_path):
+    metrics = PoolMetrics()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=instrumented_pool(QueuePool, metrics),
+                           pool_size=1, max_overflow=1, pool_timeout=0.05)
+
+    first, second = engine.connect(), engine.connect()  # 두 번째는 overflow 연결
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert pool_status(engine.pool, metrics)["checkedout"] == 2
+    first.close()
+    second.close()
+
+    # 반납된 연결을 다시 쓰면 새 연결을 만들지 않음
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    status = pool_status(engine.pool, metrics)
+    assert status["checkouts"] == 3
+    assert status["timeouts"] == 1
+    assert status["overflow_events"] == 1
+    assert status["connections_created"] == 2
+    assert status["checkedout"] == 0
+    assert 0 <= status["wait_ms"]["p50"] <= status["wait_ms"]["max"]
+
+    # dispose() 후 새로 만든 풀에도 같은 측정값이 이어짐
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert pool_status(engine.pool, metrics)["checkouts"] == 4
+
+
+def test_internal_pool_endpoint_requires_token(monkeypatch):
+    # 토큰을 설정하지 않으면 닫혀 있음
+    monkeypatch.setattr(dependencies, "INTERNAL_API_TOKEN", None)
+    assert client.get("/internal/db/pool").status_code == 403
+    assert client.get("/internal/db/pool", headers={"X-Internal-Token": ""}).status_code == 403
+
+    monkeypatch.setattr(dependencies, "INTERNAL_API_TOKEN", "secret")
+    response = client.get("/internal/db/pool", headers={"X-Internal-Token": "secret"})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert set(data) == {"sync", "async"}
+    assert data["sync"]["pool_size"] == data["sync"]["size"]
+    assert data["async"]["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+
+    assert client.get("/internal/db/pool").status_code == 403
+    assert client.get("/internal/db/pool", headers={"X-Internal-Token": "wrong"}).status_code == 403
+    assert "/internal/db/pool" not in client.get("/openapi.json").json()["paths"]
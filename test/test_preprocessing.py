@@ -0,0 +1,482 @@
+import itertools
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from benchmarks.synthetic import generate_reviews
+from review_analysis.preprocessing.base_processor import BaseDataProcessor
+from review_analysis.preprocessing.corpus import (CORPUS_SCHEMA, build_corpus, corpus_dataset, corpus_filter,
+                                                  find_site_output, read_corpus)
+from review_analysis.preprocessing.dedupe import DedupeIndex, MinHashDeduper, dedupe_reviews
+from review_analysis.preprocessing.eda_report import FIGURES, build_report
+from review_analysis.preprocessing.dates import format_dates, normalize_dates
+from review_analysis.preprocessing.features import add_text_features
+from review_analysis.preprocessing.imdb_processor import ImdbDataProcessor
+from review_analysis.preprocessing.letterboxd_processor import LetterboxdProcessor
+from review_analysis.preprocessing.rotten_processor import RottenProcessor
+from review_analysis.preprocessing.output_format import read_frame, read_table, write_frame
+from review_analysis.preprocessing.pipeline import Pipeline, Stage, StageCache
+from review_analysis.preprocessing.registry import get_processor, has_processor, register_processor
+from review_analysis.preprocessing.text_cleaning import TextCleaner
+from review_analysis.preprocessing.vectorizer_store import VectorizerStore
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+
+PROCESSOR_CLASSES = {
+    "imdb": ImdbDataProcessor,
+    "rotten": RottenProcessor,
+    "letterboxd": LetterboxdProcessor,
+}
+
+
+def run_processor(site_name, output_dir, refit=False, output_format="parquet"):
+    processor_class = PROCESSOR_CLASSES[site_name]
+    processor = processor_class(os.path.join(DATABASE_DIR, f"reviews_{site_name}.csv"), str(output_dir))
+    processor.refit = refit
+    processor.output_format = output_format
+    processor.preprocess()
+    processor.feature_engineering()
+    processor.save_to_database()
+    return processor
+
+
+@pytest.mark.parametrize("site_name", ["imdb", "rotten", "letterboxd"])
+def test_tfidf_saved_as_sparse_matrix(tmp_path, site_name):
+    processor = run_processor(site_name, tmp_path)
+
+    output = read_frame(processor.output_path())
+    matrix, vocabulary, row_ids = BaseDataProcessor.load_tfidf(str(tmp_path), site_name)
+
+    assert not any(column.startswith("tfidf_") for column in output.columns)
+    assert matrix.shape == (len(output), len(vocabulary))
+    assert len(row_ids) == len(output)
+    assert 0 < matrix.nnz < matrix.shape[0] * matrix.shape[1]
+
+
+def test_saved_vectorizer_reused_in_transform_mode(tmp_path):
+    first = run_processor("letterboxd", tmp_path)
+    second = run_processor("letterboxd", tmp_path)
+
+    assert first.tfidf_version == second.tfidf_version == 1
+    assert abs(first.tfidf_matrix - second.tfidf_matrix).max() < 1e-9
+    assert VectorizerStore(str(tmp_path), "letterboxd").manifest()["current"] == 1
+
+
+def test_refit_on_demand_creates_new_version(tmp_path):
+    run_processor("imdb", tmp_path)
+    refitted = run_processor("imdb", tmp_path, refit=True)
+
+    manifest = VectorizerStore(str(tmp_path), "imdb").manifest()
+    assert refitted.tfidf_version == 2
+    assert manifest["current"] == 2
+    assert [v["version"] for v in manifest["versions"]] == [1, 2]
+
+
+def test_vocabulary_drift_triggers_refit(tmp_path):
+    run_processor("rotten", tmp_path)
+
+    processor = RottenProcessor("unused.csv", str(tmp_path))
+    words = ["quark", "gluon", "lattice", "gauge", "boson", "hadron", "meson", "fermion"]
+    drifted = pd.Series([" ".join(triple) for triple in itertools.permutations(words, 3)][:60])
+    processor.vectorize(drifted)
+
+    assert processor.tfidf_version == 2
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow", "csv"])
+def test_output_formats_round_trip(tmp_path, output_format):
+    processor = run_processor("rotten", tmp_path, output_format=output_format)
+
+    path = processor.output_path()
+    output = read_frame(path)
+
+    assert path.endswith(f".{output_format}")
+    assert len(output) == len(processor.df)
+    assert output["content"].tolist() == processor.df["content"].tolist()
+
+
+def test_parquet_output_uses_compact_types(tmp_path):
+    processor = run_processor("imdb", tmp_path)
+
+    schema = read_table(processor.output_path()).schema
+
+    assert str(schema.field("rating").type) == "float"
+    assert str(schema.field("sentence_count").type) == "uint16"
+    assert str(schema.field("date").type).startswith("dictionary")
+
+
+def test_text_cleaner_matches_row_wise_cleaning():
+    from benchmarks.bench_text_cleaning import legacy_clean_text
+
+    stopwords = set(LetterboxdProcessor("unused.csv", "unused").stopwords)
+    texts = pd.read_csv(os.path.join(DATABASE_DIR, "reviews_letterboxd.csv"))["content"]
+    # 'İ'처럼 Python lower()가 결합 문자를 덧붙이는 경우는 기존 방식이 단어를 쪼개므로 비교에서 제외
+    texts = texts.dropna()
+    texts = texts[[len(text.lower()) == len(text) for text in texts]]
+    texts = pd.concat([texts, pd.Series(["See www.x.com or mail a@b.c NOW!!", None, 5])], ignore_index=True)
+
+    cleaner = TextCleaner(remove_urls=True, keep_chars="a-zA-Z0-9", stopwords=stopwords, min_token_length=2)
+
+    assert cleaner.clean(texts).tolist() == texts.apply(legacy_clean_text, stopwords=stopwords).tolist()
+
+
+def test_text_features_are_compact_and_consistent():
+    frame = pd.DataFrame({"content": ["One. Two!! Three?", " ... ", None, "no terminator here"]})
+
+    add_text_features(frame)
+
+    assert frame["sentence_count"].tolist() == [3, 0, 0, 1]
+    assert frame["token_count"].tolist() == [3, 1, 0, 3]
+    assert frame["content_length"].tolist() == [17, 5, 0, 18]
+    assert str(frame["sentence_count"].dtype) == "uint16"
+    assert str(frame["token_count"].dtype) == "uint32"
+
+
+def test_normalize_dates_handles_mixed_formats():
+    dates = pd.Series(["5d", "9h", "Jan 20", "Dec 3", "2024-02-29", "2023.2.1", "Jan 21, 2024",
+                       "2023.13.01", "12/31/2024", None])
+
+    formatted = format_dates(normalize_dates(dates, reference_date="2025-01-21"))
+
+    assert formatted.tolist() == ["2025.01.16", None, "2025.01.20", "2024.12.03", "2024.02.29",
+                                  "2023.02.01", "2024.01.21", None, None, None]
+
+
+def test_normalize_dates_range_and_hours():
+    dates = pd.Series(["2009.12.31", "2015.06.01", "3h"])
+
+    parsed = normalize_dates(dates, reference_date="2025-01-21 12:00", parse_hours=True, min_date="2010-01-01")
+
+    assert format_dates(parsed, missing="날짜 정보 없음").tolist() == ["날짜 정보 없음", "2015.06.01", "2025.01.21"]
+
+
+def test_letterboxd_keeps_strict_dotted_dates():
+    processor = LetterboxdProcessor("unused.csv", "unused")
+    frame = pd.DataFrame({"rating": ["8"] * 6, "content": ["long enough review"] * 6,
+                          "date": ["2022.02.18", "2022.2.1", "5d", "Jan 20", "2009.12.31", "2999.01.01"]})
+
+    result = processor._handle_outliers(frame)
+
+    # 상대 날짜는 다른 사이트의 크롤링 기준일로 해석하지 않음, 유효한 날짜는 원래 문자열 유지
+    assert result["date"].tolist() == ["2022.02.18", "2022.2.1"] + ["날짜 정보 없음"] * 4
+
+
+def test_run_preprocessor_reports_site_summary(tmp_path):
+    from review_analysis.preprocessing.main import PREPROCESS_CLASSES, run_preprocessor
+
+    result = run_preprocessor("reviews_letterboxd", os.path.join(DATABASE_DIR, "reviews_letterboxd.csv"), str(tmp_path))
+
+    assert set(PREPROCESS_CLASSES) == {"reviews_imdb", "reviews_letterboxd", "reviews_rotten"}
+    assert result["rows_in"] == len(pd.read_csv(os.path.join(DATABASE_DIR, "reviews_letterboxd.csv")))
+    assert 0 < result["rows_out"] <= result["rows_in"]
+    assert result["wall_sec"] >= 0
+    assert (tmp_path / "preprocessed_reviews_letterboxd.parquet").exists()
+
+
+@pytest.mark.parametrize("site_name", ["imdb", "rotten", "letterboxd"])
+def test_chunked_mode_streams_parts_with_hashed_idf(tmp_path, site_name):
+    processor_class = PROCESSOR_CLASSES[site_name]
+    processor = processor_class(os.path.join(DATABASE_DIR, f"reviews_{site_name}.csv"), str(tmp_path))
+    processor.hashing_features = 2 ** 12
+
+    summary = processor.process_in_chunks(chunk_size=200, idf=True)
+
+    output = read_frame(summary["output_path"])
+    parts = sorted(p for p in os.listdir(summary["tfidf_dir"]) if p.endswith(".npz"))
+    matrices = [sp.load_npz(os.path.join(summary["tfidf_dir"], part)) for part in parts]
+
+    assert summary["parts"] == len(parts) > 1
+    assert len(output) == summary["rows_out"] == sum(m.shape[0] for m in matrices)
+    assert all(m.shape[1] == 2 ** 12 for m in matrices)
+    norms = np.sqrt(np.asarray(sp.vstack(matrices).multiply(sp.vstack(matrices)).sum(axis=1))).ravel()
+    assert np.allclose(norms[norms > 0], 1.0, atol=1e-5)
+    assert os.path.exists(os.path.join(summary["tfidf_dir"], "idf.npy"))
+
+
+@pytest.mark.parametrize("deduper", [None, "default"])
+def test_letterboxd_output_columns_follow_dedupe_setting(tmp_path, deduper):
+    raw = pd.read_csv(os.path.join(DATABASE_DIR, "reviews_letterboxd.csv"))
+    options = {} if deduper == "default" else {"deduper": None}
+    processor = LetterboxdProcessor.from_dataframe(raw, str(tmp_path), refit=True, **options)
+    processor.preprocess()
+    processor.feature_engineering()
+    processor.save_to_database()
+
+    output = read_frame(processor.output_path())
+
+    assert ("dup_cluster_id" in output.columns) == (deduper is not None)
+    assert list(output.columns[:4]) == ["rating", "rating_numeric", "date", "content"]
+
+
+def test_stage_cache_skips_cleaning_when_only_tfidf_changes(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = RottenProcessor(os.path.join(DATABASE_DIR, "reviews_rotten.csv"), str(tmp_path))
+    first.cache_dir = cache_dir
+    first.preprocess()
+    first.feature_engineering()
+
+    second = RottenProcessor(os.path.join(DATABASE_DIR, "reviews_rotten.csv"), str(tmp_path))
+    second.cache_dir = cache_dir
+    second.refit = True
+    second.preprocess()
+    second.feature_engineering()
+
+    assert not any(entry["cached"] for entry in first.stage_log)
+    assert [entry["stage"] for entry in second.stage_log if entry["cached"]] == \
+        ["missing_values", "dates", "outliers", "clean_text", "dedupe", "text_features"]
+    assert second.tfidf_version == 2
+    pd.testing.assert_frame_equal(first.df, second.df)
+
+
+def test_stage_params_invalidate_downstream_cache(tmp_path):
+    calls = []
+
+    def stage(name):
+        def run(df):
+            calls.append(name)
+            return df.assign(**{name: 1})
+        return run
+
+    frame = pd.DataFrame({"content": ["a", "b"]})
+    Pipeline([Stage("clean", stage("clean")), Stage("features", stage("features"), {"n": 1})],
+             cache_dir=str(tmp_path)).run(frame)
+    pipeline = Pipeline([Stage("clean", stage("clean")), Stage("features", stage("features"), {"n": 2})],
+                        cache_dir=str(tmp_path))
+    result = pipeline.run(frame)
+
+    assert calls == ["clean", "features", "features"]
+    assert [(entry["stage"], entry["cached"]) for entry in pipeline.log] == [("clean", True), ("features", False)]
+    assert list(result.columns) == ["content", "clean", "features"]
+
+
+def test_stage_code_change_invalidates_cache(tmp_path):
+    def clean_v1(df):
+        return df.assign(clean=df["content"].str.upper())
+
+    def clean_v2(df):
+        return df.assign(clean=df["content"].str.strip().str.upper())
+
+    frame = pd.DataFrame({"content": [" a", "b "]})
+    Pipeline([Stage("clean", clean_v1)], cache_dir=str(tmp_path)).run(frame)
+    pipeline = Pipeline([Stage("clean", clean_v2)], cache_dir=str(tmp_path))
+    result = pipeline.run(frame)
+
+    assert [entry["cached"] for entry in pipeline.log] == [False]
+    assert result["clean"].tolist() == ["A", "B"]
+
+
+def test_stage_cache_evicts_old_and_least_recently_used_entries(tmp_path):
+    frame = pd.DataFrame({"content": ["x" * 1000]})
+    unbounded = StageCache(str(tmp_path), max_bytes=None, max_age_sec=None)
+    for key in ("a", "b", "c"):
+        unbounded.save(key, frame)
+    size = os.path.getsize(tmp_path / "a.pkl")
+    os.utime(tmp_path / "a.pkl", (1, 1))
+    os.utime(tmp_path / "b.pkl", (2, 2))
+    os.utime(tmp_path / "c.pkl", (3, 3))
+    unbounded.load("a")
+
+    cache = StageCache(str(tmp_path), max_bytes=size * 2, max_age_sec=None)
+    cache.save("d", frame)
+    assert sorted(os.listdir(tmp_path)) == ["a.pkl", "d.pkl"]
+
+    os.utime(tmp_path / "a.pkl", (1, 1))
+    StageCache(str(tmp_path), max_bytes=None, max_age_sec=3600).save("e", frame)
+    assert sorted(os.listdir(tmp_path)) == ["d.pkl", "e.pkl"]
+
+
+def test_from_dataframe_uses_canonical_output_frame(tmp_path):
+    raw = pd.read_csv(os.path.join(DATABASE_DIR, "reviews_letterboxd.csv"))
+
+    processor = LetterboxdProcessor.from_dataframe(raw, str(tmp_path), refit=True)
+    processor.preprocess()
+    processor.feature_engineering()
+
+    assert processor.refit is True
+    assert processor.tfidf_matrix.shape[0] == len(processor.df) < len(raw)
+    assert {"content_cleaned", "sentence_count", "token_count"} <= set(processor.df.columns)
+
+
+@pytest.mark.parametrize("site_name", ["imdb", "rotten", "letterboxd"])
+def test_synthetic_reviews_match_raw_schema_and_survive_processing(tmp_path, site_name):
+    raw = pd.read_csv(os.path.join(DATABASE_DIR, f"reviews_{site_name}.csv"))
+    synthetic = generate_reviews(site_name, 3000, seed=1)
+
+    assert synthetic.dtypes.equals(raw.dtypes)
+    assert synthetic.equals(generate_reviews(site_name, 3000, seed=1))
+    assert synthetic["content"].isna().any() and synthetic["content"].duplicated().any()
+    assert synthetic["content"].str.len().max() > 10000
+    if site_name == "rotten":
+        assert synthetic["date"].str.fullmatch(r"\d+[dh]").any()
+    if site_name == "letterboxd":
+        assert (synthetic["rating"] == "평점 없음").any() and synthetic["date"].isna().any()
+
+    processor = PROCESSOR_CLASSES[site_name].from_dataframe(synthetic, str(tmp_path), refit=True)
+    processor.preprocess()
+    processor.feature_engineering()
+
+    assert 0 < len(processor.df) < len(synthetic)
+    if site_name != "imdb":
+        assert processor.df["content"].str.len().max() <= 10000
+    assert processor.tfidf_matrix.shape[0] == len(processor.df)
+
+
+def test_dedupe_drops_exact_and_clusters_near_duplicates():
+    review = ("the movie was a long slow meditation on time love and gravity with stunning visuals "
+              "and a loud score that i will remember for years")
+    frame = pd.DataFrame({"content": [
+        review,
+        "  " + review.upper(),                         # 대소문자/공백만 다른 완전 중복
+        review.replace("stunning", "gorgeous"),       # 단어 하나만 다른 유사 중복
+        "a different review about a cooking show and its many bland recipes",
+        "short",
+        "short",
+    ]}, index=[10, 11, 12, 13, 14, 15])
+
+    result = dedupe_reviews(frame)
+
+    assert list(result.index) == [10, 12, 13, 14]
+    assert result["dup_cluster_id"].tolist() == [10, 10, 13, 14]
+    assert dedupe_reviews(frame, drop_exact=False)["dup_cluster_id"].tolist() == [10, 10, 10, 13, 14, 14]
+
+
+def test_dedupe_index_catches_duplicates_across_batches(tmp_path):
+    review = ("the movie was a long slow meditation on time love and gravity with stunning visuals "
+              "and a loud score that i will remember for years")
+    path = str(tmp_path / "dedupe_imdb")
+    first = dedupe_reviews(pd.DataFrame({"content": [review, "a cooking show with many bland recipes"]},
+                                        index=[10, 11]))
+    index = DedupeIndex(path, MinHashDeduper())
+    kept, _ = index.apply(first, "content")
+    index.save()
+    assert list(kept.index) == [10, 11]
+
+    # 다음 배치(또는 다음 실행)에서 다시 올라온 완전 중복 / 유사 중복
+    second = dedupe_reviews(pd.DataFrame({"content": [
+        " " + review.upper(),
+        review.replace("stunning", "gorgeous"),
+        "a brand new review about a heist thriller",
+    ]}, index=[20, 21, 22]))
+    kept, keep = DedupeIndex(path, MinHashDeduper()).apply(second, "content")
+
+    assert keep.tolist() == [False, True, True]
+    assert kept["dup_cluster_id"].tolist() == [10, 22]
+    assert len(DedupeIndex(path, MinHashDeduper(threshold=0.9))) == 0  # 설정이 바뀌면 이전 색인은 버림
+
+
+def test_dedupe_index_appends_only_new_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "dedupe_imdb")
+    index = DedupeIndex(path, MinHashDeduper())
+    for batch in range(3):
+        frame = dedupe_reviews(pd.DataFrame(
+            {"content": [f"review number {batch} {i} about a slow and quiet drama film" for i in range(4)]},
+            index=range(batch * 4, batch * 4 + 4)))
+        index.apply(frame, "content")
+        index.save()
+
+    shards = sorted(name for name in os.listdir(path) if name.startswith("shard-"))
+    assert shards == ["shard-00000.npz", "shard-00001.npz", "shard-00002.npz"]
+    assert [np.load(os.path.join(path, name))["ids"].tolist() for name in shards] == \
+        [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+
+    monkeypatch.setattr(DedupeIndex, "max_shards", 2)
+    assert len(DedupeIndex(path, MinHashDeduper())) == 12  # shard가 많으면 하나로 합침
+    assert sorted(name for name in os.listdir(path) if name.startswith("shard-")) == ["shard-00000.npz"]
+
+
+def test_dedupe_clusters_across_sites():
+    rotten = pd.read_csv(os.path.join(DATABASE_DIR, "reviews_rotten.csv")).dropna(subset=["content"])
+    imdb = pd.read_csv(os.path.join(DATABASE_DIR, "reviews_imdb.csv")).dropna(subset=["content"])
+    # 다른 사이트에 문장 끝만 바꿔 다시 올라온 리뷰
+    long_reviews = rotten[rotten["content"].str.split().str.len() >= 40].head(5)
+    reposted = long_reviews.assign(content=long_reviews["content"] + " Highly recommended.")
+    frames = {"rotten": rotten, "imdb": pd.concat([imdb, reposted])}
+    combined = pd.concat([frame.assign(site=site) for site, frame in frames.items()], ignore_index=True)
+
+    result = dedupe_reviews(combined, drop_exact=False)
+
+    cross_site = result.groupby("dup_cluster_id")["site"].nunique()
+    assert len(result) == len(combined)
+    assert (cross_site > 1).sum() >= len(reposted)
+
+
+def test_corpus_merges_sites_into_partitioned_dataset(tmp_path):
+    for site_name in PROCESSOR_CLASSES:
+        run_processor(site_name, tmp_path)
+    corpus_dir = str(tmp_path / "corpus")
+
+    summary = build_corpus(str(tmp_path), corpus_dir, PROCESSOR_CLASSES)
+    corpus = read_corpus(corpus_dir)
+
+    assert set(corpus.columns) == set(CORPUS_SCHEMA.names)
+    assert corpus.groupby("site").size().to_dict() == summary["rows_per_site"]
+    assert corpus["review_id"].is_unique
+    assert corpus.loc[corpus["site"] == "letterboxd", "content_cleaned"].notna().all()
+    assert corpus.loc[corpus["site"] != "letterboxd", "content_cleaned"].isna().all()
+
+    # site/year_month 파티션 밖의 파일은 열지 않음
+    condition = corpus_filter(["rotten"], "2025-06-01", "2025-08-31")
+    fragments = list(corpus_dataset(corpus_dir).get_fragments(filter=condition))
+    assert 0 < len(fragments) < summary["partitions"]
+    assert all("site=rotten" in fragment.path for fragment in fragments)
+
+    sliced = read_corpus(corpus_dir, ["rotten"], "2025-06-01", "2025-08-31", columns=["review_id", "date"])
+    expected = corpus[(corpus["site"] == "rotten") & (corpus["year_month"].between("2025-06", "2025-08"))]
+    assert list(sliced.columns) == ["review_id", "date"]
+    assert sorted(sliced["review_id"]) == sorted(expected["review_id"])
+
+
+def test_find_site_output_prefers_most_recent_result(tmp_path):
+    frame = pd.DataFrame({"content": ["a review"]})
+    parts_dir = tmp_path / "preprocessed_reviews_imdb"
+    part = write_frame(frame, str(parts_dir / "part-00000.parquet"))
+    single = write_frame(frame, str(tmp_path / "preprocessed_reviews_imdb.csv"), "csv")
+
+    # 이전 chunked/API 실행의 part 디렉터리가 남아 있어도 나중에 쓴 단일 파일을 읽음
+    os.utime(part, (1_000, 1_000))
+    assert find_site_output(str(tmp_path), "imdb") == single
+    os.utime(single, (500, 500))
+    assert find_site_output(str(tmp_path), "imdb") == str(parts_dir)
+    assert find_site_output(str(tmp_path), "rotten") is None
+
+
+def test_registry_imports_processor_on_first_use(monkeypatch):
+    monkeypatch.setattr("review_analysis.preprocessing.registry.PROCESSOR_PATHS", {
+        "imdb": "review_analysis.preprocessing.imdb_processor:ImdbDataProcessor",
+    })
+    monkeypatch.setattr("review_analysis.preprocessing.registry._loaded", {})
+    register_processor("IMDb-Copy", "review_analysis.preprocessing.imdb_processor:ImdbDataProcessor")
+
+    assert has_processor("imdb-copy")
+    assert get_processor("IMDB") is ImdbDataProcessor
+    assert get_processor("imdb-copy") is ImdbDataProcessor
+    assert not has_processor("naver")
+    assert get_processor("naver") is None
+
+
+def test_eda_report_rerenders_only_changed_figures(tmp_path):
+    frame = read_frame(os.path.join(DATABASE_DIR, "preprocessed_reviews_letterboxd.csv"))
+    report_dir = str(tmp_path / "report")
+
+    first = build_report(frame, "letterboxd", report_dir, workers=1)
+    again = build_report(frame, "letterboxd", report_dir, workers=1)
+    longer = build_report(frame.assign(content_length=frame["content_length"] * 2), "letterboxd", report_dir, workers=1)
+
+    assert first["rendered"] == len(FIGURES)
+    assert all(os.path.exists(os.path.join(report_dir, f"{name}.png")) for name in FIGURES)
+    assert again["rendered"] == 0
+    assert [name for name, figure in longer["figures"].items() if not figure["cached"]] == ["length_boxplot"]
+
+
+def test_eda_report_downsamples_long_time_series(tmp_path):
+    dates = pd.date_range("2015-01-01", periods=3000, freq="D").strftime("%Y.%m.%d")
+    frame = pd.DataFrame({"date": dates, "rating": 5.0, "content_length": 10, "sentence_count": 1})
+
+    build_report(frame, "imdb", str(tmp_path), workers=1, max_points=100,
+                 figures=["reviews_timeseries", "rating_timeseries"])
+    data = FIGURES["reviews_timeseries"](frame, 100)
+
+    assert len(data["dates"]) <= 100
+    assert sum(data["values"]) == len(frame)
+    assert set(FIGURES["rating_timeseries"](frame, 100)["values"]) == {5.0}
@@ -0,0 +1,194 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from app.main import app
+from app.dependencies import get_eda_report_service, get_preprocess_job_manager, get_preprocess_stats_store
+from app.review.review_jobs import PreprocessJobManager
+from app.review.review_report import EdaReportService
+from review_analysis.preprocessing.output_format import read_frame, write_frame
+from review_analysis.preprocessing.profiling import RunStatsStore
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+
+# FastAPI 테스트 클라이언트
+client = TestClient(app)
+
+release = threading.Event()
+
+
+# 실제 Mongo/pandas 대신 끝나는 시점을 제어할 수 있는 가짜 전처리
+def fake_runner(site_name, **options):
+    release.wait(timeout=5)
+    if site_name == "broken":
+        raise RuntimeError("boom")
+    return {"count": 8, "rows_in": 10, "batches": 1, "cached": not options["force"],
+            "started_at": 100.0, "finished_at": 102.5}
+
+
+@pytest.fixture
+def job_manager():
+    release.clear()
+    manager = PreprocessJobManager(executor=ThreadPoolExecutor(max_workers=2), runner=fake_runner)
+    app.dependency_overrides[get_preprocess_job_manager] = lambda: manager
+    yield manager
+    release.set()
+    manager.shutdown()
+    app.dependency_overrides = {}
+
+
+def wait_for(job_manager, job_id):
+    release.set()
+    for _ in range(100):
+        job = job_manager.get(job_id)
+        if job.state in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+# 테스트: 작업 등록 후 바로 job id 반환
+def test_preprocess_returns_job_id(job_manager):
+    response = client.post("/review/preprocess/imdb")
+
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["site_name"] == "imdb"
+    assert data["state"] in ("queued", "running")
+
+
+# 테스트: force=true면 캐시된 결과 대신 다시 전처리하도록 전달
+def test_preprocess_force_bypasses_result_cache(job_manager):
+    cached = client.post("/review/preprocess/imdb").json()["data"]["job_id"]
+    assert wait_for(job_manager, cached).result["cached"] is True
+
+    forced = client.post("/review/preprocess/imdb", params={"force": "true"}).json()["data"]["job_id"]
+    assert wait_for(job_manager, forced).result["cached"] is False
+
+
+# 테스트: 같은 사이트 요청은 진행 중인 작업에 연결
+def test_preprocess_attaches_to_running_job(job_manager):
+    first = client.post("/review/preprocess/imdb").json()
+    second = client.post("/review/preprocess/IMDb").json()
+    other = client.post("/review/preprocess/rotten").json()
+
+    assert second["data"]["job_id"] == first["data"]["job_id"]
+    assert other["data"]["job_id"] != first["data"]["job_id"]
+
+
+# 테스트: 같은 사이트라도 옵션이 다르면 진행 중인 작업에 연결하지 않고 409
+def test_preprocess_conflicts_with_running_job_of_other_options(job_manager):
+    first = client.post("/review/preprocess/imdb").json()["data"]["job_id"]
+    response = client.post("/review/preprocess/imdb", params={"refit_tfidf": "true"})
+
+    assert response.status_code == 409
+    assert first in response.json()["detail"]
+    assert [job.job_id for job in job_manager.list()] == [first]
+
+
+# 테스트: 완료된 작업의 상태, 행 수, 시간 조회
+def test_get_job_status(job_manager):
+    job_id = client.post("/review/preprocess/letterboxd").json()["data"]["job_id"]
+    wait_for(job_manager, job_id)
+
+    response = client.get(f"/review/preprocess/jobs/{job_id}")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["state"] == "succeeded"
+    assert data["rows_in"] == 10
+    assert data["rows_out"] == 8
+    assert data["duration_sec"] == 2.5
+
+    # 완료 후에는 새 작업이 등록됨
+    again = client.post("/review/preprocess/letterboxd").json()
+    assert again["data"]["job_id"] != job_id
+
+
+# 테스트: 실패한 작업은 에러 메시지와 함께 failed 상태
+def test_failed_job_reports_error(job_manager):
+    job, _ = job_manager.submit("broken")
+    job = wait_for(job_manager, job.job_id)
+
+    assert job.state == "failed"
+    assert job.error == "boom"
+
+
+# 테스트: 잘못된 사이트 이름
+def test_preprocess_invalid_site(job_manager):
+    response = client.post("/review/preprocess/naver")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid site name"
+
+
+# 테스트: 없는 작업 조회
+def test_get_job_not_found(job_manager):
+    response = client.get("/review/preprocess/jobs/unknown")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job not Found."
+
+
+# 테스트: 사이트별 실행 통계 (최근 실행부터)
+def test_preprocess_stats_returns_recent_runs(tmp_path):
+    store = RunStatsStore(str(tmp_path))
+    stage = {"stage": "clean_text", "calls": 2, "cached": 0, "wall_sec": 0.5, "cpu_sec": 0.4,
+             "rows_in": 100, "rows_out": 90, "peak_mem_mb": None}
+    for run_id in ("old", "new"):
+        store.append("imdb", {"run_id": run_id, "site_name": "imdb", "source": "api",
+                              "started_at": "2026-01-01T00:00:00+00:00", "finished_at": "2026-01-01T00:00:03+00:00",
+                              "wall_sec": 3.0, "rows_in": 100, "rows_out": 90, "stages": [stage]})
+    app.dependency_overrides[get_preprocess_stats_store] = lambda: store
+    try:
+        response = client.get("/review/preprocess/stats/IMDb", params={"limit": 1})
+        invalid = client.get("/review/preprocess/stats/naver")
+    finally:
+        app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    runs = response.json()["data"]
+    assert [run["run_id"] for run in runs] == ["new"]
+    assert runs[0]["stages"][0]["rows_out"] == 90
+    assert invalid.status_code == 400
+
+
+# 테스트: 앱 시작 시 processor/pandas/그래프 라이브러리를 불러오지 않음 (첫 전처리 요청 때 import)
+def test_app_import_does_not_load_processors():
+    probe = ("import sys, app.main; "
+             "print(sorted(m for m in ('pandas', 'sklearn', 'matplotlib', 'seaborn', "
+             "'review_analysis.preprocessing.imdb_processor') if m in sys.modules))")
+    completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+
+    assert completed.stdout.strip() == "[]"
+
+
+# 테스트: EDA 리포트 생성 후 조회는 다시 그리지 않음
+def test_eda_report_is_generated_once_and_served_from_cache(tmp_path):
+    processed = read_frame(os.path.join(DATABASE_DIR, "preprocessed_reviews_imdb.csv"))
+    write_frame(processed, str(tmp_path / "processed" / "preprocessed_reviews_imdb.parquet"))
+    reports = EdaReportService(output_dir=str(tmp_path / "processed"), reports_dir=str(tmp_path / "reports"), workers=1)
+    app.dependency_overrides[get_eda_report_service] = lambda: reports
+    try:
+        missing = client.get("/review/eda/imdb")
+        not_preprocessed = client.post("/review/eda/rotten")
+        created = client.post("/review/eda/imdb").json()["data"]
+        again = client.post("/review/eda/imdb").json()["data"]
+        served = client.get("/review/eda/imdb").json()["data"]
+        invalid = client.post("/review/eda/naver")
+    finally:
+        app.dependency_overrides = {}
+
+    assert missing.status_code == 404
+    assert not_preprocessed.status_code == 404
+    assert invalid.status_code == 400
+    assert created["rendered"] == len(created["figures"]) == 6
+    assert again["rendered"] == 0
+    assert served["figures"] == again["figures"]
+    figure = created["figures"][0]
+    assert figure["url"].startswith(f"/static/reports/imdb/{figure['name']}.png?v=")
+    assert os.path.exists(tmp_path / "reports" / "imdb" / f"{figure['name']}.png")
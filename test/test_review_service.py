@@ -0,0 +1,343 @@
+import glob
+import json
+import os
+import pytest
+from types import SimpleNamespace
+import pandas as pd
+from bson import ObjectId
+from app.review.review_repository import ReviewRepository
+from app.review.review_service import ReviewService, MemoryBudgetExceeded
+from review_analysis.preprocessing.output_format import read_frame
+from review_analysis.preprocessing.profiling import RunStatsStore
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+
+    def find(self, filter=None, projection=None, batch_size=None, sort=None):
+        after_id = (filter or {}).get("_id", {}).get("$gt")
+        docs = sorted(self.docs, key=lambda d: d["_id"]) if sort else self.docs
+        for doc in docs:
+            if after_id is not None and doc["_id"] <= after_id:
+                continue
+            yield {k: v for k, v in doc.items() if projection is None or k in projection}
+
+    def find_one(self, filter, projection=None, sort=None):
+        docs = sorted(self.docs, key=lambda d: d["_id"], reverse=sort[0][1] < 0) if sort else self.docs
+        return next((doc for doc in docs if "_id" not in filter or doc["_id"] == filter["_id"]), None)
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+    def update_one(self, filter, update, upsert=False):
+        doc = self.find_one(filter)
+        if doc is None:
+            doc = dict(filter)
+            self.docs.append(doc)
+        doc.update(update["$set"])
+
+    def with_options(self, write_concern=None):
+        self.write_concern = write_concern
+        return self
+
+    def delete_many(self, filter):
+        keep = [doc for doc in self.docs if doc.get("run_id") == filter["run_id"]["$ne"]]
+        deleted, self.docs = len(self.docs) - len(keep), keep
+        return SimpleNamespace(acknowledged=True, deleted_count=deleted)
+
+    def create_index(self, key, unique=False):
+        self.index = key
+
+    def bulk_write(self, requests, ordered=True):
+        upserted = modified = 0
+        for request in requests:
+            key = request._filter["original_id"]
+            existing = next((i for i, doc in enumerate(self.docs) if doc["original_id"] == key), None)
+            if existing is None:
+                self.docs.append(request._doc)
+                upserted += 1
+            else:
+                self.docs[existing] = request._doc
+                modified += 1
+        return SimpleNamespace(acknowledged=True, upserted_count=upserted, modified_count=modified)
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+def load_docs(site_name, n=None):
+    df = pd.read_csv(os.path.join(DATABASE_DIR, f"reviews_{site_name}.csv"))
+    if n is not None:
+        df = df.head(n)
+    docs = df.to_dict("records")
+    for doc in docs:
+        doc["_id"] = ObjectId()
+        doc["crawled_by"] = "selenium"  # projection으로 걸러져야 하는 필드
+    return docs
+
+
+@pytest.fixture
+def review_service(tmp_path):
+    def make(site_name, docs):
+        return ReviewService(ReviewRepository(FakeDatabase({site_name: FakeCollection(docs)})), output_dir=str(tmp_path),
+                             stats_dir=str(tmp_path / "stats"), result_cache_dir=str(tmp_path / "result_cache"))
+    return make
+
+
+@pytest.mark.parametrize("site_name", ["imdb", "rotten", "letterboxd"])
+def test_preprocess_streams_mongo_documents(review_service, site_name):
+    docs = load_docs(site_name, n=200)
+    service = review_service(site_name, docs)
+
+    result = service.preprocess(site_name, batch_size=50)
+
+    assert result["batches"] == 4
+    assert result["rows_in"] == 200
+    assert 0 < result["count"] <= 200
+
+    output = read_frame(result["output_path"])
+    assert len(output) == result["count"]
+    assert "original_id" in output.columns
+    assert "crawled_by" not in output.columns
+
+
+def test_preprocess_single_batch_matches_row_count(review_service):
+    docs = load_docs("imdb")
+    service = review_service("imdb", docs)
+
+    streamed = service.preprocess("imdb", batch_size=10)
+    whole = service.preprocess("imdb", batch_size=len(docs))
+
+    assert whole["batches"] == 1
+    assert streamed["count"] == whole["count"]
+
+
+def test_preprocess_invalid_site(review_service):
+    service = review_service("naver", [])
+
+    with pytest.raises(ValueError, match="Invalid site name"):
+        service.preprocess("naver")
+
+
+def test_preprocess_memory_budget_exceeded(review_service):
+    service = review_service("imdb", load_docs("imdb", n=10))
+
+    with pytest.raises(MemoryBudgetExceeded):
+        service.preprocess("imdb", batch_size=100, memory_budget_mb=1)
+
+
+def test_preprocess_incremental_appends_new_documents_only(review_service):
+    docs = load_docs("imdb", n=100)
+    service = review_service("imdb", docs[:60])
+
+    first = service.preprocess("imdb", incremental=True)
+    assert first["incremental"] is False  # 워터마크가 없으면 전체 처리
+    assert first["rows_in"] == 60
+
+    service.repo.db["imdb"].docs.extend(docs[60:])
+    second = service.preprocess("imdb", batch_size=15, incremental=True)
+
+    assert second["incremental"] is True
+    assert second["rows_in"] == 40
+    assert second["watermark"] == str(docs[-1]["_id"])
+
+    output = read_frame(second["output_path"])
+    assert len(output) == first["count"] + second["count"]
+    assert output["original_id"].is_unique
+
+    third = service.preprocess("imdb", incremental=True)
+    assert third["rows_in"] == 0
+
+
+def test_preprocess_upserts_processed_documents(review_service):
+    docs = load_docs("rotten", n=120)
+    service = review_service("rotten", docs)
+
+    result = service.preprocess("rotten", batch_size=60, write_batch_size=25, write_concern="majority")
+
+    processed = service.repo.db["rotten_processed"]
+    assert len(processed.docs) == result["count"]
+    assert processed.index == "original_id"
+    assert processed.write_concern.document == {"w": "majority", "j": False}
+
+    writes = result["writes"]
+    assert writes["collection"] == "rotten_processed"
+    assert writes["docs"] == result["count"]
+    assert all(stat["docs"] <= 25 for stat in writes["batches"])
+    assert [stat["batch"] for stat in writes["batches"]] == list(range(len(writes["batches"])))
+
+    # 다시 실행하면 같은 original_id 문서는 새로 만들지 않고 갱신
+    again = service.preprocess("rotten", batch_size=60, write_batch_size=25, force=True)
+    assert len(processed.docs) == result["count"]
+    assert sum(stat["upserted"] for stat in again["writes"]["batches"]) == 0
+
+
+def test_preprocess_persists_stage_stats_per_run(review_service, tmp_path):
+    service = review_service("rotten", load_docs("rotten", n=200))
+    service.trace_memory = True
+
+    first = service.preprocess("rotten", batch_size=100)
+    second = service.preprocess("rotten", batch_size=200)
+
+    runs = RunStatsStore(str(tmp_path / "stats")).load("rotten")
+    stages = {stage["stage"]: stage for stage in runs[1]["stages"]}
+
+    assert [run["run_id"] for run in runs] == [second["run_id"], first["run_id"]]
+    assert list(stages) == ["missing_values", "dates", "outliers", "clean_text", "dedupe", "text_features", "tfidf"]
+    assert stages["missing_values"]["calls"] == 2
+    assert stages["missing_values"]["rows_in"] == 200
+    # 배치 간 완전 중복은 단계 통계 이후 사이트 색인에서 빠지므로 한 배치로 돌린 결과와 같음
+    assert stages["tfidf"]["rows_out"] == 200
+    assert first["count"] == second["count"] == 199
+    assert stages["tfidf"]["peak_mem_mb"] > 0
+
+
+def test_preprocess_returns_cached_result_until_collection_changes(review_service, tmp_path):
+    docs = load_docs("imdb", n=120)
+    service = review_service("imdb", docs[:100])
+
+    first = service.preprocess("imdb", batch_size=50)
+    again = service.preprocess("imdb", batch_size=50)
+
+    assert first["cached"] is False
+    assert again["cached"] is True
+    assert again["run_id"] == first["run_id"]
+    assert again["count"] == first["count"]
+    assert len(RunStatsStore(str(tmp_path / "stats")).load("imdb")) == 1
+
+    # 결과를 바꾸는 옵션, force, 원본 변경은 다시 전처리
+    assert service.preprocess("imdb", batch_size=100)["cached"] is False
+    assert service.preprocess("imdb", batch_size=100, force=True)["cached"] is False
+    service.repo.db["imdb"].docs.extend(docs[100:])
+    changed = service.preprocess("imdb", batch_size=100)
+    assert changed["cached"] is False
+    assert changed["rows_in"] == 120
+    assert service.preprocess("imdb", batch_size=100)["run_id"] == changed["run_id"]
+
+
+def test_preprocess_result_cache_separates_incremental_runs(review_service):
+    service = review_service("imdb", load_docs("imdb", n=80))
+
+    full = service.preprocess("imdb", batch_size=40)
+    incremental = service.preprocess("imdb", batch_size=40, incremental=True)
+
+    # 전체 실행 요약으로 증분 요청에 응답하지 않음 (새 문서가 없으므로 0행)
+    assert incremental["cached"] is False
+    assert incremental["incremental"] is True
+    assert incremental["rows_in"] == 0
+    assert service.preprocess("imdb", batch_size=40, incremental=True)["run_id"] == incremental["run_id"]
+    # 증분 요약으로 전체 요청에 응답하지 않음
+    again = service.preprocess("imdb", batch_size=40)
+    assert again["cached"] is False
+    assert again["rows_in"] == full["rows_in"]
+
+
+def drifting_docs(n=80):
+    """앞 절반은 원본 리뷰, 뒤 절반은 어휘가 완전히 다른 리뷰 (두 번째 배치에서 drift가 발생)"""
+    docs = load_docs("imdb", n=n)
+    for i, doc in enumerate(docs[n // 2:]):
+        doc["content"] = " ".join(f"zq{(i * 7 + j) % 50}word" for j in range(30))
+    return docs
+
+
+def tfidf_part_meta(output_dir, site_name):
+    metas = []
+    for path in sorted(glob.glob(os.path.join(output_dir, f"tfidf_{site_name}", "part-*.json"))):
+        with open(path, encoding="utf-8") as f:
+            sidecar = json.load(f)
+        metas.append((sidecar["vectorizer_version"], sidecar["shape"][1]))
+    return metas
+
+
+def test_preprocess_does_not_refit_tfidf_between_batches(review_service, tmp_path):
+    service = review_service("imdb", drifting_docs())
+
+    result = service.preprocess("imdb", batch_size=40)
+
+    metas = tfidf_part_meta(tmp_path, "imdb")
+    assert result["tfidf_parts"] == len(metas) == 2
+    assert len(set(metas)) == 1  # 모든 part가 같은 벡터라이저 버전/열 공간
+
+
+def test_preprocess_incremental_refit_retransforms_existing_tfidf_parts(review_service, tmp_path):
+    docs = drifting_docs()
+    service = review_service("imdb", docs[:40])
+    service.preprocess("imdb", batch_size=40)
+    assert tfidf_part_meta(tmp_path, "imdb")[0][0] == 1
+
+    service.repo.db["imdb"].docs.extend(docs[40:])
+    result = service.preprocess("imdb", batch_size=40, incremental=True)
+
+    metas = tfidf_part_meta(tmp_path, "imdb")
+    assert result["tfidf_parts"] == len(metas) == 2
+    assert set(metas) == {(2, metas[0][1])}
+
+
+def test_preprocess_incremental_drops_duplicates_of_earlier_runs(review_service, tmp_path):
+    docs = load_docs("imdb", n=60)
+    service = review_service("imdb", docs[:40])
+    first = service.preprocess("imdb", batch_size=20)
+
+    reposted = [dict(doc, _id=ObjectId()) for doc in docs[:5]]  # 이전 실행에서 저장한 리뷰를 다시 수집
+    service.repo.db["imdb"].docs.extend(docs[40:] + reposted)
+    second = service.preprocess("imdb", batch_size=20, incremental=True)
+
+    output = read_frame(second["output_path"])
+    reposted_ids = {str(doc["_id"]) for doc in reposted}
+    assert second["rows_in"] == 25
+    assert not reposted_ids & set(output["original_id"])
+    assert not reposted_ids & {doc["original_id"] for doc in service.repo.db["imdb_processed"].docs}
+    assert len(output) == first["count"] + second["count"]
+    tfidf_rows = 0
+    for path in glob.glob(os.path.join(tmp_path, "tfidf_imdb", "part-*.json")):
+        with open(path, encoding="utf-8") as f:
+            tfidf_rows += json.load(f)["shape"][0]
+    assert tfidf_rows == len(output)
+
+
+def test_preprocess_full_run_removes_stale_processed_documents(review_service):
+    docs = load_docs("imdb", n=40)
+    service = review_service("imdb", docs)
+    first = service.preprocess("imdb", batch_size=20)
+    processed = service.repo.db["imdb_processed"]
+    assert {doc["run_id"] for doc in processed.docs} == {first["run_id"]}
+
+    service.repo.db["imdb"].docs = docs[:30]  # 원본 리뷰 일부 삭제
+    second = service.preprocess("imdb", batch_size=20, force=True)
+
+    output = read_frame(second["output_path"])
+    assert second["writes"]["deleted"] == first["count"] - second["count"] > 0
+    assert sorted(doc["original_id"] for doc in processed.docs) == sorted(output["original_id"])
+    assert {doc["run_id"] for doc in processed.docs} == {second["run_id"]}
+
+
+def test_preprocess_keeps_output_and_tfidf_parts_aligned(review_service, tmp_path):
+    # 배치가 작으면 전처리 후 행이 하나도 남지 않는 배치가 생김 (FE 생략, part도 만들지 않음)
+    service = review_service("rotten", load_docs("rotten"))
+
+    result = service.preprocess("rotten", batch_size=7)
+
+    assert result["batches"] > result["output_parts"] == result["tfidf_parts"]
+    output = [read_frame(path) for path in sorted(glob.glob(os.path.join(result["output_path"], "part-*")))]
+    for part, frame in enumerate(output):
+        with open(os.path.join(tmp_path, "tfidf_rotten", f"part-{part:05d}.json"), encoding="utf-8") as f:
+            assert json.load(f)["row_ids"] == frame["original_id"].tolist()
+
+
+def test_preprocess_fails_when_feature_engineering_fails(review_service, monkeypatch):
+    from review_analysis.preprocessing.imdb_processor import ImdbDataProcessor
+
+    def broken(self):
+        raise RuntimeError("vectorizer exploded")
+
+    monkeypatch.setattr(ImdbDataProcessor, "feature_engineering", broken)
+    service = review_service("imdb", load_docs("imdb", n=20))
+
+    with pytest.raises(RuntimeError, match="vectorizer exploded"):
+        service.preprocess("imdb", batch_size=10)
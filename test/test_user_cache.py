@@ -0,0 +1,168 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from unittest.mock import AsyncMock
+from app.main import app
+import app.dependencies as dependencies
+from app.dependencies import get_user_cache
+from app.user.user_cache import (AsyncCachedUserRepository, CachedUserRepository, LocalUserCache,
+                                 RedisUserCache, build_user_cache)
+from app.user.user_repository import UserRepository
+from app.user.user_schema import User, UserLogin, UserUpdate
+from app.user.user_service import UserService
+from database.query_counter import count_queries, track_queries
+
+client = TestClient(app)
+
+test_user = User(email="cache@example.com", password="password123", username="CacheUser")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """get/set(ex)/delete만 흉내 낸 Redis 클라이언트 (두 워커가 같은 store를 공유)"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+class FakeAsyncRedis(FakeRedis):
+    async def get(self, key):
+        return super().get(key)
+
+    async def set(self, key, value, ex=None):
+        super().set(key, value, ex)
+
+    async def delete(self, key):
+        super().delete(key)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    track_queries(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE users (email TEXT PRIMARY KEY, password TEXT NOT NULL, "
+                                "username TEXT NOT NULL)"))
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_login_is_served_from_cache_until_password_changes(db_session):
+    cache = LocalUserCache(maxsize=10, ttl_sec=60)
+    service = UserService(CachedUserRepository(UserRepository(db_session), cache))
+    service.register_user(test_user)
+
+    with count_queries() as queries:
+        service.login(UserLogin(email=test_user.email, password="password123"))
+        # 대소문자/공백이 달라도 같은 캐시 항목
+        assert cache.get(" CACHE@example.com ")["username"] == "CacheUser"
+        service.login(UserLogin(email=test_user.email, password="password123"))
+    assert queries.count == 1
+    assert cache.stats()["hits"] == 2
+
+    # 비밀번호 변경이 캐시를 무효화해 이전 비밀번호로는 로그인할 수 없음
+    service.update_user_pwd(UserUpdate(email=test_user.email, new_password="changed"))
+    with pytest.raises(ValueError, match="Invalid ID/PW"):
+        service.login(UserLogin(email=test_user.email, password="password123"))
+
+    service.delete_user(test_user.email)
+    with pytest.raises(ValueError, match="User not Found."):
+        service.login(UserLogin(email=test_user.email, password="changed"))
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_local_cache_evicts_lru_and_expires_by_ttl():
+    clock = FakeClock()
+    cache = LocalUserCache(maxsize=2, ttl_sec=10, clock=clock)
+    for name in ("a", "b"):
+        cache.set(f"{name}@example.com", {"username": name}, cache.generation())
+    cache.get("a@example.com")
+    cache.set("c@example.com", {"username": "c"}, cache.generation())
+
+    assert cache.get("b@example.com") is None  # 가장 오래 쓰지 않은 항목이 밀려남
+    assert cache.get("a@example.com") is not None
+    clock.now = 11
+    assert cache.get("a@example.com") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_local_cache_is_only_built_for_a_single_worker():
+    assert build_user_cache(0, 60, None) is None
+    assert isinstance(build_user_cache(10, 60, None), LocalUserCache)
+    # 여러 워커에서 워커별 LRU를 쓰면 다른 워커의 비밀번호 변경/삭제가 TTL 동안 보이지 않음
+    assert build_user_cache(10, 60, None, workers=4) is None
+
+
+def test_fill_is_skipped_when_invalidated_during_lookup():
+    cache = LocalUserCache(maxsize=10, ttl_sec=60)
+    generation = cache.generation()  # 조회 시작
+    cache.invalidate(test_user.email)  # 다른 요청의 쓰기
+    cache.set(test_user.email, test_user.model_dump(), generation)  # 이전 값으로 채우려는 조회
+
+    assert cache.get(test_user.email) is None
+
+
+@pytest.mark.anyio
+async def test_redis_cache_is_shared_between_workers():
+    store = {}
+    workers = [RedisUserCache(None, 60, client=FakeRedis(store), async_client=FakeAsyncRedis(store))
+               for _ in range(2)]
+    repos = [AsyncMock() for _ in workers]
+    cached = [AsyncCachedUserRepository(repo, cache) for repo, cache in zip(repos, workers)]
+    repos[0].get_user_by_email.return_value = test_user
+
+    assert await cached[0].get_user_by_email(test_user.email) == test_user
+    shared = await cached[1].get_user_by_email(test_user.email)
+    repos[1].get_user_by_email.assert_not_awaited()
+    assert shared.username == test_user.username and shared.check_password("password123")
+    assert not shared.check_password("wrong")
+    # Redis에는 평문 비밀번호를 저장하지 않음
+    assert all(b"password123" not in value.encode() for value in store.values())
+    assert all("password" not in json.loads(value) for value in store.values())
+
+    # 한 워커의 쓰기가 공유 캐시를 지움
+    await cached[1].update_password(test_user.email, "changed")
+    assert workers[0].get(test_user.email) is None
+
+
+def test_user_cache_stats_endpoint(monkeypatch):
+    monkeypatch.setattr(dependencies, "INTERNAL_API_TOKEN", "secret")
+    headers = {"X-Internal-Token": "secret"}
+    cache = LocalUserCache(maxsize=10, ttl_sec=60)
+    cache.get(test_user.email)
+    app.dependency_overrides[get_user_cache] = lambda: cache
+    try:
+        data = client.get("/internal/cache/users", headers=headers).json()["data"]
+        app.dependency_overrides[get_user_cache] = lambda: None
+        disabled = client.get("/internal/cache/users", headers=headers).json()
+    finally:
+        app.dependency_overrides = {}
+
+    assert data["backend"] == "local" and data["misses"] == 1 and data["maxsize"] == 10
+    assert disabled["data"] is None and disabled["message"] == "User cache disabled."
@@ -1,13 +1,18 @@
 import pytest
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.user.user_repository import UserRepository
-from app.user.user_schema import User
+from sqlalchemy.pool import StaticPool
+from app.user.user_repository import AsyncUserRepository, UserRepository
+from app.user.user_schema import User, UserLogin, UserUpdate
+from app.user.user_service import AsyncUserService, UserService
+from database.query_counter import count_queries, track_queries
 
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+track_queries(engine)
 
 CREATE_TABLE_QUERY = """
 CREATE TABLE IF NOT EXISTS users (
@@ -82,4 +87,125 @@ def test_delete_user(user_repo):
     user_repo.delete_user(user)
     user_after_delete = user_repo.get_user_by_email("delete@example.com")
 
-    assert user_after_delete is None 
+    assert user_after_delete is None
+
+
+
+def test_create_user_rejects_existing_email(user_repo):
+    user = User(email="create@example.com", password="pw", username="first")
+
+    assert user_repo.create_user(user) is True
+    assert user_repo.create_user(user.model_copy(update={"username": "second"})) is False
+    assert user_repo.get_user_by_email("create@example.com").username == "first"
+    assert user_repo.update_password("missing@example.com", "pw") is False
+
+
+def test_user_service_query_counts(user_repo):
+    service = UserService(user_repo)
+    user = User(email="count@example.com", password="pw", username="counter")
+
+    # 가입/로그인 1문장, 비밀번호 변경/삭제 2문장 (SELECT + UPDATE/DELETE), 저장은 upsert 1문장
+    expected = [
+        (lambda: service.register_user(user), 1),
+        (lambda: service.login(UserLogin(email=user.email, password="pw")), 1),
+        (lambda: service.update_user_pwd(UserUpdate(email=user.email, new_password="new")), 2),
+        (lambda: user_repo.save_user(user), 1),
+        (lambda: service.delete_user(user.email), 2),
+    ]
+    for call, count in expected:
+        with count_queries() as queries:
+            call()
+        assert queries.count == count
+
+    with count_queries() as queries, pytest.raises(ValueError, match="User not Found."):
+        service.delete_user(user.email)
+    assert queries.count == 1
+
+
+def test_create_users_batch_and_stream(user_repo):
+    user_repo.create_user(User(email="old@example.com", password="pw", username="old"))
+    users = [User(email=f"batch{i}@example.com", password="pw", username=f"batch{i}") for i in range(3)]
+
+    # 이미 있는 이메일 확인 SELECT 1번 + 여러 행 INSERT 1번
+    with count_queries() as queries:
+        existing = user_repo.create_users(users + [User(email="old@example.com", password="pw", username="dup")])
+    assert existing == {"old@example.com"}
+    assert queries.count == 2
+
+    # 다른 테스트가 커밋한 유저도 같은 테이블에 남아 있으므로 이 테스트의 이메일만 비교
+    exported = [user for user in user_repo.iter_users(batch_size=2) if user.username.startswith(("batch", "old"))]
+    assert [user.email for user in exported] == [user.email for user in users] + ["old@example.com"]
+    assert not hasattr(exported[0], "password")
+
+
+def test_create_users_retries_after_concurrent_insert(user_repo, monkeypatch):
+    import app.user.user_repository as user_repository
+    users = [User(email="race@example.com", password="pw", username="race")]
+    user_repo.create_user(users[0])
+
+    # 첫 확인 SELECT가 다른 요청의 INSERT보다 먼저 끝난 것처럼 → INSERT 충돌 → 롤백 후 다시 확인
+    split_existing = user_repository.split_existing
+    calls = []
+    def stale_then_real(batch, rows):
+        calls.append(batch)
+        return (set(), batch) if len(calls) == 1 else split_existing(batch, rows)
+    monkeypatch.setattr(user_repository, "split_existing", stale_then_real)
+
+    assert user_repo.create_users(users) == {"race@example.com"}
+    assert len(calls) == 2
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_user_repo():
+    # 비동기 경로는 aiosqlite 메모리 DB로 검증 (StaticPool: 세션들이 같은 연결을 공유)
+    async_engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    track_queries(async_engine)
+    async with async_engine.begin() as connection:
+        await connection.execute(text(CREATE_TABLE_QUERY))
+    session = async_sessionmaker(async_engine, expire_on_commit=False)()
+
+    yield AsyncUserRepository(session)
+
+    await session.close()
+    await async_engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_async_save_get_and_update_user(async_user_repo):
+    await async_user_repo.save_user(User(email="async@example.com", password="oldpass", username="olduser"))
+    await async_user_repo.save_user(User(email="async@example.com", password="newpass", username="newuser"))
+
+    user = await async_user_repo.get_user_by_email("async@example.com")
+
+    assert user is not None
+    assert user.password == "newpass"
+    assert user.username == "newuser"
+
+
+@pytest.mark.anyio
+async def test_async_delete_user(async_user_repo):
+    await async_user_repo.save_user(User(email="asyncdel@example.com", password="delpass", username="deluser"))
+
+    user = await async_user_repo.get_user_by_email("asyncdel@example.com")
+    await async_user_repo.delete_user(user)
+
+    assert await async_user_repo.get_user_by_email("asyncdel@example.com") is None
+
+
+@pytest.mark.anyio
+async def test_async_register_is_single_statement(async_user_repo):
+    service = AsyncUserService(async_user_repo)
+    user = User(email="asyncreg@example.com", password="pw", username="reg")
+
+    with count_queries() as outer:
+        with count_queries() as queries:
+            await service.register_user(user)
+        assert queries.count == 1
+
+        with pytest.raises(ValueError, match="User already Exists."):
+            await service.register_user(user)
+    assert outer.count == 2
@@ -1,12 +1,18 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 from app.main import app
 from app.user.user_schema import User, UserLogin, UserUpdate, UserDeleteRequest
 from app.responses.base_response import BaseResponse
-from app.user.user_repository import UserRepository
-from app.user.user_service import UserService
-from app.dependencies import get_user_service
+from app.user.user_repository import AsyncUserRepository, UserRepository
+from app.user.user_service import AsyncUserService, UserService
+from app.dependencies import get_async_db, get_async_user_service, get_user_cache, get_user_export_service, get_user_service
+from app.user.user_cache import LocalUserCache
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from database.query_counter import track_queries
 
 # FastAPI 테스트 클라이언트
 client = TestClient(app)
@@ -149,4 +155,96 @@ def test_delete_user_not_found(mock_user_service):
     # 응답 검증
     assert response.status_code == 404
     data = response.json()
-    assert data["detail"] == USER_NOT_FOUND
\ No newline at end of file
+    assert data["detail"] == USER_NOT_FOUND
+
+
+# 테스트: 비동기 서비스 (USER_DB_ASYNC) 메서드는 await 되어 같은 응답을 반환
+def test_login_with_async_service():
+    async_service = AsyncMock(spec=AsyncUserService)
+    async_service.login.return_value = mock_user
+    app.dependency_overrides[get_user_service] = lambda: async_service
+
+    user_login = UserLogin(email=mock_user.email, password=mock_user.password)
+    response = client.post("/api/user/login", json=user_login.model_dump())
+
+    # 검증
+    assert response.status_code == 200
+    assert response.json()["data"]["email"] == mock_user.email
+    async_service.login.assert_awaited_once_with(user_login)
+
+
+# 테스트: 응답 헤더로 요청별 SQL 문 수 확인 (aiosqlite로 실제 비동기 경로 실행)
+def test_register_and_update_report_query_count():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    track_queries(engine)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create_table():
+        async with engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE users (email TEXT PRIMARY KEY, password TEXT, username TEXT)"))
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides = {get_user_service: get_async_user_service, get_async_db: override_db,
+                                get_user_cache: lambda: LocalUserCache(maxsize=10, ttl_sec=60)}
+    with TestClient(app) as test_client:
+        test_client.portal.call(create_table)
+
+        registered = test_client.post("/api/user/register", json=mock_user.model_dump())
+        duplicate = test_client.post("/api/user/register", json=mock_user.model_dump())
+        updated = test_client.put("/api/user/update-password",
+                                  json=UserUpdate(email=mock_user.email, new_password="changed").model_dump())
+
+    assert registered.status_code == 201 and registered.headers["X-DB-Query-Count"] == "1"
+    assert duplicate.status_code == 400 and duplicate.headers["X-DB-Query-Count"] == "1"
+    assert updated.json()["data"]["password"] == "changed" and updated.headers["X-DB-Query-Count"] == "2"
+
+
+# 테스트: NDJSON 대량 가입 → 행별 결과, 배치마다 SELECT 1번 + 여러 행 INSERT 1번, 내보내기에는 비밀번호 없음
+def test_bulk_register_and_export_users():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    track_queries(engine)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create_table():
+        async with engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE users (email TEXT PRIMARY KEY, password TEXT, username TEXT)"))
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides = {get_user_service: get_async_user_service, get_async_db: override_db,
+                                get_user_cache: lambda: None,
+                                get_user_export_service: lambda: AsyncUserService(AsyncUserRepository(sessions()))}
+    rows = [User(email=f"bulk{i}@example.com", password="pw", username=f"Bulk{i}").model_dump() for i in range(3)]
+    body = "\n".join([json.dumps(rows[0]), json.dumps(rows[1]), "{not json", json.dumps({"email": "bad"}),
+                      json.dumps(rows[0]), json.dumps(rows[2])])
+    with TestClient(app) as test_client:
+        test_client.portal.call(create_table)
+        test_client.post("/api/user/register", json=rows[1])
+
+        bulk = test_client.post("/api/user/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        again = test_client.post("/api/user/bulk", json=rows)
+        export = test_client.get("/api/user/export", params={"batch_size": 2})
+
+    data = bulk.json()["data"]
+    assert bulk.status_code == 200
+    assert [row["status"] for row in data["results"]] == ["created", "exists", "invalid", "invalid", "duplicate", "created"]
+    assert (data["created"], data["exists"], data["duplicate"], data["invalid"]) == (2, 1, 1, 2)
+    assert bulk.headers["X-DB-Query-Count"] == "2"
+    assert again.json()["data"]["exists"] == 3
+
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in export.text.splitlines()]
+    assert [user["email"] for user in exported] == [row["email"] for row in rows]
+    assert all(set(user) == {"email", "username"} for user in exported)
+
+
+def test_bulk_register_rejects_malformed_array():
+    response = client.post("/api/user/bulk", content="[{", headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON array."
@@ -1,7 +1,7 @@
 import pytest
-from app.user.user_service import UserService
+from app.user.user_service import AsyncUserService, UserService
 from app.user.user_schema import User, UserLogin, UserUpdate
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 @pytest.fixture
@@ -49,21 +49,20 @@ def test_login_invalid_password(user_service, mock_user_repository, test_user):
 
 
 def test_register_user_success(user_service, mock_user_repository, test_user):
-    """Test successful user registration."""
-    mock_user_repository.get_user_by_email.return_value = None
-    mock_user_repository.save_user.return_value = test_user
+    """Test successful user registration (one INSERT, no existence check)."""
+    mock_user_repository.create_user.return_value = True
     
     result = user_service.register_user(test_user)
     
     assert result.email == test_user.email
     assert result.username == test_user.username
-    mock_user_repository.get_user_by_email.assert_called_once_with(test_user.email)
-    mock_user_repository.save_user.assert_called_once_with(test_user)
+    mock_user_repository.get_user_by_email.assert_not_called()
+    mock_user_repository.create_user.assert_called_once_with(test_user)
 
 
 def test_register_user_already_exists(user_service, mock_user_repository, test_user):
     """Test registration with existing user."""
-    mock_user_repository.get_user_by_email.return_value = test_user
+    mock_user_repository.create_user.return_value = False
     
     with pytest.raises(ValueError, match="User already Exists."):
         user_service.register_user(test_user)
@@ -72,7 +71,7 @@ def test_register_user_already_exists(user_service, mock_user_repository, test_u
 def test_delete_user_success(user_service, mock_user_repository, test_user):
     """Test successful user deletion."""
     mock_user_repository.get_user_by_email.return_value = test_user
-    mock_user_repository.delete_user.return_value = test_user
+    mock_user_repository.delete_user.return_value = True
     
     result = user_service.delete_user(test_user.email)
     
@@ -89,17 +88,27 @@ def test_delete_user_not_found(user_service, mock_user_repository):
         user_service.delete_user("nonexistent@example.com")
 
 
+def test_update_password_user_deleted_concurrently(user_service, mock_user_repository, test_user):
+    """UPDATE matching no row (user deleted after the SELECT) is reported as not found."""
+    mock_user_repository.get_user_by_email.return_value = test_user
+    mock_user_repository.update_password.return_value = False
+
+    with pytest.raises(ValueError, match="User not Found."):
+        user_service.update_user_pwd(UserUpdate(email="test@example.com", new_password="newpassword123"))
+
+
 def test_update_password_success(user_service, mock_user_repository, test_user):
     """Test successful password update."""
     mock_user_repository.get_user_by_email.return_value = test_user
-    mock_user_repository.save_user.return_value = test_user
+    mock_user_repository.update_password.return_value = True
     
     user_update = UserUpdate(email="test@example.com", new_password="newpassword123")
     result = user_service.update_user_pwd(user_update)
     
     assert result.password == "newpassword123"
     mock_user_repository.get_user_by_email.assert_called_once_with("test@example.com")
-    mock_user_repository.save_user.assert_called_once()
+    mock_user_repository.update_password.assert_called_once_with("test@example.com", "newpassword123")
+    mock_user_repository.save_user.assert_not_called()
 
 
 def test_update_password_user_not_found(user_service, mock_user_repository):
@@ -109,3 +118,59 @@ def test_update_password_user_not_found(user_service, mock_user_repository):
     
     with pytest.raises(ValueError, match="User not Found."):
         user_service.update_user_pwd(user_update)
+
+
+def test_register_users_reports_every_row(user_service, mock_user_repository, test_user):
+    """Invalid and repeated rows are reported without touching the DB; valid rows are saved in batches."""
+    mock_user_repository.create_users.side_effect = [{"test@example.com"}, set()]
+    rows = [test_user.model_dump(), {"email": "not-an-email", "password": "pw", "username": "x"},
+            {"email": "a@example.com", "password": "pw", "username": "a"},
+            {"email": "TEST@example.com", "password": "pw", "username": "again"},
+            {"email": "b@example.com", "password": "pw", "username": "b"},
+            ValueError("Invalid JSON on line 6.")]
+
+    result = user_service.register_users(rows, batch_size=2)
+
+    assert [row.status for row in result.results] == ["exists", "invalid", "created", "duplicate", "created", "invalid"]
+    assert result.results[1].email == "not-an-email" and result.results[1].error.startswith("email:")
+    assert result.results[5].error == "Invalid JSON on line 6."
+    assert (result.created, result.exists, result.duplicate, result.invalid) == (2, 1, 1, 2)
+    assert [len(call.args[0]) for call in mock_user_repository.create_users.call_args_list] == [2, 1]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def async_user_repository():
+    return AsyncMock()
+
+
+@pytest.mark.anyio
+async def test_async_register_and_delete_user(async_user_repository, test_user):
+    """Async service awaits the repository and keeps the sync service's rules."""
+    service = AsyncUserService(async_user_repository)
+    async_user_repository.get_user_by_email.return_value = None
+    async_user_repository.create_user.return_value = True
+
+    assert await service.register_user(test_user) == test_user
+    async_user_repository.create_user.assert_awaited_once_with(test_user)
+
+    with pytest.raises(ValueError, match="User not Found."):
+        await service.delete_user(test_user.email)
+
+    async_user_repository.get_user_by_email.return_value = test_user
+    assert await service.delete_user(test_user.email) == test_user
+    async_user_repository.delete_user.assert_awaited_once_with(test_user)
+
+
+@pytest.mark.anyio
+async def test_async_login_invalid_password(async_user_repository, test_user):
+    """Test async login with invalid password."""
+    async_user_repository.get_user_by_email.return_value = test_user
+    service = AsyncUserService(async_user_repository)
+
+    with pytest.raises(ValueError, match="Invalid ID/PW"):
+        await service.login(UserLogin(email="test@example.com", password="wrongpassword"))